@@ -1,13 +1,17 @@
 """
 Contain classes for robot's physical run
 """
+from os.path import splitext
 from threading import Thread
-from time import sleep
-from typing import List
+from time import perf_counter, sleep
+from typing import List, Optional
 
 from algorithms.exploration import Exploration
+from algorithms.fastest_path_plans import precompute_fastest_path_plans
 from algorithms.fastest_path_solver import AStarAlgorithm
 from algorithms.image_recognition_exploration import ImageRecognitionExploration
+from algorithms.multi_waypoint_planner import MultiWaypointPlanner
+from algorithms.path_cache import PathCache
 from configs.gui_config import GUI_TITLE
 from gui import RealTimeGUI
 from map import Map, is_within_arena_range
@@ -16,14 +20,20 @@ from rpi_service import RPIService
 from utils.arguments_constructor import get_parser
 from utils.constants import ROBOT_START_POINT, ROBOT_END_POINT
 from utils.enums import Direction, Movement
+from utils.image_region import get_expected_image_region
 from utils.logger import print_error_log, print_general_log
 from utils.message_conversion import validate_and_decode_point
+from utils.timing import span_recorder
 
 _DEFAULT_TIME_LIMIT_IN_SECONDS = 360
 _ARENA_FILENAME = 'exam'
 _WAYPOINT_REGEX_PATTERN = r'\d+\s\d+'
 _SLEEP_DELAY = 0.02
 _EXPLORATION_MOVE_DELAY = 0.5
+# The time for the robot to come to rest after a movement before the photo is taken. The photo instruction cannot be
+# sent ahead while the robot moves on, since the RPI takes the photo when the instruction arrives
+_PHOTO_SETTLE_DELAY = 0.7
+_FASTEST_PATH_BATCH_DELAY = 7  # The time that the robot needs for the longest batch of the fastest path
 
 
 def _convert_to_android_coordinate_format(algo_point: List[int]) -> List[str]:
@@ -70,7 +80,18 @@ class ExplorationRun:
     Class for exploration tasks, including image recognition
     """
 
-    def __init__(self):
+    def __init__(self,
+                 profile_path: str = None,
+                 use_occupancy_grid: bool = False,
+                 use_view_planning: bool = False,
+                 decision_budget: float = None):
+        """
+        :param profile_path: The file to export the timings of every move to after the exploration. Not timed if None
+        :param use_occupancy_grid: True to fuse the sensor readings in an occupancy grid during the exploration
+        :param use_view_planning: True to explore the unexplored cells by information gain per move
+        :param decision_budget: The time in seconds that every decision step of the exploration may take to plan.
+                                Not bounded if None
+        """
         self.rpi_service = RPIService(self.stop_exploration)
         self.robot = RealRobot(ROBOT_START_POINT,
                                Direction.EAST,
@@ -85,6 +106,11 @@ class ExplorationRun:
         self.gui = RealTimeGUI()
         self.gui.display_widgets.arena.robot = self.robot
         self.image = None
+        self.profile_path = profile_path
+        self.use_occupancy_grid = use_occupancy_grid
+        self.use_view_planning = use_view_planning
+        self.decision_budget = decision_budget
+        self.last_movement_end_time = 0.0  # Of the exploration, when the sensor values of the movement are received
 
     def on_move(self, movement: 'Movement') -> List[int]:
         """
@@ -92,10 +118,14 @@ class ExplorationRun:
 
         :param movement: The movement made in the exploration class
         """
-        sleep(_EXPLORATION_MOVE_DELAY)
+        with span_recorder.span('move_delay'):
+            sleep(_EXPLORATION_MOVE_DELAY)
+
         sensor_values = self.rpi_service.send_movement_to_rpi_and_get_sensor_values(movement)
+        self.last_movement_end_time = perf_counter()
 
-        self.gui.display_widgets.arena.update_robot_position_on_map()
+        with span_recorder.span('gui_repaint'):
+            self.gui.display_widgets.arena.update_robot_position_on_map()
 
         self.send_mdf_string_to_android()
 
@@ -108,17 +138,21 @@ class ExplorationRun:
         """
         Sends the MDF string to android
         """
-        p1, p2 = self.gui.display_widgets.arena.map_reference.generate_map_descriptor(self.exploration_arena,
-                                                                                      self.obstacle_arena)
+        with span_recorder.span('mdf_generation'):
+            p1, p2 = self.gui.display_widgets.arena.map_reference.generate_map_descriptor(self.exploration_arena,
+                                                                                          self.obstacle_arena)
 
         payload = f'{RPIService.ANDROID_MDF_STRING_HEADER} {p1} {p2}'
         self.rpi_service.send_message_with_header_type(RPIService.ANDROID_HEADER, payload)
 
-    def start_service(self) -> None:
+    def start_service(self, host: str = RPIService.HOST, port: int = RPIService.PORT) -> None:
         """
         Starts the run by connecting to the rpi
+
+        :param host: The host of the RPI server
+        :param port: The port of the RPI server
         """
-        self.rpi_service.connect_to_rpi()
+        self.rpi_service.connect_to_rpi(host, port)
 
         Thread(target=self.interpret_rpi_messages, daemon=True).start()
 
@@ -177,7 +211,10 @@ class ExplorationRun:
                                        self.obstacle_arena,
                                        on_update_map=self.mark_sensed_area_as_explored,
                                        on_calibrate=self.calibrate_robot,
-                                       time_limit=_DEFAULT_TIME_LIMIT_IN_SECONDS)
+                                       time_limit=_DEFAULT_TIME_LIMIT_IN_SECONDS,
+                                       use_occupancy_grid=self.use_occupancy_grid,
+                                       use_view_planning=self.use_view_planning,
+                                       decision_budget=self.decision_budget)
 
         self.exploration.start_exploration()
 
@@ -185,6 +222,7 @@ class ExplorationRun:
 
         print_general_log('Done with exploration')
         self.send_mdf_string_to_android()
+        self.export_move_timings()
 
     def _setup_exploration(self) -> None:
         """
@@ -198,11 +236,31 @@ class ExplorationRun:
         self.gui.display_widgets.arena.set_unexplored_arena_map()
         self.reset_robot_to_initial_state()
 
+        if self.profile_path is not None:
+            span_recorder.enable()
+
+    def export_move_timings(self) -> None:
+        """
+        Exports the timings of every move of the exploration, and the report of every phase of the exploration next
+        to it, if the exploration is timed
+        """
+        if self.profile_path is None:
+            return
+
+        span_recorder.disable()
+        span_recorder.export(self.profile_path)
+        print_general_log(f'Move timings exported to {self.profile_path}')
+
+        phase_report_path = f'{splitext(self.profile_path)[0]}_phases.json'
+        self.exploration.profiler.export(phase_report_path)
+        print_general_log(f'Exploration phases exported to {phase_report_path}')
+
     def mark_sensed_area_as_explored(self, point: List[int]) -> None:
         """
         Updates the sensed area from the sensor on the GUI during exploration
         """
-        self.gui.display_widgets.arena.mark_sensed_area_as_explored_on_map(point)
+        with span_recorder.span('gui_repaint'):
+            self.gui.display_widgets.arena.mark_sensed_area_as_explored_on_map(point)
 
     def start_image_recognition_search(self) -> None:
         """
@@ -216,16 +274,30 @@ class ExplorationRun:
                                                        on_update_map=self.mark_sensed_area_as_explored,
                                                        on_calibrate=self.calibrate_robot,
                                                        on_take_photo=self.on_take_photo,
-                                                       time_limit=_DEFAULT_TIME_LIMIT_IN_SECONDS)
+                                                       time_limit=_DEFAULT_TIME_LIMIT_IN_SECONDS,
+                                                       use_occupancy_grid=self.use_occupancy_grid,
+                                                       use_view_planning=self.use_view_planning,
+                                                       decision_budget=self.decision_budget)
 
         self.exploration.start_exploration()
         print_general_log("Image Exploration completed")
+        self.export_move_timings()
 
-    def on_take_photo(self, robot_point, obstacles) -> None:
+    def on_take_photo(self, robot_point: List[int], obstacles: list, robot_direction: 'Direction') -> bool:
         """
-        Calls this function whenever the robot takes a photo in the arena
+        Calls this function whenever the robot takes a photo in the arena. \n
+        Runs on the exploration thread after the movement, so the photo is taken from the pose that the region and
+        face of the photo request are computed from, before the next movement is sent. The upload and recognition of
+        the photo by the RPI and the image recognition service overlap with the next movements. The time since the
+        end of the last movement, e.g. for sensing and planning, counts towards the settle delay.
+
+        :param robot_point: The position of the robot when the photo is requested
+        :param obstacles: The obstacles to take photo
+        :param robot_direction: The direction of the robot when the photo is requested
+        :return: True if the instruction to take photo is sent to the RPI. Else False. It does not confirm that the
+                 photo is taken
         """
-        sleep(0.7)
+        sleep(max(0.0, _PHOTO_SETTLE_DELAY - (perf_counter() - self.last_movement_end_time)))
 
         # find nearest obstacle point from the robot point
         closest_euclidean_distance = 9999999
@@ -243,8 +315,16 @@ class ExplorationRun:
 
         closest_obstacle_point = obstacles[closest_obstacle_point_index]
         converted_point = _convert_to_image_rec_coordinate_format(closest_obstacle_point)
+        image_region = get_expected_image_region(robot_point, robot_direction, closest_obstacle_point)
+
+        # Camera faces the right of the robot, so the photographed face points to the left of the robot
+        face_direction = Direction.get_anti_clockwise_direction(robot_direction)
 
-        self.rpi_service.take_photo(converted_point)
+        return self.rpi_service.take_photo(converted_point,
+                                           image_region,
+                                           face_direction,
+                                           _convert_to_image_rec_coordinate_format(robot_point),
+                                           robot_direction)
 
     def reset_robot_to_initial_state(self) -> None:
         """
@@ -306,7 +386,13 @@ class FastestPathRun:
     Class for fastest path task
     """
 
-    def __init__(self):
+    def __init__(self, precompute_fastest_paths: bool = False, no_of_batches_ahead: int = None):
+        """
+        :param precompute_fastest_paths: True to plan the fastest path through every possible way point after the map
+                                         is loaded, so that the FP command does not wait for the planning
+        :param no_of_batches_ahead: The number of batches of the fastest path sent ahead of the acknowledgements of
+                                    the Arduino. The batches are sent with a fixed delay in between if None
+        """
         self.rpi_service = RPIService()
         self.robot = RealRobot(ROBOT_START_POINT,
                                Direction.NORTH,
@@ -314,8 +400,12 @@ class FastestPathRun:
                                get_sensor_values=lambda: None)
 
         self.waypoint = None
+        self.additional_waypoints = []  # Visited with the way point in the fastest order
         self.robot_updated_point = None
         self.robot_updated_direction = None
+        self.path_cache = PathCache()  # Repeated FP commands on the same map reuse the path
+        self.fastest_path_plans = {}  # Keyed by the way point, for the robot at the start point facing north
+        self.no_of_batches_ahead = no_of_batches_ahead
 
         self.gui = RealTimeGUI()
         self.gui.display_widgets.arena.robot = self.robot
@@ -324,6 +414,10 @@ class FastestPathRun:
         self.p1_descriptor = None
         self.p2_descriptor = None
         self.map = self.load_map_from_disk()
+        self.multi_waypoint_planner = MultiWaypointPlanner(self.map)
+
+        if precompute_fastest_paths:
+            Thread(target=self.precompute_fastest_path_plans, daemon=True).start()
 
     def load_map_from_disk(self) -> List[int]:
         """
@@ -338,11 +432,23 @@ class FastestPathRun:
 
         return generated_arena
 
-    def start_service(self) -> None:
+    def precompute_fastest_path_plans(self) -> None:
+        """
+        Plans the fastest path through every possible way point from the default start position of the robot
+        """
+        self.fastest_path_plans = precompute_fastest_path_plans(self.map,
+                                                                ROBOT_START_POINT,
+                                                                ROBOT_END_POINT,
+                                                                Direction.NORTH)
+
+    def start_service(self, host: str = RPIService.HOST, port: int = RPIService.PORT) -> None:
         """
         Starts the rpi server
+
+        :param host: The host of the RPI server
+        :param port: The port of the RPI server
         """
-        self.rpi_service.connect_to_rpi()
+        self.rpi_service.connect_to_rpi(host, port)
 
         Thread(target=self.interpret_rpi_messages, daemon=True).start()
         Thread(target=self.send_mdf_string_to_android, daemon=True).start()
@@ -361,6 +467,9 @@ class FastestPathRun:
             if message_header_type == RPIService.WAYPOINT_HEADER:
                 self.decode_and_save_waypoint(response_message)
                 continue
+            if message_header_type == RPIService.ADD_WAYPOINT_HEADER:
+                self.decode_and_add_waypoint(response_message)
+                continue
             if message_header_type == RPIService.NEW_ROBOT_POSITION_HEADER:
                 self.decode_and_set_robot_position(response_message)
                 continue
@@ -379,14 +488,56 @@ class FastestPathRun:
 
     def decode_and_save_waypoint(self, message: str) -> None:
         """
-        Validates start position of given, sets the robot's waypoint position and updates the position on the GUI
+        Validates start position of given, sets the robot's waypoint position and updates the position on the GUI. \n
+        The additional waypoints of the previous waypoint are cleared.
 
         :param message: The robot position from the Android
         """
+        waypoint = self.decode_and_validate_waypoint(message)
+
+        if waypoint is None:
+            return
+
+        for old_waypoint in [self.waypoint] + self.additional_waypoints:  # clear old waypoints
+            if old_waypoint is not None:
+                self.gui.display_widgets.arena.remove_way_point_on_canvas(old_waypoint)
+
+        self.waypoint = waypoint
+        self.additional_waypoints = []
+
+        self.gui.display_widgets.arena.set_way_point_on_canvas(waypoint)
+
+    def decode_and_add_waypoint(self, message: str) -> None:
+        """
+        Validates the waypoint and adds it to the waypoints that the fastest path visits after the waypoint, in the
+        fastest order
+
+        :param message: The waypoint position from the Android
+        """
+        waypoint = self.decode_and_validate_waypoint(message)
+
+        if waypoint is None:
+            return
+
+        if self.waypoint is None:
+            print_error_log('Waypoint not set! Set it before adding waypoints')
+            return
+
+        self.additional_waypoints.append(waypoint)
+
+        self.gui.display_widgets.arena.set_way_point_on_canvas(waypoint)
+
+    def decode_and_validate_waypoint(self, message: str) -> Optional[List[int]]:
+        """
+        Decodes the waypoint from the Android and checks that the robot can stand on it
+
+        :param message: The waypoint position from the Android
+        :return: The waypoint. None if it is invalid
+        """
         waypoint_string = validate_and_decode_point(message)
 
         if waypoint_string is None:
-            return
+            return None
 
         waypoint = _decode_android_coordinate_format(waypoint_string)
 
@@ -394,14 +545,9 @@ class FastestPathRun:
 
         if not is_within_arena_range(row, column) or Map.point_is_not_free_area(self.map, waypoint):
             print_error_log('Waypoint is not within arena range, cannot be an obstacle or virtual wall!')
-            return
+            return None
 
-        if self.waypoint is not None:  # clear old waypoint
-            self.gui.display_widgets.arena.remove_way_point_on_canvas(self.waypoint)
-
-        self.waypoint = waypoint
-
-        self.gui.display_widgets.arena.set_way_point_on_canvas(waypoint)
+        return waypoint
 
     def decode_and_set_robot_position(self, message: str) -> None:
         """
@@ -435,7 +581,19 @@ class FastestPathRun:
 
         self.reset_robot_to_initial_state()
 
-        solver = AStarAlgorithm(self.map)
+        if len(self.additional_waypoints) > 0:
+            self.start_multi_waypoint_fastest_path_run()
+            return
+
+        fastest_path_plan = self.fastest_path_plans.get(tuple(self.waypoint))
+
+        if fastest_path_plan is not None and self.robot.point == ROBOT_START_POINT and \
+                self.robot.direction == Direction.NORTH:
+            self.send_movements_to_rpi(fastest_path_plan.arduino_format_movements)
+            self.display_result_in_gui(fastest_path_plan.get_path())
+            return
+
+        solver = AStarAlgorithm(self.map, self.path_cache)
 
         self.gui.display_widgets.log_area.insert_log_message('Finding the fastest path…')
         path = solver.run_algorithm(self.robot.point,
@@ -447,8 +605,27 @@ class FastestPathRun:
             self.gui.display_widgets.log_area.insert_log_message('No fastest path route found…')
             return
 
-        movements = solver.convert_fastest_path_to_movements(path, self.robot.direction)
-        arduino_format_movements = solver.consolidate_movements_to_string(movements)
+        arduino_format_movements = solver.convert_fastest_path_to_arduino_format(path, self.robot.direction)
+
+        self.send_movements_to_rpi(arduino_format_movements)
+        self.display_result_in_gui(path)
+
+    def start_multi_waypoint_fastest_path_run(self) -> None:
+        """
+        Starts the fastest path through the waypoint and the additional waypoints, in the fastest visiting order
+        """
+        self.gui.display_widgets.log_area.insert_log_message('Finding the fastest path through the waypoints…')
+        path = self.multi_waypoint_planner.run_algorithm(self.robot.point,
+                                                         [self.waypoint] + self.additional_waypoints,
+                                                         ROBOT_END_POINT,
+                                                         self.robot.direction)
+
+        if not path:
+            self.gui.display_widgets.log_area.insert_log_message('No fastest path route found…')
+            return
+
+        arduino_format_movements = AStarAlgorithm(self.map).convert_fastest_path_to_arduino_format(path,
+                                                                                                   self.robot.direction)
 
         self.send_movements_to_rpi(arduino_format_movements)
         self.display_result_in_gui(path)
@@ -465,9 +642,16 @@ class FastestPathRun:
 
         movement_instructions_list = AStarAlgorithm.check_and_separate_long_instructions(movements)
         print(movement_instructions_list)
+
+        if self.no_of_batches_ahead is not None:
+            self.rpi_service.stream_instruction_batches(movement_instructions_list,
+                                                        self.no_of_batches_ahead,
+                                                        _FASTEST_PATH_BATCH_DELAY)
+            return
+
         for instruction_batch in movement_instructions_list:
             self.rpi_service.send_message_with_header_type(RPIService.ARDUINO_HEADER, instruction_batch)
-            sleep(7)
+            sleep(_FASTEST_PATH_BATCH_DELAY)
 
     def display_result_in_gui(self, path: list) -> None:
         """
@@ -508,24 +692,54 @@ class FastestPathRun:
         self.gui.mainloop()
 
 
-def main(task_type: str) -> None:
+def main(task_type: str,
+         host: str = None,
+         port: int = None,
+         profile_path: str = None,
+         use_occupancy_grid: bool = False,
+         use_view_planning: bool = False,
+         precompute_fastest_paths: bool = False,
+         no_of_batches_ahead: int = None,
+         decision_budget: float = None) -> None:
     """
     Main run function
+
+    :param task_type: fp for the fastest path run or exp for the exploration run
+    :param host: The host of the RPI server. Defaults to the RPI if None
+    :param port: The port of the RPI server. Defaults to the RPI if None
+    :param profile_path: The file to export the timings of every exploration move to. Not timed if None
+    :param use_occupancy_grid: True to fuse the sensor readings in an occupancy grid during the exploration
+    :param use_view_planning: True to explore the unexplored cells by information gain per move
+    :param precompute_fastest_paths: True to plan the fastest path through every possible way point at startup
+    :param no_of_batches_ahead: The number of batches of the fastest path sent ahead of the acknowledgements of the
+                                Arduino. The batches are sent with a fixed delay in between if None
+    :param decision_budget: The time in seconds that every decision step of the exploration may take to plan. Not
+                            bounded if None
     """
     if task_type == 'fp':
-        app = FastestPathRun()
+        app = FastestPathRun(precompute_fastest_paths, no_of_batches_ahead)
 
     elif task_type == 'exp':
-        app = ExplorationRun()
+        app = ExplorationRun(profile_path, use_occupancy_grid, use_view_planning, decision_budget)
 
     else:
         raise ValueError('Invalid type')
 
-    Thread(target=app.start_service, daemon=True).start()
+    Thread(target=app.start_service,
+           args=(host if host is not None else RPIService.HOST, port if port is not None else RPIService.PORT),
+           daemon=True).start()
     app.start_gui()
 
 
 if __name__ == '__main__':
     arguments = get_parser()
 
-    main(arguments.task_type)
+    main(arguments.task_type,
+         arguments.host,
+         arguments.port,
+         arguments.profile,
+         arguments.occupancy_grid,
+         arguments.view_planning,
+         arguments.precompute_fastest_paths,
+         arguments.stream_fastest_path,
+         arguments.decision_budget)
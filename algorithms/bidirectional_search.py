@@ -0,0 +1,216 @@
+"""
+Contain the bidirectional search of the fastest path, which meets in the middle of the arena
+"""
+import heapq
+from typing import List, Optional
+
+from algorithms.jump_point_search import PathStep
+from utils import constants
+from utils.enums import Cell
+
+# The (row, column) offset of every direction, indexed by the direction divided by 2 (north, east, south, west)
+_DIRECTION_OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+# Indexed by the number of right rotations (in multiples of 90 degrees) from the current to the next direction
+_TURN_COSTS = [constants.NO_TURN_COST,
+               constants.TURN_COST_PERPENDICULAR,
+               constants.TURN_COST_OPPOSITE_DIRECTION,
+               constants.TURN_COST_PERPENDICULAR]
+
+
+class _Search:
+    """
+    One direction of the bidirectional search, over the (cell, direction) states of the robot. \n
+    A state is the cell number times 4 plus the direction divided by 2. The backward search follows the moves of the
+    robot in reverse, so its cost of a state is the cost from the state to the goal. \n
+    The states are ordered by their cost plus the average of the distance to the point the search heads for and the
+    distance from the point the search started at. Both searches then agree on the cost of every move, and the
+    search can stop as soon as the frontiers meet on the best path.
+    """
+
+    def __init__(self, is_forward: bool, target_row: int, target_column: int, source_row: int, source_column: int):
+        """
+        :param is_forward: True if the search goes from the start point to the goal
+        :param target_row: The row of the point the search heads for
+        :param target_column: The column of the point the search heads for
+        :param source_row: The row of the point the search starts at
+        :param source_column: The column of the point the search starts at
+        """
+        self.is_forward = is_forward
+        self.target_row = target_row
+        self.target_column = target_column
+        self.source_row = source_row
+        self.source_column = source_column
+
+        self.g_costs = {}
+        self.parent_states = {}
+        self.closed_states = set()
+
+        # (key, distance to the target, order of insertion, state). The key is doubled to keep it an integer
+        self.open_list = []
+        self.no_of_insertions = 0
+
+    def push(self, state: int, g_cost: int, parent_state: int, row: int, column: int) -> None:
+        self.g_costs[state] = g_cost
+        self.parent_states[state] = parent_state
+
+        distance_to_target = abs(row - self.target_row) + abs(column - self.target_column)
+        distance_to_source = abs(row - self.source_row) + abs(column - self.source_column)
+
+        heapq.heappush(self.open_list, (2 * g_cost + distance_to_target - distance_to_source, distance_to_target,
+                                        self.no_of_insertions, state))
+        self.no_of_insertions += 1
+
+    def get_min_key(self) -> Optional[int]:
+        """
+        Drops the outdated entries at the top of the open list
+
+        :return: The lowest key of the open states. None if there is no open state
+        """
+        open_list = self.open_list
+
+        while len(open_list) > 0 and open_list[0][3] in self.closed_states:
+            heapq.heappop(open_list)
+
+        return open_list[0][0] if len(open_list) > 0 else None
+
+
+def find_fastest_path_bidirectionally(arena: List[List[int]],
+                                      start_point: List[int],
+                                      start_direction_index: int,
+                                      start_g_cost: int,
+                                      goal_point: List[int]) -> Optional[List[PathStep]]:
+    """
+    Searches for the best path from the start point and from the goal at the same time, over the (cell, direction)
+    states of the robot. \n
+    The goal can be reached facing any direction, so the backward search starts from the goal facing every direction.
+    The two searches meet on a state, so the turn of the robot where the paths join is paid in one of them. The
+    search stops once the lowest keys of the two searches add up to the cost of the best path through a meeting
+    state, as no cheaper path can be found after that.
+
+    :param arena: The arena with virtual walls
+    :param start_point: The start point of the robot
+    :param start_direction_index: The direction of the robot at the start point divided by 2
+    :param start_g_cost: The cost of the path before the start point
+    :param goal_point: Expects a way point or the goal point
+    :return: Every cell of the path after the start point, with its direction and cost. None if there is no path
+    """
+    height = len(arena)
+    width = len(arena[0])
+    start_row, start_column = start_point
+    goal_row, goal_column = goal_point
+
+    if start_point == goal_point:
+        return []
+
+    def is_free(row: int, column: int) -> bool:
+        return 0 < row < height - 1 and 0 < column < width - 1 and arena[row][column] == Cell.FREE_AREA
+
+    start_state = (start_row * width + start_column) * 4 + start_direction_index
+
+    forward_search = _Search(True, goal_row, goal_column, start_row, start_column)
+    forward_search.push(start_state, 0, -1, start_row, start_column)
+
+    backward_search = _Search(False, start_row, start_column, goal_row, goal_column)
+
+    for direction_index in range(4):
+        backward_search.push((goal_row * width + goal_column) * 4 + direction_index, 0, -1, goal_row, goal_column)
+
+    best_cost = float('inf')
+    meeting_state = None
+
+    while True:
+        forward_min_key = forward_search.get_min_key()
+        backward_min_key = backward_search.get_min_key()
+
+        if forward_min_key is None or backward_min_key is None or \
+                forward_min_key + backward_min_key >= 2 * best_cost:
+            break
+
+        # Expand the search with the lower key, so that the frontiers meet in the middle
+        search, other_search = (forward_search, backward_search) if forward_min_key <= backward_min_key \
+            else (backward_search, forward_search)
+
+        _, _, _, state = heapq.heappop(search.open_list)
+        search.closed_states.add(state)
+
+        cell, direction_index = divmod(state, 4)
+        row, column = divmod(cell, width)
+        g_cost = search.g_costs[state]
+
+        # Every (state, cost) next to the state, following the moves of the robot forwards or in reverse
+        neighbours = []
+        row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+        sign = 1 if search.is_forward else -1
+
+        if is_free(row + sign * row_offset, column + sign * column_offset):
+            neighbours.append((row + sign * row_offset, column + sign * column_offset, direction_index,
+                               constants.MOVE_COST))
+
+        for no_of_right_rotations in (1, 2, 3):
+            next_direction_index = (direction_index + no_of_right_rotations) % 4
+            next_row_offset, next_column_offset = _DIRECTION_OFFSETS[next_direction_index]
+
+            # Only turn towards a free cell, or from a direction the robot could have arrived in
+            if is_free(row + sign * next_row_offset, column + sign * next_column_offset) or \
+                    cell * 4 + next_direction_index == start_state:
+                neighbours.append((row, column, next_direction_index, _TURN_COSTS[no_of_right_rotations]))
+
+        for next_row, next_column, next_direction_index, cost in neighbours:
+            next_state = (next_row * width + next_column) * 4 + next_direction_index
+            next_g_cost = g_cost + cost
+
+            if next_state in search.closed_states or next_g_cost >= search.g_costs.get(next_state, next_g_cost + 1):
+                continue
+
+            search.push(next_state, next_g_cost, state, next_row, next_column)
+
+            if next_state in other_search.g_costs and next_g_cost + other_search.g_costs[next_state] < best_cost:
+                best_cost = next_g_cost + other_search.g_costs[next_state]
+                meeting_state = next_state
+
+    if meeting_state is None:
+        return None
+
+    return _rebuild_path(meeting_state, width, start_g_cost, forward_search, backward_search)
+
+
+def _rebuild_path(meeting_state: int,
+                  width: int,
+                  start_g_cost: int,
+                  forward_search: '_Search',
+                  backward_search: '_Search') -> List[PathStep]:
+    """
+    Joins the path from the start state to the meeting state and the path from the meeting state to the goal
+
+    :return: Every cell of the path after the start point, with its direction and cost
+    """
+    states = []
+    state = meeting_state
+
+    while state != -1:
+        states.append(state)
+        state = forward_search.parent_states[state]
+
+    states.reverse()
+    state = backward_search.parent_states[meeting_state]
+
+    while state != -1:
+        states.append(state)
+        state = backward_search.parent_states[state]
+
+    path = []
+    g_cost = start_g_cost
+
+    for previous_state, state in zip(states, states[1:]):
+        previous_cell, previous_direction_index = divmod(previous_state, 4)
+        cell, direction_index = divmod(state, 4)
+
+        if cell == previous_cell:
+            g_cost += _TURN_COSTS[(direction_index - previous_direction_index) % 4]
+            continue
+
+        g_cost += constants.MOVE_COST
+        path.append((*divmod(cell, width), direction_index, g_cost))
+
+    return path
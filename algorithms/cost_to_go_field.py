@@ -0,0 +1,165 @@
+"""
+Contain CostToGoField Class
+"""
+from typing import List, Optional
+
+from utils import constants
+from utils.enums import Cell, Direction, Movement
+
+# Indexed by the direction divided by 2, so that turning right adds 1 to the index
+_DIRECTIONS = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
+_DIRECTION_OFFSETS = [constants.NORTH_POSITION, constants.EAST_POSITION, constants.SOUTH_POSITION,
+                      constants.WEST_POSITION]
+
+# The costs of a step forward and of the turns, indexed by the number of right rotations of 90 degrees
+_COSTS_IN_MOVES = (1, [0, 1, 2, 1])
+_COSTS_OF_SOLVER = (constants.MOVE_COST, [constants.NO_TURN_COST,
+                                          constants.TURN_COST_PERPENDICULAR,
+                                          constants.TURN_COST_OPPOSITE_DIRECTION,
+                                          constants.TURN_COST_PERPENDICULAR])
+
+
+class CostToGoField:
+    """
+    Keeps the number of moves from every position and direction of the robot to a goal. \n
+    A move is a step forward or a turn of 90 degrees, like the movements sent to the robot, so the field gives the
+    time to reach the goal over the speed of the robot. The field can instead weigh the steps and turns like the fastest
+    path solver. It is built with one backward search over the (cell, direction) states, with a bucket per cost, and
+    only needs to be updated when the map changes.
+    """
+
+    def __init__(self,
+                 goal_point: List[int],
+                 goal_direction: Optional['Direction'] = None,
+                 use_solver_costs: bool = False):
+        """
+        :param goal_point: The position of the robot at the goal
+        :param goal_direction: The direction the robot must face at the goal. Any direction if None
+        :param use_solver_costs: True to weigh a step forward with MOVE_COST and the turns with their TURN_COST like the
+        fastest path solver. Else every step forward and turn of 90 degrees counts as one move
+        """
+        self.goal_point = tuple(goal_point)
+        self.goal_direction = goal_direction
+        self.move_cost, self.turn_costs = _COSTS_OF_SOLVER if use_solver_costs else _COSTS_IN_MOVES
+        self.no_of_moves = [[[None] * len(_DIRECTIONS) for _ in range(constants.ARENA_WIDTH)]
+                            for _ in range(constants.ARENA_HEIGHT)]
+
+    def update(self, virtual_map: List[List[int]]) -> None:
+        """
+        Rebuilds the number of moves to the goal from every free cell of the map
+
+        :param virtual_map: The obstacle map with virtual walls, where the robot can only stand on free cells
+        """
+        no_of_moves = [[[None] * len(_DIRECTIONS) for _ in range(constants.ARENA_WIDTH)]
+                       for _ in range(constants.ARENA_HEIGHT)]
+        self.no_of_moves = no_of_moves
+
+        goal_row, goal_column = self.goal_point
+
+        if virtual_map[goal_row][goal_column] != Cell.FREE_AREA:
+            return
+
+        if self.goal_direction is None:
+            goal_direction_indexes = range(len(_DIRECTIONS))
+        else:
+            goal_direction_indexes = [self.goal_direction // 2]
+
+        # Indexed by the number of moves, since the costs are small integers
+        states_to_visit = [[]]
+
+        for direction_index in goal_direction_indexes:
+            no_of_moves[goal_row][goal_column][direction_index] = 0
+            states_to_visit[0].append((goal_row, goal_column, direction_index))
+
+        no_of_moves_of_state = 0
+
+        # A U-turn costs as much as two turns of 90 degrees, so only the turns of 90 degrees are searched
+        turns = [(1, self.turn_costs[1]), (3, self.turn_costs[3])]
+
+        def add_state_to_visit(previous_row: int, previous_column: int, previous_direction_index: int, cost: int):
+            no_of_moves_of_previous_state = no_of_moves_of_state + cost
+            no_of_moves_so_far = no_of_moves[previous_row][previous_column][previous_direction_index]
+
+            if no_of_moves_so_far is not None and no_of_moves_so_far <= no_of_moves_of_previous_state:
+                return
+
+            no_of_moves[previous_row][previous_column][previous_direction_index] = no_of_moves_of_previous_state
+
+            while len(states_to_visit) <= no_of_moves_of_previous_state:
+                states_to_visit.append([])
+
+            states_to_visit[no_of_moves_of_previous_state].append(
+                (previous_row, previous_column, previous_direction_index))
+
+        # Searches backwards from the goal, so a state is reached from the states that move or turn into it
+        while no_of_moves_of_state < len(states_to_visit):
+            for row, column, direction_index in states_to_visit[no_of_moves_of_state]:
+                if no_of_moves[row][column][direction_index] != no_of_moves_of_state:
+                    continue  # Reached with fewer moves after it was added
+
+                for no_of_right_rotations, turn_cost in turns:
+                    add_state_to_visit(row, column, (direction_index - no_of_right_rotations) % 4, turn_cost)
+
+                row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+                previous_row, previous_column = row - row_offset, column - column_offset
+
+                if 0 <= previous_row < constants.ARENA_HEIGHT and 0 <= previous_column < constants.ARENA_WIDTH and \
+                        virtual_map[previous_row][previous_column] == Cell.FREE_AREA:
+                    add_state_to_visit(previous_row, previous_column, direction_index, self.move_cost)
+
+            no_of_moves_of_state += 1
+
+    def get_no_of_moves(self, point: List[int], direction: 'Direction') -> Optional[int]:
+        """
+        Gets the number of moves to the goal
+
+        :param point: The position of the robot
+        :param direction: The direction the robot is facing
+        :return: The number of moves to the goal, weighted like the fastest path solver if the field uses its costs.
+                 None if the goal cannot be reached
+        """
+        row, column = point
+
+        if not (0 <= row < constants.ARENA_HEIGHT and 0 <= column < constants.ARENA_WIDTH):
+            return None
+
+        return self.no_of_moves[row][column][direction // 2]
+
+    def get_movements(self, point: List[int], direction: 'Direction') -> Optional[List['Movement']]:
+        """
+        Follows the field down to the goal
+
+        :param point: The position of the robot
+        :param direction: The direction the robot is facing
+        :return: The movements to the goal. None if the goal cannot be reached
+        """
+        row, column = point
+        direction_index = direction // 2
+        no_of_moves = self.get_no_of_moves(point, direction)
+
+        if no_of_moves is None:
+            return None
+
+        list_of_movements = []
+
+        while no_of_moves > 0:
+            row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+            next_row, next_column = row + row_offset, column + column_offset
+
+            if 0 <= next_row < constants.ARENA_HEIGHT and 0 <= next_column < constants.ARENA_WIDTH and \
+                    self.no_of_moves[next_row][next_column][direction_index] == no_of_moves - self.move_cost:
+                list_of_movements.append(Movement.FORWARD)
+                row, column = next_row, next_column
+                no_of_moves -= self.move_cost
+
+            elif self.no_of_moves[row][column][(direction_index + 1) % 4] == no_of_moves - self.turn_costs[1]:
+                list_of_movements.append(Movement.RIGHT)
+                direction_index = (direction_index + 1) % 4
+                no_of_moves -= self.turn_costs[1]
+
+            else:
+                list_of_movements.append(Movement.LEFT)
+                direction_index = (direction_index - 1) % 4
+                no_of_moves -= self.turn_costs[3]
+
+        return list_of_movements
@@ -0,0 +1,31 @@
+"""
+Contain the time budget of a decision step of the exploration, for anytime planning
+"""
+from time import perf_counter
+from typing import Optional
+
+
+class DecisionBudget:
+    """
+    The time that a decision step of the exploration may take to plan. \n
+    The decision step evaluates its candidates from the most to the least promising, and stops refining once the budget
+    has run out, with the best candidate found so far. A decision step without any candidate found yet only tries a
+    few more of the candidates that the robot can reach, so that it stays bounded even if the nearest candidates are
+    unreachable.
+    """
+
+    def __init__(self, duration: Optional[float] = None):
+        """
+        :param duration: The time in seconds that the decision step may take. Unlimited if None
+        """
+        self.duration = duration
+        self.deadline = None if duration is None else perf_counter() + duration
+
+    @property
+    def has_run_out(self) -> bool:
+        """
+        Determines if the decision step has used up its time
+
+        :return: True if the budget is limited and the deadline has passed. Else False
+        """
+        return self.deadline is not None and perf_counter() >= self.deadline
@@ -1,21 +1,37 @@
-from collections import deque
+import random
 from copy import deepcopy
 from time import perf_counter
 from typing import Callable, Dict, List, Tuple, Union
 
+from algorithms.cost_to_go_field import CostToGoField
+from algorithms.decision_budget import DecisionBudget
+from algorithms.exploration_profiler import ExplorationProfiler
 from algorithms.fastest_path_solver import AStarAlgorithm, Node
+from algorithms.occupancy_grid import OccupancyGrid
+from algorithms.view_planner import count_cells_revealed_at_poses, get_travel_distances, \
+    rank_poses_by_information_gain
 from map import is_within_arena_range, Map
 from utils import constants
 from utils.constants import ROBOT_START_POINT, ROBOT_END_POINT
 from utils.enums import Cell, Direction, Movement
 from utils.logger import print_general_log, print_error_log
-
-_MAX_QUEUE_LENGTH = 6
-_STUCK_IN_LOOP_MOVEMENT_BEHAVIOUR = [Movement.FORWARD, Movement.RIGHT, Movement.FORWARD, Movement.RIGHT,
-                                     Movement.FORWARD, Movement.RIGHT]
+from utils.timing import span_recorder
 
 _MIN_STEPS_TO_START_CALIBRATION = 4
 
+# The largest share of the time to spare before the robot has to return to the start area that a decision step may
+# take, so that the robot plans less as the time limit gets closer
+_MAX_SHARE_OF_SPARE_TIME_PER_DECISION = 0.05
+
+# The most neighbours of the unexplored cells that a decision step plans after its budget has run out, if it has not
+# found a path yet
+_MAX_NO_OF_CANDIDATES_AFTER_DEADLINE = 3
+
+# A random key of every cell of the arena. The hash of the obstacle map is the XOR of the keys of the obstacle cells,
+# so that it is updated in O(1) for every cell that changes (Zobrist hashing)
+_OBSTACLE_CELL_KEYS = [[random.Random(row * constants.ARENA_WIDTH + column).getrandbits(64)
+                        for column in range(constants.ARENA_WIDTH)] for row in range(constants.ARENA_HEIGHT)]
+
 
 def get_current_time_in_seconds() -> float:
     return perf_counter()
@@ -27,6 +43,40 @@ def get_default_exploration_duration() -> float:
     return default_time_in_minutes * 60
 
 
+def get_min_no_of_movements(robot_point: List[int],
+                            robot_facing_direction: 'Direction',
+                            destination_point: Tuple[int, int]) -> int:
+    """
+    Gets a lower bound of the number of movements to the destination: a step for every cell of the manhattan distance,
+    and a turn of 90 degrees for every direction of travel that the robot has to turn to
+
+    :param robot_point: The robot's current position
+    :param robot_facing_direction: The robot's current facing
+    :param destination_point: The position to move to
+    :return: The fewest movements that any path to the destination can have
+    """
+    row_offset = destination_point[0] - robot_point[0]
+    column_offset = destination_point[1] - robot_point[1]
+    directions_of_travel = []
+
+    if row_offset != 0:
+        directions_of_travel.append(Direction.NORTH if row_offset < 0 else Direction.SOUTH)
+
+    if column_offset != 0:
+        directions_of_travel.append(Direction.WEST if column_offset < 0 else Direction.EAST)
+
+    if len(directions_of_travel) <= 0:
+        return 0
+
+    # Turning to face the first direction of travel takes 1 turn, or 2 for a U-turn. Any other direction takes 1 more
+    no_of_turns = min(min(no_of_right_rotations, 8 - no_of_right_rotations) // 2
+                      for no_of_right_rotations in (
+                          Direction.get_no_of_right_rotations_to_destination_cell(robot_facing_direction, direction)
+                          for direction in directions_of_travel))
+
+    return abs(row_offset) + abs(column_offset) + no_of_turns + len(directions_of_travel) - 1
+
+
 class Exploration:
     def __init__(self,
                  robot,
@@ -35,7 +85,10 @@ class Exploration:
                  on_update_map: Callable = None,
                  on_calibrate: Callable = None,
                  coverage_limit: float = 1,
-                 time_limit: float = get_default_exploration_duration()):
+                 time_limit: float = get_default_exploration_duration(),
+                 use_occupancy_grid: bool = False,
+                 use_view_planning: bool = False,
+                 decision_budget: float = None):
         """
         Initialises the exploration algorithm to explore the arena.
 
@@ -46,6 +99,13 @@ class Exploration:
         :param on_calibrate: The callback function after calibrating the robot
         :param coverage_limit: The coverage limit for the robot to explore in the arena
         :param time_limit: The time limit for the robot to explore in the arena
+        :param use_occupancy_grid: True to fuse the sensor readings in an occupancy grid and mark the cells that are
+                                   likely obstacles on the obstacle map. Else the latest reading of a cell is used
+        :param use_view_planning: True to explore the unexplored cells from the pose that reveals the most unexplored
+                                  cells per move. Else the nearest unexplored cell is explored first
+        :param decision_budget: The time in seconds that every decision step may take to pick the unexplored cell to
+                                explore next. The best cell found when the time runs out is explored. Else the
+                                decision step is not bounded
         """
         self.robot = robot
         self.entered_goal = False
@@ -58,9 +118,24 @@ class Exploration:
         self.no_of_steps_taken = 0
         self.fastest_path_solver = AStarAlgorithm(obstacle_map)
         self.start_time = get_current_time_in_seconds()
-        self.queue = deque(maxlen=_MAX_QUEUE_LENGTH)  # Keeps a history of movements made by the robot
+        self.pose_history = {}  # Number of visits of every pose of the robot, for every state of the maps
+        self.is_revisited_pose = False
+        self.no_of_explored_cells = sum(cell != Cell.UNEXPLORED for row in explored_map for cell in row)
+        self.obstacle_map_hash = 0
+
+        for row in range(constants.ARENA_HEIGHT):
+            for column in range(constants.ARENA_WIDTH):
+                if obstacle_map[row][column] == Cell.OBSTACLE:
+                    self.obstacle_map_hash ^= _OBSTACLE_CELL_KEYS[row][column]
+
         self.on_update_map = on_update_map if on_update_map is not None else lambda t: None
         self.on_calibrate = on_calibrate if on_calibrate is not None else lambda: None
+        self.occupancy_grid = OccupancyGrid() if use_occupancy_grid else None
+        self.use_view_planning = use_view_planning
+        self.decision_budget = decision_budget
+        self.cost_to_home_field = CostToGoField(ROBOT_START_POINT, Direction.EAST)
+        self._state_of_cost_to_home_field = None  # The obstacle map hash and explored cells the field was built on
+        self.profiler = ExplorationProfiler(lambda: self.coverage)
 
     @property
     def coverage(self) -> float:
@@ -84,11 +159,53 @@ class Exploration:
 
     def __time_taken_to_return_to_start_point(self) -> float:
         """
-        The time taken to return back to the start area
+        The time taken to return back to the start area, including the turns
 
         :return: The time taken to reach the start area from the robot's current position
         """
-        return (AStarAlgorithm.get_h_cost(self.robot, Node(constants.ROBOT_START_POINT))) / self.robot.speed
+        return self.get_no_of_moves_to_start_point(self.robot.point, self.robot.direction) / self.robot.speed
+
+    def get_no_of_moves_to_start_point(self, point: List[int], direction: 'Direction') -> int:
+        """
+        Gets the number of moves, including the turns, to return to the start area along the explored cells
+
+        :param point: The position of the robot
+        :param direction: The direction the robot is facing
+        :return: The number of moves to the start area
+        """
+        self.update_cost_to_home_field()
+
+        no_of_moves = self.cost_to_home_field.get_no_of_moves(point, direction)
+
+        if no_of_moves is None:
+            # The position may have been explored after the field was built
+            self.update_cost_to_home_field(is_exact=True)
+            no_of_moves = self.cost_to_home_field.get_no_of_moves(point, direction)
+
+        if no_of_moves is None:
+            # No known path home, e.g. the robot stands on a phantom obstacle
+            no_of_moves = abs(point[0] - ROBOT_START_POINT[0]) + abs(point[1] - ROBOT_START_POINT[1])
+
+        return no_of_moves
+
+    def update_cost_to_home_field(self, is_exact: bool = False) -> None:
+        """
+        Rebuilds the number of moves home from every position of the robot if the obstacles changed since the last
+        build. \n
+        Cells explored since the last build only open up shorter ways home, so until the obstacles change, the field
+        is an upper bound of the number of moves home, which is safe for the time limit.
+
+        :param is_exact: True to also rebuild if cells were explored since the last build, e.g. to go home
+        """
+        if self._state_of_cost_to_home_field is not None and \
+                self._state_of_cost_to_home_field[0] == self.obstacle_map_hash and \
+                (not is_exact or self._state_of_cost_to_home_field[1] == self.no_of_explored_cells):
+            return
+
+        with span_recorder.span('cost_to_home'), self.profiler.planning():
+            self.cost_to_home_field.update(self.get_virtual_obstacle_map())
+
+        self._state_of_cost_to_home_field = (self.obstacle_map_hash, self.no_of_explored_cells)
 
     @property
     def limit_has_exceeded(self) -> bool:
@@ -104,25 +221,49 @@ class Exploration:
         return not self.is_running or coverage_limit_has_exceeded or time_limit_has_exceeded
         # return not self.is_running or coverage_limit_has_exceeded
 
+    def start_decision(self) -> 'DecisionBudget':
+        """
+        Starts the time budget of a decision step. The budget is cut to a share of the time to spare before the robot
+        has to return to the start area, so that the robot plans less as the time limit gets closer
+
+        :return: The time budget of the decision step. Unlimited if there is no decision budget
+        """
+        if self.decision_budget is None:
+            return DecisionBudget()
+
+        duration = self.decision_budget
+
+        if self.time_limit is not None:
+            spare_time = self.time_limit - self.time_elapsed - self.__time_taken_to_return_to_start_point()
+            duration = min(duration, max(spare_time, 0) * _MAX_SHARE_OF_SPARE_TIME_PER_DECISION)
+
+        return DecisionBudget(duration)
+
     def start_exploration(self) -> None:
         """
         Runs the exploration algorithm
         """
         self.start_time = get_current_time_in_seconds()
-        self.sense_and_repaint_canvas()
-        self.mark_robot_area_as_explored(self.robot.point[0], self.robot.point[1])
-        self.right_hug()
+
+        with self.profiler.phase('right_hug'):
+            self.sense_and_repaint_canvas()
+            self.mark_robot_area_as_explored(self.robot.point[0], self.robot.point[1])
+            self.right_hug()
 
         # Can comment the following functions if you decide not to explore the center of the arena
         # and rely on your long range sensors instead
         print_general_log('Done right hug. Checking for unexplored cells now...')
 
-        self.explore_unexplored_cells()
+        with self.profiler.phase('unexplored_cells'):
+            self.explore_unexplored_cells()
+
         print_general_log('Done exploring unexplored cells. Returning home now...')
 
-        self.go_home()
+        with self.profiler.phase('go_home'):
+            self.go_home()
 
         print_general_log('Reached home!')
+        self.profiler.print_report()
 
     def sense_and_repaint_canvas(self, sensor_values: List[Union[int, None]] = None) -> None:
         """
@@ -133,16 +274,23 @@ class Exploration:
         if sensor_values is None:  # This condition is true when running the simulation
             sensor_values = self.robot.sense()
 
+        if self.occupancy_grid is not None:
+            self.update_occupancy_grid(sensor_values)
+            return
+
+        sensor_rays = self.robot.sensor_rays[self.robot.direction]
+        robot_row, robot_column = self.robot.point
+
         for i in range(len(sensor_values)):
             obstacle_distance_from_the_sensor = sensor_values[i]
 
             if obstacle_distance_from_the_sensor == -1:
                 continue
 
-            sensor = self.robot.sensor_offset_points[i]
-            direction_offset = Direction.get_direction_offset(sensor.get_current_direction(self.robot.direction))
-            current_sensor_point = sensor.get_current_point(self.robot.point, self.robot.direction)
-            sensor_range = sensor.get_sensor_range()
+            sensor_ray = sensor_rays[i]
+            direction_offset = sensor_ray.direction_offset
+            current_sensor_point = (robot_row + sensor_ray.point_offset[0], robot_column + sensor_ray.point_offset[1])
+            sensor_range = sensor_ray.sensor_range
 
             is_left_sensor = i == 3  # always the index 3, change this base on your long range sensor position
 
@@ -157,6 +305,54 @@ class Exploration:
                 self.mark_cell_as_explored(current_sensor_point, direction_offset, updated_sensor_range,
                                            obstacle_distance_from_the_sensor, is_left_sensor=is_left_sensor)
 
+    def update_occupancy_grid(self, sensor_values: List[Union[int, None]]) -> None:
+        """
+        Fuses the sensor readings in the occupancy grid, marks the sensed cells as explored and
+        updates the obstacle map with the cells whose obstacle state changed
+
+        :param sensor_values: The sensor readings of the robot
+        """
+        sensor_readings = []
+        robot_row, robot_column = self.robot.point
+
+        for sensor, sensor_ray, obstacle_distance_from_the_sensor in zip(self.robot.sensor_offset_points,
+                                                                         self.robot.sensor_rays[self.robot.direction],
+                                                                         sensor_values):
+            if obstacle_distance_from_the_sensor == -1:
+                continue
+
+            sensor_readings.append(((robot_row + sensor_ray.point_offset[0], robot_column + sensor_ray.point_offset[1]),
+                                    sensor_ray.direction_offset,
+                                    sensor.is_short_range,
+                                    obstacle_distance_from_the_sensor))
+
+        observed_cells, changed_cells = self.occupancy_grid.update(sensor_readings)
+
+        for row, column in observed_cells:
+            self.set_cell_as_explored(row, column)
+            self.on_update_map([row, column])
+
+        for row, column in changed_cells:
+            is_obstacle = self.occupancy_grid.is_occupied[row][column]
+
+            if not is_obstacle:
+                print_general_log(f'Unset obstacle at point: {[row, column]}')
+
+            self.set_obstacle_cell(row, column, Cell.OBSTACLE.value if is_obstacle else Cell.FREE_AREA.value)
+            self.on_update_map([row, column])
+            self.on_obstacle_cell_changed((row, column), is_obstacle)
+
+        self.set_start_and_end_point_as_free_area()
+
+    def on_obstacle_cell_changed(self, cell_point: Tuple[int, int], is_obstacle: bool) -> None:
+        """
+        Called when the occupancy grid marks or unmarks the cell as an obstacle
+
+        :param cell_point: The cell point
+        :param is_obstacle: True if the cell is now an obstacle. Else False
+        """
+        pass
+
     def mark_cell_as_explored(self,
                               current_sensor_point: Tuple[int],
                               direction_offset: List[int],
@@ -182,7 +378,7 @@ class Exploration:
             if not is_within_arena_range(cell_point_to_mark[0], cell_point_to_mark[1]):
                 continue
 
-            self.explored_map[cell_point_to_mark[0]][cell_point_to_mark[1]] = Cell.EXPLORED.value
+            self.set_cell_as_explored(cell_point_to_mark[0], cell_point_to_mark[1])
             self.on_update_map(cell_point_to_mark)
 
             if is_left_sensor:
@@ -192,7 +388,7 @@ class Exploration:
                     (is_left_sensor and j in sensor_range_to_ignore):
                 continue
 
-            self.obstacle_map[cell_point_to_mark[0]][cell_point_to_mark[1]] = Cell.OBSTACLE.value
+            self.set_obstacle_cell(cell_point_to_mark[0], cell_point_to_mark[1], Cell.OBSTACLE.value)
             self.on_update_map(cell_point_to_mark)
 
         self.set_start_and_end_point_as_free_area()
@@ -208,9 +404,35 @@ class Exploration:
 
         print_general_log(f'Unset obstacle at point: {cell_point_to_mark}')
 
-        self.obstacle_map[cell_point_to_mark[0]][cell_point_to_mark[1]] = Cell.FREE_AREA.value
+        self.set_obstacle_cell(cell_point_to_mark[0], cell_point_to_mark[1], Cell.FREE_AREA.value)
         self.on_update_map(cell_point_to_mark)
 
+    def set_cell_as_explored(self, row: int, column: int) -> None:
+        """
+        Marks the cell as explored on the explored map and counts the cell if it was unexplored
+
+        :param row: The row coordinate of the arena
+        :param column: The column coordinate of the arena
+        """
+        if self.explored_map[row][column] == Cell.UNEXPLORED:
+            self.no_of_explored_cells += 1
+
+        self.explored_map[row][column] = Cell.EXPLORED.value
+
+    def set_obstacle_cell(self, row: int, column: int, cell_value: int) -> None:
+        """
+        Sets the cell on the obstacle map and updates the hash of the obstacle map if the cell became (or stopped
+        being) an obstacle
+
+        :param row: The row coordinate of the arena
+        :param column: The column coordinate of the arena
+        :param cell_value: The value of the cell, e.g. Cell.OBSTACLE.value
+        """
+        if (self.obstacle_map[row][column] == Cell.OBSTACLE) != (cell_value == Cell.OBSTACLE):
+            self.obstacle_map_hash ^= _OBSTACLE_CELL_KEYS[row][column]
+
+        self.obstacle_map[row][column] = cell_value
+
     def set_start_and_end_point_as_free_area(self):
         start_point_row, start_point_column = ROBOT_START_POINT
         self.mark_specific_area_as_free_area_on_obstacle_map(start_point_row - 1, start_point_column)
@@ -229,28 +451,65 @@ class Exploration:
                 self.entered_goal = True
 
             if self.is_stuck_in_a_loop():
-                self.move(Movement.RIGHT)
-                self.move(Movement.RIGHT)
+                print_general_log('Stuck in a loop. Moving to the nearest unexplored cell...')
+
+                if not self.escape_loop():
+                    return
+
                 continue
 
             if self.right_of_robot_is_free():
-                self.move(Movement.RIGHT)
-                continue
+                list_of_movements = [Movement.RIGHT]
 
-            if self.front_of_robot_is_free():
-                self.move(Movement.FORWARD)
-                continue
+            elif self.front_of_robot_is_free():
+                list_of_movements = [Movement.FORWARD]
 
-            if self.left_of_robot_is_free():
-                self.move(Movement.LEFT)
-                continue
+            elif self.left_of_robot_is_free():
+                list_of_movements = [Movement.LEFT]
 
-            # Turn to the opposite direction to find alternative route
-            self.move(Movement.RIGHT)
-            self.move(Movement.RIGHT)
+            else:
+                # Turn to the opposite direction to find alternative route
+                list_of_movements = [Movement.RIGHT, Movement.RIGHT]
+
+            # Stops before the movements that would leave too little time to return to the start area
+            if not self.can_return_in_time_after_moving(list_of_movements):
+                return
+
+            for movement in list_of_movements:
+                self.move(movement)
+
+    def is_stuck_in_a_loop(self) -> bool:
+        """
+        Determines if the robot is back at a pose it visited before, with the same explored cells and obstacles. \n
+        The hugging only depends on the pose, the previous point and the maps, so the robot would go around the same
+        loop again.
+
+        :return: True if the robot is stuck in a loop. Else False
+        """
+        return self.is_revisited_pose
+
+    def record_pose(self) -> None:
+        """
+        Counts the visit of the robot's pose in the pose history, keyed by the state of the explored and obstacle maps
+        """
+        previous_point = tuple(self.previous_point) if self.previous_point is not None else None
+        pose = (self.robot.point[0], self.robot.point[1], self.robot.direction, previous_point,
+                self.no_of_explored_cells, self.obstacle_map_hash)
+        no_of_visits = self.pose_history.get(pose, 0) + 1
+
+        self.pose_history[pose] = no_of_visits
+        self.is_revisited_pose = no_of_visits > 1
 
-    def is_stuck_in_a_loop(self):
-        return list(self.queue) == _STUCK_IN_LOOP_MOVEMENT_BEHAVIOUR
+    def escape_loop(self) -> bool:
+        """
+        Leaves the loop along the fastest path to the nearest unexplored cell
+
+        :return: True if the robot explored new cells on the way. Else False, as the robot would be stuck again
+        """
+        no_of_explored_cells = self.no_of_explored_cells
+        is_explored = self.move_to_best_path_of_nearest_unexplored_cell(self.find_neighbours_of_all_unexplored_cells())
+
+        return is_explored and self.no_of_explored_cells > no_of_explored_cells
 
     def right_of_robot_is_free(self) -> bool:
         """
@@ -352,21 +611,29 @@ class Exploration:
 
         :param movement: The movement direction to be made by the robot
         """
-        self.queue.append(movement)
+        span_recorder.begin_move()
+
+        with span_recorder.span('move'):
+            self.profiler.record_movement(movement)
+
+            if not isinstance(movement, Movement) or movement == Movement.FORWARD or movement == Movement.BACKWARD:
+                self.previous_point = self.robot.point
 
-        if not isinstance(movement, Movement) or movement == Movement.FORWARD or movement == Movement.BACKWARD:
-            self.previous_point = self.robot.point
+            with span_recorder.span('robot_move'):
+                sensor_values = self.robot.move(movement)
 
-        sensor_values = self.robot.move(movement)
-        self.no_of_steps_taken += 1
-        self.calibrate_robot()
+            self.no_of_steps_taken += 1
+            self.calibrate_robot()
 
-        self.sense_and_repaint_canvas(sensor_values)
+            with span_recorder.span('map_update'):
+                self.sense_and_repaint_canvas(sensor_values)
 
-        robot_row_point = self.robot.point[0]
-        robot_column_point = self.robot.point[1]
+                robot_row_point = self.robot.point[0]
+                robot_column_point = self.robot.point[1]
 
-        self.mark_robot_area_as_explored(robot_row_point, robot_column_point)
+                self.mark_robot_area_as_explored(robot_row_point, robot_column_point)
+
+            self.record_pose()
 
     def calibrate_robot(self) -> None:
         """
@@ -375,7 +642,8 @@ class Exploration:
         if self.no_of_steps_taken % _MIN_STEPS_TO_START_CALIBRATION != 0:
             return
 
-        self.on_calibrate()
+        with span_recorder.span('calibration'):
+            self.on_calibrate()
 
     def mark_robot_area_as_explored(self, x: int, y: int) -> None:
         """
@@ -386,7 +654,7 @@ class Exploration:
         """
         for row_index in range(x - 1, x + 2):
             for column_index in range(y - 1, y + 2):
-                self.explored_map[row_index][column_index] = Cell.EXPLORED.value
+                self.set_cell_as_explored(row_index, column_index)
 
     def mark_specific_area_as_free_area_on_obstacle_map(self, row: int, column: int):
         """
@@ -397,9 +665,12 @@ class Exploration:
         """
         for row_index in range(row - 1, row + 3):
             for column_index in range(column - 1, column + 3):
-                self.obstacle_map[row_index][column_index] = Cell.FREE_AREA.value
+                self.set_obstacle_cell(row_index, column_index, Cell.FREE_AREA.value)
                 self.on_update_map([row_index, column_index])
 
+                if self.occupancy_grid is not None:
+                    self.occupancy_grid.set_free_area(row_index, column_index)
+
     def explore_unexplored_cells(self) -> None:
         """
         Checks for unexplored cells in the arena and explore them
@@ -409,7 +680,11 @@ class Exploration:
                 return
 
             neighbours_of_unexplored_cells = self.find_neighbours_of_all_unexplored_cells()
-            is_explored = self.move_to_best_path_of_nearest_unexplored_cell(neighbours_of_unexplored_cells)
+
+            if self.use_view_planning:
+                is_explored = self.move_to_next_best_view(neighbours_of_unexplored_cells)
+            else:
+                is_explored = self.move_to_best_path_of_nearest_unexplored_cell(neighbours_of_unexplored_cells)
 
             if not is_explored:
                 return
@@ -506,6 +781,9 @@ class Exploration:
         if len(unexplored_cells_to_check) <= 0:
             return False
 
+        if self.decision_budget is not None:
+            return self.move_to_best_path_within_decision_budget(unexplored_cells_to_check)
+
         robot_point = self.robot.point
         robot_facing_direction = self.robot.direction
         nearest_node_to_robot = min(unexplored_cells_to_check.keys(),
@@ -518,10 +796,203 @@ class Exploration:
             return False
 
         direction_to_face_nearest_node = unexplored_cells_to_check[nearest_node_to_robot]
+
+        if not self.can_return_in_time_after_moving(list_of_movements, direction_to_face_nearest_node):
+            return False
+
         self.move_robot_to_destination_cell(list_of_movements, direction_to_face_nearest_node)
 
         return True
 
+    def move_to_best_path_within_decision_budget(self, unexplored_cells_to_check: Dict[tuple, 'Direction']) -> bool:
+        """
+        Plans the paths to the neighbours of the unexplored cells from the nearest to the furthest by manhattan
+        distance, until the decision budget runs out, and moves along the path with the fewest movements found. \n
+        The first neighbour planned is the one that the decision step without a budget moves to, so a step that runs
+        out of budget right away behaves the same, and every further neighbour planned refines the choice. A neighbour
+        is skipped without planning if the manhattan distance and the turns to it are already as many movements as the
+        best path, and the search stops once the manhattan distance alone is. \n
+        If the budget runs out before a path is found, e.g. because the nearest neighbours cannot be reached, only the
+        neighbours that the robot can reach are planned, and at most a few of them.
+
+        :param unexplored_cells_to_check: A dictionary of all possible neighbouring coordinates and robot facing
+                                          direction
+        :return: True if the robot is able to explore an unexplored cell. Else False
+        """
+        budget = self.start_decision()
+        robot_point = self.robot.point
+        robot_facing_direction = self.robot.direction
+        best_movements = None
+        best_destination_point = None
+        travel_distances = None
+        no_of_candidates_after_deadline = 0
+
+        for destination_point in sorted(unexplored_cells_to_check.keys(),
+                                        key=lambda point: AStarAlgorithm.get_h_cost(Node(robot_point), Node(point))):
+            if budget.has_run_out:
+                if best_movements is not None or \
+                        no_of_candidates_after_deadline >= _MAX_NO_OF_CANDIDATES_AFTER_DEADLINE:
+                    break
+
+                if travel_distances is None:
+                    with self.profiler.planning():
+                        travel_distances = get_travel_distances(robot_point, self.get_virtual_obstacle_map())
+
+                if travel_distances[destination_point[0]][destination_point[1]] is None:
+                    continue
+
+                no_of_candidates_after_deadline += 1
+
+            if best_movements is not None and \
+                    len(best_movements) <= AStarAlgorithm.get_h_cost(Node(robot_point), Node(destination_point)):
+                break
+
+            if best_movements is not None and \
+                    len(best_movements) <= get_min_no_of_movements(robot_point, robot_facing_direction,
+                                                                   destination_point):
+                continue
+
+            list_of_movements = self.find_fastest_path_to_node(robot_point, destination_point, robot_facing_direction)
+
+            if list_of_movements is None or \
+                    (best_movements is not None and len(list_of_movements) >= len(best_movements)) or \
+                    not self.can_return_in_time_after_moving(list_of_movements,
+                                                             unexplored_cells_to_check[destination_point]):
+                continue
+
+            best_movements = list_of_movements
+            best_destination_point = destination_point
+
+        if best_movements is None:
+            return False
+
+        self.move_robot_to_destination_cell(best_movements, unexplored_cells_to_check[best_destination_point])
+
+        return True
+
+    def move_to_next_best_view(self, unexplored_cells_to_check: Dict[tuple, 'Direction']) -> bool:
+        """
+        Moves to the neighbour of the unexplored cells where the sensors reveal the most unexplored cells per move.
+
+        :param unexplored_cells_to_check: A dictionary of all possible neighbouring coordinates and robot facing
+                                          direction
+        :return: True if the robot is able to move to reveal unexplored cells. Else False
+        """
+        if len(unexplored_cells_to_check) <= 0:
+            return False
+
+        budget = self.start_decision()
+
+        with span_recorder.span('view_planning'), self.profiler.planning():
+            candidate_poses = list(unexplored_cells_to_check.items())
+            travel_distances = get_travel_distances(self.robot.point, self.get_virtual_obstacle_map())
+
+            if budget.deadline is None:
+                no_of_revealed_cells = count_cells_revealed_at_poses(candidate_poses,
+                                                                     self.explored_map,
+                                                                     self.obstacle_map,
+                                                                     self.robot.sensor_rays)
+            else:
+                candidate_poses, no_of_revealed_cells = self.count_cells_revealed_within_budget(candidate_poses,
+                                                                                                travel_distances,
+                                                                                                budget)
+
+            ranked_poses = rank_poses_by_information_gain(candidate_poses, no_of_revealed_cells, travel_distances)
+
+        for destination_point, direction_to_face in ranked_poses:
+            list_of_movements = self.find_fastest_path_to_node(self.robot.point,
+                                                               destination_point,
+                                                               self.robot.direction)
+
+            if list_of_movements is None or \
+                    not self.can_return_in_time_after_moving(list_of_movements, direction_to_face):
+                continue
+
+            self.move_robot_to_destination_cell(list_of_movements, direction_to_face)
+            return True
+
+        return False
+
+    def count_cells_revealed_within_budget(self,
+                                           candidate_poses: List[tuple],
+                                           travel_distances: List[List[Union[int, None]]],
+                                           budget: 'DecisionBudget') -> Tuple[List[tuple], List[int]]:
+        """
+        Counts the unexplored cells revealed at the reachable poses from the nearest to the furthest, until the decision
+        budget runs out. The nearest pose is always counted
+
+        :param candidate_poses: The positions and directions of the robot to evaluate
+        :param travel_distances: The number of moves to every cell
+        :param budget: The time budget of the decision step
+        :return: The poses that were counted and the number of unexplored cells revealed at every one of them
+        """
+        reachable_poses = sorted((pose for pose in candidate_poses
+                                  if travel_distances[pose[0][0]][pose[0][1]] is not None),
+                                 key=lambda pose: travel_distances[pose[0][0]][pose[0][1]])
+        counted_poses = []
+        no_of_revealed_cells = []
+
+        for pose in reachable_poses:
+            if len(counted_poses) > 0 and budget.has_run_out:
+                break
+
+            counted_poses.append(pose)
+            no_of_revealed_cells += count_cells_revealed_at_poses([pose],
+                                                                  self.explored_map,
+                                                                  self.obstacle_map,
+                                                                  self.robot.sensor_rays)
+
+        return counted_poses, no_of_revealed_cells
+
+    def can_return_in_time_after_moving(self,
+                                        list_of_movements: List[Movement],
+                                        direction_to_face: 'Direction' = None) -> bool:
+        """
+        Determines if the robot can still return to the start area within the time limit after the movements
+
+        :param list_of_movements: The list of movements to make
+        :param direction_to_face: The direction to turn to after the movements. No turn if None
+        :return: True if there is no time limit or the robot can return in time. Else False
+        """
+        if self.time_limit is None:
+            return True
+
+        point = self.robot.point
+        direction = self.robot.direction
+        no_of_moves = len(list_of_movements)
+
+        for movement in list_of_movements:
+            if movement == Movement.FORWARD:
+                direction_offset = Direction.get_direction_offset(direction)
+                point = [point[0] + direction_offset[0], point[1] + direction_offset[1]]
+
+            elif movement == Movement.RIGHT:
+                direction = Direction.get_clockwise_direction(direction)
+
+            elif movement == Movement.LEFT:
+                direction = Direction.get_anti_clockwise_direction(direction)
+
+        if direction_to_face is not None:
+            no_of_right_rotations = Direction.get_no_of_right_rotations_to_destination_cell(direction,
+                                                                                            direction_to_face)
+            no_of_moves += 1 if no_of_right_rotations == 6 else no_of_right_rotations // 2
+            direction = direction_to_face
+
+        no_of_moves += self.get_no_of_moves_to_start_point(point, direction)
+
+        return self.time_elapsed + no_of_moves / self.robot.speed <= self.time_limit
+
+    def get_virtual_obstacle_map(self) -> List[List[int]]:
+        """
+        Copies the obstacle map with virtual walls around the obstacles, the arena and the unexplored cells
+
+        :return: The obstacle map that the robot can plan on
+        """
+        obstacle_map_copy = deepcopy(self.obstacle_map)
+        Map.set_virtual_walls_on_map(obstacle_map_copy, self.explored_map)
+
+        return obstacle_map_copy
+
     def find_fastest_path_to_node(self, robot_point, destination_point, robot_facing_direction):
         """
         Determines the fastest path from the robot's position to the neighbour of the unexplored cell
@@ -531,31 +1002,38 @@ class Exploration:
         :param robot_facing_direction: The robot's current facing
         :return: List of movements to the neighbour of the unexplored cell
         """
-        obstacle_map_copy = deepcopy(self.obstacle_map)
-        Map.set_virtual_walls_on_map(obstacle_map_copy, self.explored_map)
-
-        self.fastest_path_solver.arena = obstacle_map_copy
+        with span_recorder.span('planning'), self.profiler.planning():
+            self.fastest_path_solver.arena = self.get_virtual_obstacle_map()
 
-        path = self.fastest_path_solver.run_algorithm_for_exploration(robot_point,
-                                                                      destination_point,
-                                                                      robot_facing_direction)
-        if path is None or len(path) <= 0:
-            return
+            path = self.fastest_path_solver.run_algorithm_for_exploration(robot_point,
+                                                                          destination_point,
+                                                                          robot_facing_direction)
+            if path is None or len(path) <= 0:
+                return
 
-        return self.fastest_path_solver.convert_fastest_path_to_movements(path, robot_facing_direction)
+            return self.fastest_path_solver.convert_fastest_path_to_movements(path, robot_facing_direction)
 
     def move_robot_to_destination_cell(self,
                                        list_of_movements: List[Movement],
-                                       direction_to_face_nearest_node: Direction) -> None:
+                                       direction_to_face_nearest_node: Direction) -> bool:
         """
-        Directs the robot to the target cell
+        Directs the robot to the target cell. \n
+        The robot stops following the movements if an obstacle is sensed on the way, so that the next decision step
+        plans around it.
 
         :param list_of_movements: The list of movements to the neighbour of the unexplored cell
         :param direction_to_face_nearest_node: The facing direction required to reach the unexplored cell
+        :return: True if the robot reached the target cell. Else False
         """
+        self.profiler.record_plan()
+
         for movement in list_of_movements:
             if not self.is_running:
-                return
+                return False
+
+            if movement == Movement.FORWARD and not self.front_of_robot_is_free():
+                self.profiler.record_replan()
+                return False
 
             self.move(movement)
 
@@ -572,19 +1050,31 @@ class Exploration:
         elif no_of_right_rotations == 6:
             self.move(Movement.LEFT)
 
+        return True
+
     def go_home(self) -> None:
-        robot_point = self.robot.point
-        robot_facing_direction = self.robot.direction
+        """
+        Moves the robot back to the start area along the cost to home field, so that the robot takes as long as the
+        time limit expected. The way home is planned again if an obstacle is sensed on the way
+        """
+        while self.is_running:
+            robot_point = self.robot.point
+            robot_facing_direction = self.robot.direction
 
-        list_of_movements = self.find_fastest_path_to_node(robot_point,
-                                                           constants.ROBOT_START_POINT,
-                                                           robot_facing_direction)
+            self.update_cost_to_home_field(is_exact=True)
+            list_of_movements = self.cost_to_home_field.get_movements(robot_point, robot_facing_direction)
 
-        if list_of_movements is None or len(list_of_movements) <= 0:
-            print_error_log('No path home! :(')
-            return
+            if list_of_movements is None:
+                list_of_movements = self.find_fastest_path_to_node(robot_point,
+                                                                   constants.ROBOT_START_POINT,
+                                                                   robot_facing_direction)
 
-        self.move_robot_to_destination_cell(list_of_movements, Direction.EAST)
+            if list_of_movements is None or len(list_of_movements) <= 0:
+                print_error_log('No path home! :(')
+                return
+
+            if self.move_robot_to_destination_cell(list_of_movements, Direction.EAST):
+                return
 
 
 if __name__ == '__main__':
@@ -0,0 +1,206 @@
+"""
+Contain the profiler of the phases of the exploration (right hug, unexplored cells, go home...)
+"""
+import json
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Union
+
+from utils.enums import Movement
+from utils.logger import print_general_log
+
+_TURN_MOVEMENTS = (Movement.RIGHT, Movement.LEFT)
+
+
+class PhaseProfile:
+    """
+    The time, movements, planning and coverage of a phase of the exploration
+    """
+
+    def __init__(self, name: str, start_coverage: float):
+        """
+        :param name: The name of the phase
+        :param start_coverage: The coverage of the arena when the phase started
+        """
+        self.name = name
+        self.start_coverage = start_coverage
+        self.duration = 0
+        self.no_of_steps = 0
+        self.no_of_turns = 0
+        self.planning_duration = 0
+        self.no_of_plans = 0
+        self.no_of_replans = 0
+        self.coverage_gained = 0
+        self.no_of_photos = 0
+
+    def to_dict(self) -> Dict[str, Union[str, int, float]]:
+        return {
+            'phase': self.name,
+            'duration_in_seconds': self.duration,
+            'no_of_steps': self.no_of_steps,
+            'no_of_turns': self.no_of_turns,
+            'planning_time_in_ms': self.planning_duration * 1000,
+            'no_of_plans': self.no_of_plans,
+            'no_of_replans': self.no_of_replans,
+            'coverage_gained': self.coverage_gained,
+            'no_of_photos': self.no_of_photos
+        }
+
+
+class _Phase:
+    """
+    Profiles the phase of the exploration while the with block runs
+    """
+    __slots__ = ('_profiler', '_name')
+
+    def __init__(self, profiler: 'ExplorationProfiler', name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> '_Phase':
+        self._profiler.begin_phase(self._name)
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._profiler.end_phase()
+
+
+class _Planning:
+    """
+    Adds the time of the with block to the planning time of the current phase. Nested blocks are timed once.
+    """
+    __slots__ = ('_profiler', '_start_time')
+
+    def __init__(self, profiler: 'ExplorationProfiler'):
+        self._profiler = profiler
+        self._start_time = 0
+
+    def __enter__(self) -> '_Planning':
+        self._profiler.planning_depth += 1
+        self._start_time = perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._profiler.planning_depth -= 1
+
+        if self._profiler.planning_depth == 0 and self._profiler.current_phase is not None:
+            self._profiler.current_phase.planning_duration += perf_counter() - self._start_time
+
+
+class ExplorationProfiler:
+    """
+    Records the steps, turns, planning time, plans, replans, coverage gained and photos of every phase of the
+    exploration, so that the phases that take most of the time limit can be found. \n
+    Phases are profiled with the with statement, e.g. with profiler.phase('right_hug'): ... \n
+    A plan is the path that a decision step settles on, however many candidate paths it searched to find it. A replan
+    is a plan abandoned after the robot started moving along it, e.g. because an obstacle was sensed on the path.
+    """
+
+    def __init__(self, get_coverage: Callable[[], float]):
+        """
+        :param get_coverage: The function that gets the coverage of the arena in normalized form
+        """
+        self.get_coverage = get_coverage
+        self.phases: List[PhaseProfile] = []
+        self.current_phase: Optional[PhaseProfile] = None
+        self.planning_depth = 0
+        self._phase_start_time = 0
+
+    def phase(self, name: str) -> '_Phase':
+        """
+        Profiles the with block as a phase of the exploration
+
+        :param name: The name of the phase
+        :return: The context manager that profiles the phase
+        """
+        return _Phase(self, name)
+
+    def planning(self) -> '_Planning':
+        """
+        Times the with block as planning of the current phase
+
+        :return: The context manager that times the planning
+        """
+        return _Planning(self)
+
+    def begin_phase(self, name: str) -> None:
+        self.end_phase()
+
+        self.current_phase = PhaseProfile(name, self.get_coverage())
+        self._phase_start_time = perf_counter()
+
+    def end_phase(self) -> None:
+        if self.current_phase is None:
+            return
+
+        self.current_phase.duration = perf_counter() - self._phase_start_time
+        self.current_phase.coverage_gained = self.get_coverage() - self.current_phase.start_coverage
+        self.phases.append(self.current_phase)
+        self.current_phase = None
+
+    def record_movement(self, movement: 'Movement') -> None:
+        """
+        Counts the movement of the robot as a turn or a step
+
+        :param movement: The movement made by the robot
+        """
+        if self.current_phase is None:
+            return
+
+        if movement in _TURN_MOVEMENTS:
+            self.current_phase.no_of_turns += 1
+        else:
+            self.current_phase.no_of_steps += 1
+
+    def record_plan(self) -> None:
+        """
+        Counts the path that a decision step settled on
+        """
+        if self.current_phase is not None:
+            self.current_phase.no_of_plans += 1
+
+    def record_replan(self) -> None:
+        """
+        Counts the path abandoned after the robot started moving along it
+        """
+        if self.current_phase is not None:
+            self.current_phase.no_of_replans += 1
+
+    def record_photo(self) -> None:
+        if self.current_phase is not None:
+            self.current_phase.no_of_photos += 1
+
+    def get_report(self) -> Dict[str, Union[List[Dict], Dict]]:
+        """
+        Summarises the profiles of the phases
+
+        :return: The profile of every phase in order and the total of all the phases
+        """
+        phases = [phase.to_dict() for phase in self.phases]
+        total = {key: sum(phase[key] for phase in phases) for key in PhaseProfile('', 0).to_dict() if key != 'phase'}
+
+        return {'phases': phases, 'total': total}
+
+    def print_report(self) -> None:
+        """
+        Prints the profile of every phase, with the share of the time of the exploration that the phase took
+        """
+        report = self.get_report()
+        total_duration = report['total']['duration_in_seconds']
+
+        for phase in report['phases']:
+            share_of_time = phase['duration_in_seconds'] / total_duration if total_duration > 0 else 0
+
+            print_general_log(f'{phase["phase"]}: {phase["duration_in_seconds"]:.2f} s ({share_of_time * 100:.0f}%), '
+                              f'{phase["no_of_steps"]} steps, {phase["no_of_turns"]} turns, '
+                              f'planning {phase["planning_time_in_ms"]:.0f} ms ({phase["no_of_plans"]} plans, '
+                              f'{phase["no_of_replans"]} replans), '
+                              f'coverage +{phase["coverage_gained"] * 100:.1f}%, {phase["no_of_photos"]} photos')
+
+    def export(self, file_path: str) -> None:
+        """
+        Exports the report of the phases as JSON
+
+        :param file_path: The path of the file to export to
+        """
+        with open(file_path, 'w') as file_handler:
+            json.dump(self.get_report(), file_handler, indent=2)
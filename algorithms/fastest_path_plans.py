@@ -0,0 +1,108 @@
+"""
+Contain functions to plan the fastest path through every possible way point before the way point is known
+"""
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import Dict, List, Optional, Tuple
+
+from algorithms.fastest_path_solver import AStarAlgorithm, CoordinateList, Node
+from utils.enums import Direction
+from utils.logger import print_general_log
+
+_NO_OF_CHUNKS_PER_WORKER = 4
+
+
+class FastestPathPlan:
+    """
+    The fastest path through a way point, with the movements already in the Arduino format
+    """
+
+    def __init__(self, path_points: List[Tuple[List[int], 'Direction']], arduino_format_movements: str):
+        """
+        :param path_points: The point and the facing direction of every node of the path
+        :param arduino_format_movements: The movements of the path in the Arduino format
+        """
+        self.path_points = path_points
+        self.arduino_format_movements = arduino_format_movements
+
+    def get_path(self) -> List['Node']:
+        """
+        Gets a new list of nodes of the path, e.g. to display the path in the GUI
+
+        :return: The nodes of the path
+        """
+        return [Node(list(point), direction_facing) for point, direction_facing in self.path_points]
+
+
+def plan_fastest_path(arena: List[List[int]],
+                      start_point: CoordinateList,
+                      way_point: CoordinateList,
+                      goal_point: CoordinateList,
+                      direction_facing: 'Direction') -> Optional['FastestPathPlan']:
+    """
+    Finds the fastest path through the way point and converts it to the Arduino format
+
+    :param arena: The arena with virtual walls
+    :param start_point: The starting point of the robot
+    :param way_point: The way point
+    :param goal_point: The goal point
+    :param direction_facing: Current facing direction of the robot
+    :return: The plan of the fastest path. None if there is no path
+    """
+    solver = AStarAlgorithm(arena)
+    path = solver.run_algorithm(start_point, way_point, goal_point, direction_facing)
+
+    if not path:
+        return None
+
+    return FastestPathPlan([(node.point, node.direction_facing) for node in path],
+                           solver.convert_fastest_path_to_arduino_format(path, direction_facing))
+
+
+def _plan_fastest_paths(arena: List[List[int]],
+                        start_point: CoordinateList,
+                        way_points: List[Tuple[int, int]],
+                        goal_point: CoordinateList,
+                        direction_facing: 'Direction') -> List[Tuple[Tuple[int, int], Optional['FastestPathPlan']]]:
+    return [(way_point, plan_fastest_path(arena, start_point, list(way_point), goal_point, direction_facing))
+            for way_point in way_points]
+
+
+def precompute_fastest_path_plans(arena: List[List[int]],
+                                  start_point: CoordinateList,
+                                  goal_point: CoordinateList,
+                                  direction_facing: 'Direction',
+                                  max_workers: int = None) -> Dict[Tuple[int, int], 'FastestPathPlan']:
+    """
+    Plans the fastest path through every cell that can be a way point, in parallel processes
+
+    :param arena: The arena with virtual walls
+    :param start_point: The starting point of the robot
+    :param goal_point: The goal point
+    :param direction_facing: The facing direction of the robot at the start point
+    :param max_workers: The number of processes. The number of CPUs if None. Plans in this process if 1
+    :return: The plans keyed by the way point. Way points without a path are left out
+    """
+    solver = AStarAlgorithm(arena)
+    way_points = [(row, column) for row in range(len(arena)) for column in range(len(arena[row]))
+                  if not solver.is_not_within_range_with_virtual_wall([row, column])]
+
+    max_workers = max_workers if max_workers is not None else cpu_count() or 1
+
+    if max_workers <= 1:
+        planned_way_points = _plan_fastest_paths(arena, start_point, way_points, goal_point, direction_facing)
+
+    else:
+        # Several way points per task, so that the arena is not sent to the processes once per way point
+        chunk_size = max(1, len(way_points) // (max_workers * _NO_OF_CHUNKS_PER_WORKER))
+        chunks = [way_points[i:i + chunk_size] for i in range(0, len(way_points), chunk_size)]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_plan_fastest_paths, arena, start_point, chunk, goal_point, direction_facing)
+                       for chunk in chunks]
+            planned_way_points = [planned_way_point for future in futures for planned_way_point in future.result()]
+
+    fastest_path_plans = {way_point: plan for way_point, plan in planned_way_points if plan is not None}
+    print_general_log(f'Planned the fastest path through {len(fastest_path_plans)} way points')
+
+    return fastest_path_plans
@@ -1,18 +1,38 @@
 import heapq
-from typing import List, Optional
+from typing import Hashable, List, Optional
 
+from algorithms.bidirectional_search import find_fastest_path_bidirectionally
+from algorithms.jump_point_search import JumpTable, PathStep, find_fastest_path_with_jump_points
+from algorithms.path_cache import PathCache
+from algorithms.search_kernel import INFINITE_COST, get_blocked_cells, search_cells
 from utils import constants
-from utils.enums import Cell, Direction, Movement
+from utils.enums import Cell, Direction, Movement, SearchMode
 from utils.logger import print_general_log, print_error_log
 
-INFINITE_COST = 999999
 CoordinateList = List[int]  # x, y
 
+# The direction to reach every neighbouring position, in the order of constants.NEIGHBOURING_POSITIONS
+_NEIGHBOUR_DIRECTIONS = [Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST]
+
+# The Arduino commands to turn, indexed by the number of right rotations (in multiples of 45 degrees)
+_TURN_COMMANDS = {0: [],
+                  2: [f'{Movement.to_string(Movement.RIGHT)}1|'],
+                  4: [f'{Movement.to_string(Movement.RIGHT)}1|'] * 2,
+                  6: [f'{Movement.to_string(Movement.LEFT)}1|']}
+_FORWARD_COMMAND = Movement.to_string(Movement.FORWARD)
+
+# Indexed by the number of right rotations (in multiples of 90 degrees) from the current to the next direction
+_TURN_COSTS = [constants.NO_TURN_COST,
+               constants.TURN_COST_PERPENDICULAR,
+               constants.TURN_COST_OPPOSITE_DIRECTION,
+               constants.TURN_COST_PERPENDICULAR]
+
 
 class Node:
     """
     A class to keep track of the fastest path from start to end goal
     """
+    __slots__ = ('parent_node', 'point', 'direction_facing', 'g', 'h', 'f')
 
     def __init__(self,
                  point: CoordinateList,
@@ -51,22 +71,32 @@ class Node:
 
 
 class AStarAlgorithm:
-    def __init__(self, arena: List[int]) -> None:
+    def __init__(self,
+                 arena: List[int],
+                 path_cache: 'PathCache' = None,
+                 search_mode: 'SearchMode' = SearchMode.A_STAR,
+                 use_search_kernel: bool = True) -> None:
         """
         Initialises the A* algorithm class to find the fastest
         path from the start point to the way point and from the
         way point to the goal point
 
         :param arena: The arena generated from the MDF String or a sample arena loaded from disk
+        :param path_cache: The cache of the paths found, shared between the solvers. Paths are not cached if None
+        :param search_mode: The search used to find the fastest path. Jump Point Search is faster on large open arenas,
+        and the bidirectional search on long queries across large arenas
+        :param use_search_kernel: True to run the A* search in the search kernel over flat arrays. The search in this
+        class finds the same paths, and is kept as the reference of the kernel
         """
-        self.open_list = []
-        self.closed_list = []
         self.path = []
-        self.way_point_node = None
-        self.start_node = None
-        self.goal_node = None
         self.arena = arena
-        self.facing_direction = None
+        self.path_cache = path_cache
+        self.search_mode = search_mode
+        self.use_search_kernel = use_search_kernel
+
+        # The jump table of the last arena searched with Jump Point Search, and the content of that arena
+        self._jump_table = None
+        self._jump_table_map_key = None
 
     def run_algorithm(self,
                       start_point: CoordinateList,
@@ -88,56 +118,31 @@ class AStarAlgorithm:
             print_error_log('Start, Way Point or Goal coordinates are out of range')
             return
 
-        self._initialise_nodes(direction_facing, goal_point, start_point, way_point)
+        cache_key = self._get_cache_key(start_point, way_point, goal_point, direction_facing)
+        cached_path = self._get_cached_path(cache_key)
 
-        heapq.heappush(self.open_list, self.start_node)
+        if cached_path is not None:
+            return cached_path
 
-        path_found = self._find_fastest_path(goal_node=self.way_point_node)
+        start_node = Node(start_point, direction_facing, g=0)
+        path_to_way_point = self._find_fastest_path(start_node, way_point)
 
-        if not path_found:
+        if path_to_way_point is None:
             print_error_log(f'No fastest path found from start to waypoint.')
             return
 
-        self.start_node = self.way_point_node
-        self.open_list.clear()
-        heapq.heappush(self.open_list, self.closed_list.pop())
-        self.closed_list.clear()
-
-        goal_found = self._find_fastest_path(goal_node=self.goal_node)
+        # The search to the goal continues from the way point with the direction and cost of the robot there
+        path_to_goal = self._find_fastest_path(path_to_way_point[-1], goal_point)
 
-        if not goal_found:
+        if path_to_goal is None:
             print_error_log(f'No fastest path found from waypoint to end.')
             return
 
-        self._rebuild_fastest_path_route()
-
-        # reset to base config and other misc
-        self.open_list.clear()
-        self.closed_list.clear()
+        self.path = path_to_way_point + path_to_goal[1:]
+        self._cache_path(cache_key, self.path[1:])
 
         return self.path[1:]
 
-    def _initialise_nodes(self, direction_facing, goal_point, start_point, way_point=None) -> None:
-        """
-        Prepares the nodes and direction required to find the fastest path to the goal
-
-        :param direction_facing: Current facing direction of the robot
-        :param goal_point: The goal point
-        :param start_point: The starting point of the robot
-        :param way_point: The way point provided by the Android device if it is provided. Else None
-        """
-        self.start_node = Node(start_point, direction_facing)
-        self.way_point_node = Node(way_point) if way_point is not None else None
-        self.goal_node = Node(goal_point)
-        self.start_node.g = 0
-        self.start_node.h = self.get_h_cost(self.start_node,
-                                            self.way_point_node if way_point is not None else self.goal_node)
-        self.start_node.f = self.start_node.g + self.start_node.h
-        self.facing_direction = direction_facing
-
-        if len(self.path) > 0:  # clears the previous fastest path record if the algorithm was ran previously
-            self.path.clear()
-
     def run_algorithm_for_exploration(self, start_point, goal_point, direction_facing) -> Optional[list]:
         """
         Finds the fastest path to the destination point. The method finds the fastest path to the goal point without
@@ -148,123 +153,217 @@ class AStarAlgorithm:
         :param direction_facing: Current facing direction of the robot
         :return:
         """
-        self._initialise_nodes(direction_facing, goal_point, start_point)
+        cache_key = self._get_cache_key(start_point, None, goal_point, direction_facing)
+        cached_path = self._get_cached_path(cache_key)
 
-        heapq.heappush(self.open_list, self.start_node)
+        if cached_path is not None:
+            return cached_path
 
-        path_found = self._find_fastest_path(goal_node=self.goal_node)
+        path = self._find_fastest_path(Node(start_point, direction_facing, g=0), goal_point)
 
-        if not path_found:
+        if path is None:
             print_error_log(f'No fastest path found from start to goal.')
             return
 
-        self._rebuild_fastest_path_route()
-        self.open_list.clear()
-        self.closed_list.clear()
+        self.path = path
 
         # Discard the first node in the list as it is the node of the robot's position
+        self._cache_path(cache_key, self.path[1:])
+
         return self.path[1:]
 
-    def _find_fastest_path(self, goal_node: Node) -> bool:
+    def _get_cache_key(self,
+                       start_point: CoordinateList,
+                       way_point: Optional[CoordinateList],
+                       goal_point: CoordinateList,
+                       direction_facing: Direction) -> Optional[Hashable]:
         """
-         Searches for the best path from a start point to the end point
+        Gets the key of the search in the path cache
 
-        :param goal_node: Expects a way point Node object or the goal node object
-        :return: True if the fastest path is found. Else, False
+        :return: The key of the map content, the search mode, the start pose, the goal and the way point. None if there
+        is no cache
         """
-        while len(self.open_list) > 0:
-            visiting_node = heapq.heappop(self.open_list)
-            self.closed_list.append(visiting_node)
+        if self.path_cache is None:
+            return None
 
-            if visiting_node == goal_node:
-                print_general_log('Fastest path found!')
-                return True
+        return (PathCache.get_map_key(self.arena),
+                self.search_mode,
+                tuple(start_point),
+                direction_facing,
+                tuple(goal_point),
+                tuple(way_point) if way_point is not None else None)
 
-            self._add_neighbouring_nodes_to_open_list(visiting_node, goal_node)
+    def _get_cached_path(self, cache_key: Optional[Hashable]) -> Optional[List[Node]]:
+        if cache_key is None:
+            return None
 
-        print_error_log("Fastest path not found! D':")
-        return False
+        return self.path_cache.get(cache_key)
 
-    def _add_neighbouring_nodes_to_open_list(self, visiting_node: Node, goal_node: Node) -> None:
+    def _cache_path(self, cache_key: Optional[Hashable], path: List[Node]) -> None:
+        if cache_key is None:
+            return
+
+        self.path_cache.put(cache_key, path)
+
+    def _find_fastest_path(self, start_node: Node, goal_point: CoordinateList) -> Optional[List[Node]]:
         """
-        Populate the neighbouring nodes of the current node in
-        the open list, A.K.A Priority Queue
+        Searches for the best path from a start point to the end point. \n
+        The cells are numbered row by row, and the cost, direction and parent of the cells are kept in lists indexed
+        by the cell number, so that only the cells of the path are turned into nodes.
 
-        :param visiting_node: The cheapest cost node popped from the priority queue
-        :param goal_node: Expects a way point Node object or the goal node object
+        :param start_node: The node of the robot at the start point, with its direction and cost
+        :param goal_point: Expects a way point or the goal point
+        :return: The nodes from the start node to the goal. None if there is no path
         """
+        if self.search_mode == SearchMode.JUMP_POINT_SEARCH:
+            return self._find_fastest_path_with_jump_points(start_node, goal_point)
 
-        possible_neighbouring_positions = constants.NEIGHBOURING_POSITIONS
+        if self.search_mode == SearchMode.BIDIRECTIONAL:
+            return self._get_path_of_steps(start_node, find_fastest_path_bidirectionally(
+                self.arena, start_node.point, start_node.direction_facing // 2, start_node.g, goal_point))
 
-        for position in possible_neighbouring_positions:
-            neighbour_point = [visiting_node.point[0] + position[0],
-                               visiting_node.point[1] + position[1]]
+        if self.use_search_kernel:
+            return self._find_fastest_path_with_search_kernel(start_node, goal_point)
 
-            neighbour_node = Node(neighbour_point, parent_node=visiting_node)
+        arena = self.arena
+        height = len(arena)
+        width = len(arena[0])
+        goal_row, goal_column = goal_point
+        goal_cell = goal_row * width + goal_column
+        start_cell = start_node.point[0] * width + start_node.point[1]
 
-            if self._is_not_a_valid_path(neighbour_node):
-                continue
+        g_costs = [INFINITE_COST] * (height * width)
+        parent_cells = [-1] * (height * width)
+        direction_indexes = [0] * (height * width)  # The direction divided by 2
+        is_closed = bytearray(height * width)
 
-            self._update_neighbour_node_costs(visiting_node, neighbour_node, goal_node)
+        g_costs[start_cell] = start_node.g
+        direction_indexes[start_cell] = start_node.direction_facing // 2
 
-    def _update_neighbour_node_costs(self, visiting_node: Node, neighbour_node: Node, goal_node: Node) -> None:
-        """
-        Updates the neighbour node's g, h and f cost and add to the priority queue.
-        Replaces the node if found in the priority queue and the cost is lower
+        neighbours = [(row_offset, column_offset, direction // 2)
+                      for (row_offset, column_offset), direction in zip(constants.NEIGHBOURING_POSITIONS,
+                                                                        _NEIGHBOUR_DIRECTIONS)]
 
-        :param visiting_node: The cheapest cost node popped from the priority queue
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :param goal_node: Expects a way point Node object or the goal node object
-        """
-        neighbour_node.g = self._get_g_cost_and_set_neighbour_facing_direction(visiting_node, neighbour_node)
-        neighbour_node.h = self.get_h_cost(neighbour_node, goal_node)
-        neighbour_node.f = neighbour_node.g + neighbour_node.h
+        # (f cost, h cost, order of insertion, cell). Ties go to the cell closest to the goal, then first in, first out
+        start_h_cost = abs(start_node.point[0] - goal_row) + abs(start_node.point[1] - goal_column)
+        open_list = [(start_node.g + start_h_cost, start_h_cost, 0, start_cell)]
+        no_of_insertions = 1
+
+        while len(open_list) > 0:
+            _, _, _, cell = heapq.heappop(open_list)
+
+            if is_closed[cell]:
+                continue  # An outdated entry of a cell that was reached later at a lower cost
+
+            is_closed[cell] = True
+
+            if cell == goal_cell:
+                print_general_log('Fastest path found!')
+                return self._rebuild_fastest_path_route(start_node, cell, width, g_costs, parent_cells,
+                                                        direction_indexes)
+
+            row, column = divmod(cell, width)
+            g_cost = g_costs[cell]
+            direction_index = direction_indexes[cell]
+
+            for row_offset, column_offset, neighbour_direction_index in neighbours:
+                neighbour_row = row + row_offset
+                neighbour_column = column + column_offset
+
+                if not (0 < neighbour_row < height - 1 and 0 < neighbour_column < width - 1) or \
+                        arena[neighbour_row][neighbour_column] != Cell.FREE_AREA:
+                    continue
 
-        if neighbour_node not in self.open_list:
-            heapq.heappush(self.open_list, neighbour_node)
+                neighbour_cell = cell + row_offset * width + column_offset
 
-        else:
-            # Update lowest cost of the node if in open list
-            node_index = self.open_list.index(neighbour_node)
-            neighbour_node_from_open_list = self.open_list[node_index]
+                if is_closed[neighbour_cell]:
+                    continue
+
+                neighbour_g_cost = g_cost + constants.MOVE_COST + \
+                    _TURN_COSTS[(neighbour_direction_index - direction_index) % 4]
+
+                if neighbour_g_cost >= g_costs[neighbour_cell]:
+                    continue
+
+                g_costs[neighbour_cell] = neighbour_g_cost
+                parent_cells[neighbour_cell] = cell
+                direction_indexes[neighbour_cell] = neighbour_direction_index
 
-            if neighbour_node_from_open_list.f < neighbour_node.f:
-                return
+                h_cost = abs(neighbour_row - goal_row) + abs(neighbour_column - goal_column)
+                heapq.heappush(open_list, (neighbour_g_cost + h_cost, h_cost, no_of_insertions, neighbour_cell))
+                no_of_insertions += 1
 
-            self._update_node_values(neighbour_node, node_index)
+        print_error_log("Fastest path not found! D':")
+        return None
 
-    def _update_node_values(self, neighbour_node: Node, node_index: int) -> None:
+    def _find_fastest_path_with_search_kernel(self,
+                                              start_node: Node,
+                                              goal_point: CoordinateList) -> Optional[List[Node]]:
         """
-        Replaces the node values in the priority queue
+        Searches for the best path in the search kernel, which expands the cells in the same order as the search in
+        _find_fastest_path
 
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :param node_index: The index of the neighbouring node in the priority queue
+        :param start_node: The node of the robot at the start point, with its direction and cost
+        :param goal_point: Expects a way point or the goal point
+        :return: The nodes from the start node to the goal. None if there is no path
         """
-        self.open_list[node_index].g = neighbour_node.g
-        self.open_list[node_index].h = neighbour_node.h
-        self.open_list[node_index].f = neighbour_node.f
-        self.open_list[node_index].parent_node = neighbour_node.parent_node
-        self.open_list[node_index].direction_facing = neighbour_node.direction_facing
+        width = len(self.arena[0])
+        goal_cell = goal_point[0] * width + goal_point[1]
+
+        search_result = search_cells(get_blocked_cells(self.arena), width,
+                                     start_node.point[0] * width + start_node.point[1],
+                                     start_node.direction_facing // 2, start_node.g, goal_cell)
+
+        if search_result is None:
+            print_error_log("Fastest path not found! D':")
+            return None
 
-    def _is_not_a_valid_path(self, neighbour_node: Node) -> bool:
+        print_general_log('Fastest path found!')
+        return self._rebuild_fastest_path_route(start_node, goal_cell, width, *search_result)
+
+    def _find_fastest_path_with_jump_points(self,
+                                            start_node: Node,
+                                            goal_point: CoordinateList) -> Optional[List[Node]]:
         """
-        Determines if the neighbouring node is a valid path.
+        Searches for the best path with Jump Point Search over the (cell, direction) states of the robot
 
-        Criteria:
-        1) The node must not be visited
-        2) The node must be within the arena range
-        3) The node must not be an obstacle or virtual wall
+        :param start_node: The node of the robot at the start point, with its direction and cost
+        :param goal_point: Expects a way point or the goal point
+        :return: The nodes from the start node to the goal. None if there is no path
+        """
+        # The jump table is only built again when the content of the arena changes
+        map_key = tuple(map(tuple, self.arena))
 
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :return: True if the criteria is fulfilled. Else, false
+        if map_key != self._jump_table_map_key:
+            self._jump_table = JumpTable(self.arena)
+            self._jump_table_map_key = map_key
+
+        return self._get_path_of_steps(start_node, find_fastest_path_with_jump_points(
+            self._jump_table, start_node.point, start_node.direction_facing // 2, start_node.g, goal_point))
+
+    @staticmethod
+    def _get_path_of_steps(start_node: Node, path_steps: Optional[List[PathStep]]) -> Optional[List[Node]]:
         """
+        Turns the cells of a path found over the (cell, direction) states of the robot into nodes
+
+        :param start_node: The node of the robot at the start point
+        :param path_steps: Every cell of the path after the start point, with its direction and cost
+        :return: The nodes from the start node to the goal. None if there is no path
+        """
+        if path_steps is None:
+            print_error_log("Fastest path not found! D':")
+            return None
+
+        print_general_log('Fastest path found!')
+        path = [start_node]
 
-        if neighbour_node in self.closed_list or \
-                self.is_not_within_range_with_virtual_wall(neighbour_node.point) or \
-                self.node_is_obstacle_or_virtual_wall(neighbour_node.point):
-            return True
+        for row, column, direction_index, g_cost in path_steps:
+            node = Node([row, column], Direction(direction_index * 2), path[-1], g_cost)
+            node.h = 0
+            node.f = node.g
+            path.append(node)
 
-        return False
+        return path
 
     def is_not_within_range_with_virtual_wall(self, point: CoordinateList) -> bool:
         """
@@ -274,8 +373,8 @@ class AStarAlgorithm:
         :return: True if the coordinate is within the range of the arena
         """
 
-        return not (0 < point[0] < constants.ARENA_HEIGHT - 1 and
-                    0 < point[1] < constants.ARENA_WIDTH - 1) or \
+        return not (0 < point[0] < len(self.arena) - 1 and
+                    0 < point[1] < len(self.arena[0]) - 1) or \
                self.node_is_obstacle_or_virtual_wall(point)
 
     def node_is_obstacle_or_virtual_wall(self, point: CoordinateList) -> bool:
@@ -283,17 +382,34 @@ class AStarAlgorithm:
 
         return self.arena[row][column] != Cell.FREE_AREA
 
-    def _rebuild_fastest_path_route(self) -> None:
+    @staticmethod
+    def _rebuild_fastest_path_route(start_node: Node,
+                                    goal_cell: int,
+                                    width: int,
+                                    g_costs: List[int],
+                                    parent_cells: List[int],
+                                    direction_indexes: List[int]) -> List[Node]:
         """
-        Reconstructs the fastest path from the goal node to the start node
+        Reconstructs the fastest path from the goal cell to the start node
+
+        :return: The nodes from the start node to the goal
         """
-        # Get the goal node from the closed list
-        node = self.closed_list.pop()
+        cells = []
+        cell = goal_cell
+
+        while parent_cells[cell] != -1:
+            cells.append(cell)
+            cell = parent_cells[cell]
 
-        while node is not None:
-            self.path.insert(0, node)
+        path = [start_node]
 
-            node = node.parent_node
+        for cell in reversed(cells):
+            node = Node(list(divmod(cell, width)), Direction(direction_indexes[cell] * 2), path[-1], g_costs[cell])
+            node.h = 0
+            node.f = node.g
+            path.append(node)
+
+        return path
 
     def _given_points_are_out_of_range(self,
                                        start_point: CoordinateList,
@@ -312,64 +428,6 @@ class AStarAlgorithm:
                self.is_not_within_range_with_virtual_wall(way_point) or \
                self.is_not_within_range_with_virtual_wall(goal_point)
 
-    def _get_g_cost_and_set_neighbour_facing_direction(self, current_node: Node, neighbour_node: Node) -> int:
-        """
-        The cost to move from the current node to the neighbouring node
-
-        :param current_node: The cheapest cost node popped from the priority queue
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :return: g cost
-        """
-        neighbour_node.direction_facing = self._get_neighbour_direction(current_node, neighbour_node)
-        turn_cost = self._get_direction_cost_from_bearing(current_node, neighbour_node)
-
-        return constants.MOVE_COST + turn_cost + current_node.g
-
-    def _get_neighbour_direction(self, current_node: Node, neighbour_node: Node) -> int:
-        """
-        Determines the direction required to reach the neighbouring node
-
-        :param current_node: The cheapest cost node popped from the priority queue
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :return: The constant value of direction required to reach the neighbouring node
-        """
-        if neighbour_node.point[0] - current_node.point[0] > 0:
-            return Direction.SOUTH
-
-        if neighbour_node.point[1] - current_node.point[1] > 0:
-            return Direction.EAST
-
-        if neighbour_node.point[0] - current_node.point[0] < 0:
-            return Direction.NORTH
-
-        else:
-            return Direction.WEST
-
-    def _get_direction_cost_from_bearing(self, current_node: Node, neighbour_node: Node) -> int:
-        """
-        Determines the turn cost required to reach the neighbouring node.
-        The larger the turn, the higher the cost.
-
-        :param current_node: The cheapest cost node popped from the priority queue
-        :param neighbour_node: The neighbouring node of the cheapest cost node
-        :return: Turn cost to reach the neighbouring node
-        """
-        if current_node.direction_facing == neighbour_node.direction_facing:
-            return constants.NO_TURN_COST
-
-        turn_costs = [constants.TURN_COST_PERPENDICULAR, constants.TURN_COST_OPPOSITE_DIRECTION]
-
-        previous_bearing = Direction.get_anti_clockwise_direction(current_node.direction_facing)
-        next_bearing = Direction.get_clockwise_direction(current_node.direction_facing)
-
-        for i in range(len(turn_costs)):
-            if previous_bearing == neighbour_node.direction_facing or \
-                    next_bearing == neighbour_node.direction_facing:
-                return turn_costs[i]
-
-            previous_bearing = Direction.get_anti_clockwise_direction(previous_bearing)
-            next_bearing = Direction.get_clockwise_direction(next_bearing)
-
     @staticmethod
     def get_h_cost(neighbour_node: Node, goal_node: Node) -> int:
         """
@@ -425,6 +483,39 @@ class AStarAlgorithm:
 
         return list_of_movements
 
+    def convert_fastest_path_to_arduino_format(self, fastest_path: List[Node], robot_direction: Direction) -> str:
+        """
+        Converts the fastest path to movements in the Arduino format in one pass, without a list of movements. \n
+        Consecutive forward movements are merged up to the maximum number of steps of a command. A turn to the left is
+        a single left turn instead of three right turns, and a U-turn is two right turns, one command each. \n
+        E.g. Forward x 3, Left, Forward x 2 = W3|A1|W2|
+
+        :param fastest_path: the fastest path solved from the algorithm
+        :param robot_direction: The current direction of the robot
+        :return: String representation of the movements of the path in Arduino format
+        """
+        commands = []
+        robot_facing_direction = robot_direction
+        no_of_forward_steps = 0
+
+        for node in fastest_path:
+            turn_commands = _TURN_COMMANDS[Direction.get_no_of_right_rotations_to_destination_cell(
+                robot_facing_direction, node.direction_facing)]
+
+            if no_of_forward_steps > 0 and \
+                    (turn_commands or no_of_forward_steps >= constants.ARDUINO_MAX_NO_OF_STEPS_PER_COMMAND):
+                commands.append(f'{_FORWARD_COMMAND}{no_of_forward_steps}|')
+                no_of_forward_steps = 0
+
+            commands.extend(turn_commands)
+            no_of_forward_steps += 1
+            robot_facing_direction = node.direction_facing
+
+        if no_of_forward_steps > 0:
+            commands.append(f'{_FORWARD_COMMAND}{no_of_forward_steps}|')
+
+        return ''.join(commands)
+
     def consolidate_movements_to_string(self, fastest_path_movements: List['Movement']) -> str:
         """
         Converts movement strings to Arduino format \n
@@ -436,7 +527,7 @@ class AStarAlgorithm:
         """
         movements = []
         consecutive_same_movements = 1
-        max_no_of_steps = 7
+        max_no_of_steps = constants.ARDUINO_MAX_NO_OF_STEPS_PER_COMMAND
 
         movement_string = Movement.to_string(fastest_path_movements[0]) + f'{consecutive_same_movements}|'
         movements.append(movement_string)
@@ -485,24 +576,28 @@ class AStarAlgorithm:
         return ''.join(new_movement_string_list)
 
     @staticmethod
-    def check_and_separate_long_instructions(movements) -> List[str]:
+    def check_and_separate_long_instructions(movements: str) -> List[str]:
         """
-        Split the movement instructions if it is more than 64
+        Split the movement instructions into messages of at most ARDUINO_MAX_MESSAGE_LENGTH characters. A message only
+        ends after a '|', so that a command is never split between two messages
         :param movements: movement strings
-        :return:
+        :return: The messages, in order
         """
-        if len(movements) <= 64:
+        if len(movements) <= constants.ARDUINO_MAX_MESSAGE_LENGTH:
             return [movements]
 
         movement_instructions_list = []
+        message_start = 0
 
-        movement_instructions = movements
+        while message_start < len(movements):
+            # The end of the last command that fits. A command longer than a message is split as a last resort
+            message_end = movements.rfind('|', message_start, message_start + constants.ARDUINO_MAX_MESSAGE_LENGTH) + 1
 
-        while len(movement_instructions) > 0:
-            temp = movement_instructions[:63]
-            movement_instructions_list.append(temp)
+            if message_end <= message_start:
+                message_end = message_start + constants.ARDUINO_MAX_MESSAGE_LENGTH
 
-            movement_instructions = movement_instructions[63:]
+            movement_instructions_list.append(movements[message_start:message_end])
+            message_start = message_end
 
         return movement_instructions_list
 
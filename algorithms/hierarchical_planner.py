@@ -0,0 +1,378 @@
+"""
+Contain HierarchicalPlanner Class
+"""
+import heapq
+from collections import deque
+from math import ceil
+from typing import Dict, List, Optional, Set, Tuple
+
+from algorithms.fastest_path_solver import AStarAlgorithm, CoordinateList
+from map import Map
+from utils.enums import Cell, Direction
+from utils.logger import print_general_log
+
+DEFAULT_CLUSTER_SIZE = 10
+
+# An entrance of at least this many cells has a transition at each end, instead of one in the middle
+_MIN_LENGTH_OF_ENTRANCE_WITH_TWO_TRANSITIONS = 6
+
+Point = Tuple[int, int]  # row, column
+Cluster = Tuple[int, int]  # row, column of the cluster
+Border = Tuple[str, int, int]  # 'E' or 'S', and the cluster on the west or north side of the border
+
+
+class HierarchicalPlanner:
+    """
+    Plans the fastest path on large arenas over an abstract graph of the arena (HPA*). \n
+    The virtual arena is split into square clusters. Where two neighbouring clusters have free cells on both sides of
+    their border, the entrance gets one or two transitions, which are the nodes of the abstract graph. The nodes of a
+    cluster are joined by the number of moves between them inside the cluster. \n
+    When the obstacle map changes, only the clusters with a changed cell are built again. The abstract path is only
+    turned into cells for the next segment the robot drives, up to where it leaves its cluster.
+    """
+
+    def __init__(self,
+                 obstacle_map: List[List[int]],
+                 explored_map: List[List[int]] = None,
+                 cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        """
+        :param obstacle_map: The obstacle map, read again on every update of the planner
+        :param explored_map: The explored map. Unexplored cells are virtual walls. Every cell is explored if None
+        :param cluster_size: The number of cells on each side of a cluster
+        """
+        self.obstacle_map = obstacle_map
+        self.explored_map = explored_map
+        self.cluster_size = cluster_size
+
+        self.height = len(obstacle_map)
+        self.width = len(obstacle_map[0])
+        self.no_of_cluster_rows = ceil(self.height / cluster_size)
+        self.no_of_cluster_columns = ceil(self.width / cluster_size)
+
+        self.virtual_map = None
+        self.fastest_path_solver = AStarAlgorithm(None)
+
+        self._transitions: Dict[Border, List[Tuple[Point, Point]]] = {}
+        self._inter_edges: Dict[Point, Set[Point]] = {}
+        self._intra_edges: Dict[Cluster, Dict[Point, Dict[Point, int]]] = {}
+
+        self.goal_point = None
+        self.abstract_path = None  # The points of the abstract path still to be driven
+
+        self.update_map()
+
+    def update_map(self) -> Set[Cluster]:
+        """
+        Inflates the obstacle map with virtual walls and builds again the clusters with a changed cell. \n
+        The abstract path is planned again on the next segment if it goes through a changed cluster.
+
+        :return: The clusters built again
+        """
+        virtual_map = [row[:] for row in self.obstacle_map]
+        Map.set_virtual_walls_on_map(virtual_map, self.explored_map)
+
+        if self.virtual_map is None:
+            changed_clusters = {(cluster_row, cluster_column)
+                                for cluster_row in range(self.no_of_cluster_rows)
+                                for cluster_column in range(self.no_of_cluster_columns)}
+        else:
+            changed_clusters = set()
+
+            for row, (old_row_cells, row_cells) in enumerate(zip(self.virtual_map, virtual_map)):
+                if old_row_cells == row_cells:
+                    continue
+
+                for column, (old_cell, cell) in enumerate(zip(old_row_cells, row_cells)):
+                    if old_cell != cell:
+                        changed_clusters.add(self._get_cluster((row, column)))
+
+        self.virtual_map = virtual_map
+        self.fastest_path_solver.set_map(virtual_map)
+
+        if len(changed_clusters) == 0:
+            return changed_clusters
+
+        self._build_clusters(changed_clusters)
+
+        if self.abstract_path is not None and \
+                any(self._get_cluster(point) in changed_clusters for point in self.abstract_path):
+            self.abstract_path = None
+
+        return changed_clusters
+
+    def plan(self, start_point: CoordinateList, goal_point: CoordinateList) -> bool:
+        """
+        Plans the abstract path to the goal. The path is driven segment by segment with get_next_segment
+
+        :param start_point: The starting point of the robot
+        :param goal_point: The goal point
+        :return: True if there is a path to the goal
+        """
+        self.goal_point = tuple(goal_point)
+        abstract_path = self.find_abstract_path(start_point, goal_point)
+        self.abstract_path = abstract_path[1:] if abstract_path is not None else None
+
+        return abstract_path is not None
+
+    def get_next_segment(self, start_point: CoordinateList, direction_facing: Direction) -> Optional[list]:
+        """
+        Finds the fastest path of the next segment of the abstract path, up to the first point of the abstract path
+        outside of the cluster of the robot. The abstract path is planned again if the map changed along it
+
+        :param start_point: The current point of the robot
+        :param direction_facing: Current facing direction of the robot
+        :return: The nodes of the segment, without the node of the robot. An empty list at the goal. None if there is
+        no path to the goal
+        """
+        if self.goal_point is None:
+            return None
+
+        if tuple(start_point) == self.goal_point:
+            return []
+
+        for _ in range(2):
+            if self.abstract_path is None and not self.plan(start_point, list(self.goal_point)):
+                return None
+
+            cluster = self._get_cluster(tuple(start_point))
+            end_index = next((i for i, point in enumerate(self.abstract_path) if self._get_cluster(point) != cluster),
+                             len(self.abstract_path) - 1)
+
+            segment = self.fastest_path_solver.run_algorithm_for_exploration(
+                list(start_point), list(self.abstract_path[end_index]), direction_facing)
+
+            if segment is not None:
+                self.abstract_path = self.abstract_path[end_index + 1:]
+                return segment
+
+            # The abstract path is out of date, so plan it again once
+            self.abstract_path = None
+
+        return None
+
+    def find_abstract_path(self, start_point: CoordinateList, goal_point: CoordinateList) -> Optional[List[Point]]:
+        """
+        Searches the abstract graph for the path with the fewest moves, after joining the start and the goal to the
+        nodes of their clusters
+
+        :param start_point: The starting point of the robot
+        :param goal_point: The goal point
+        :return: The points of the abstract path, from the start point to the goal. None if there is no path
+        """
+        start_point = tuple(start_point)
+        goal_point = tuple(goal_point)
+
+        if not self._is_free(*start_point) or not self._is_free(*goal_point):
+            return None
+
+        goal_cluster = self._get_cluster(goal_point)
+
+        start_distances = self._get_distances_in_cluster(start_point)
+        start_edges = {point: start_distances[point] for point in self._get_points_of_cluster(
+            self._get_cluster(start_point)) | {goal_point} if point in start_distances and point != start_point}
+
+        # The moves inside a cluster can be reversed, so the distances from the goal are the distances to the goal
+        goal_distances = self._get_distances_in_cluster(goal_point)
+        goal_edges = {point: goal_distances[point] for point in self._get_points_of_cluster(goal_cluster)
+                      if point in goal_distances}
+
+        g_costs = {start_point: 0}
+        parent_points = {start_point: None}
+        closed_points = set()
+
+        # (f cost, h cost, order of insertion, point)
+        open_list = [(self._get_h_cost(start_point, goal_point), 0, 0, start_point)]
+        no_of_insertions = 1
+
+        while len(open_list) > 0:
+            _, _, _, point = heapq.heappop(open_list)
+
+            if point in closed_points:
+                continue
+
+            closed_points.add(point)
+
+            if point == goal_point:
+                abstract_path = []
+
+                while point is not None:
+                    abstract_path.append(point)
+                    point = parent_points[point]
+
+                return abstract_path[::-1]
+
+            if point == start_point:
+                edges = list(start_edges.items())
+            else:
+                edges = list(self._intra_edges[self._get_cluster(point)].get(point, {}).items())
+
+                if point in goal_edges:
+                    edges.append((goal_point, goal_edges[point]))
+
+            edges.extend((neighbour_point, 1) for neighbour_point in self._inter_edges.get(point, ()))
+
+            for neighbour_point, cost in edges:
+                g_cost = g_costs[point] + cost
+
+                if neighbour_point in closed_points or g_cost >= g_costs.get(neighbour_point, g_cost + 1):
+                    continue
+
+                g_costs[neighbour_point] = g_cost
+                parent_points[neighbour_point] = point
+
+                h_cost = self._get_h_cost(neighbour_point, goal_point)
+                heapq.heappush(open_list, (g_cost + h_cost, h_cost, no_of_insertions, neighbour_point))
+                no_of_insertions += 1
+
+        return None
+
+    def _build_clusters(self, clusters: Set[Cluster]) -> None:
+        """
+        Finds the transitions on every border of the clusters, then joins the nodes of the clusters and of their
+        neighbours, whose nodes on the shared borders may have changed
+        """
+        borders = set()
+
+        for cluster_row, cluster_column in clusters:
+            borders.update([('E', cluster_row, cluster_column),
+                            ('E', cluster_row, cluster_column - 1),
+                            ('S', cluster_row, cluster_column),
+                            ('S', cluster_row - 1, cluster_column)])
+
+        clusters_to_join = set(clusters)
+
+        for border in borders:
+            kind, cluster_row, cluster_column = border
+
+            if cluster_row < 0 or cluster_column < 0 or \
+                    (kind == 'E' and cluster_column + 1 >= self.no_of_cluster_columns) or \
+                    (kind == 'S' and cluster_row + 1 >= self.no_of_cluster_rows):
+                continue
+
+            self._find_transitions(border)
+            clusters_to_join.add((cluster_row, cluster_column + 1) if kind == 'E' else
+                                 (cluster_row + 1, cluster_column))
+
+        for cluster in clusters_to_join:
+            self._join_nodes_of_cluster(cluster)
+
+        print_general_log(f'Built {len(clusters)} clusters of the abstract graph')
+
+    def _find_transitions(self, border: Border) -> None:
+        """
+        Finds the entrances of the border, which are the runs of cells free on both sides of the border, and replaces
+        the transitions of the border with a transition for each short entrance and two for each long entrance
+        """
+        for point, other_point in self._transitions.get(border, []):
+            self._inter_edges[point].discard(other_point)
+            self._inter_edges[other_point].discard(point)
+
+        kind, cluster_row, cluster_column = border
+
+        if kind == 'E':
+            column = (cluster_column + 1) * self.cluster_size - 1
+            pairs = [((row, column), (row, column + 1)) for row in range(
+                cluster_row * self.cluster_size, min((cluster_row + 1) * self.cluster_size, self.height))]
+        else:
+            row = (cluster_row + 1) * self.cluster_size - 1
+            pairs = [((row, column), (row + 1, column)) for column in range(
+                cluster_column * self.cluster_size, min((cluster_column + 1) * self.cluster_size, self.width))]
+
+        entrances = []
+        entrance = []
+
+        for point, other_point in pairs:
+            if self._is_free(*point) and self._is_free(*other_point):
+                entrance.append((point, other_point))
+                continue
+
+            if len(entrance) > 0:
+                entrances.append(entrance)
+                entrance = []
+
+        if len(entrance) > 0:
+            entrances.append(entrance)
+
+        transitions = []
+
+        for entrance in entrances:
+            if len(entrance) < _MIN_LENGTH_OF_ENTRANCE_WITH_TWO_TRANSITIONS:
+                transitions.append(entrance[len(entrance) // 2])
+            else:
+                transitions.extend([entrance[0], entrance[-1]])
+
+        for point, other_point in transitions:
+            self._inter_edges.setdefault(point, set()).add(other_point)
+            self._inter_edges.setdefault(other_point, set()).add(point)
+
+        self._transitions[border] = transitions
+
+    def _join_nodes_of_cluster(self, cluster: Cluster) -> None:
+        """
+        Finds the number of moves between every pair of nodes of the cluster, without leaving the cluster
+        """
+        points = self._get_points_of_cluster(cluster)
+        edges = {}
+
+        for point in points:
+            distances = self._get_distances_in_cluster(point)
+            edges[point] = {other_point: distances[other_point] for other_point in points
+                            if other_point != point and other_point in distances}
+
+        self._intra_edges[cluster] = edges
+
+    def _get_points_of_cluster(self, cluster: Cluster) -> Set[Point]:
+        cluster_row, cluster_column = cluster
+        points = set()
+
+        for border in [('E', cluster_row, cluster_column),
+                       ('E', cluster_row, cluster_column - 1),
+                       ('S', cluster_row, cluster_column),
+                       ('S', cluster_row - 1, cluster_column)]:
+            for transition in self._transitions.get(border, []):
+                points.update(point for point in transition if self._get_cluster(point) == cluster)
+
+        return points
+
+    def _get_distances_in_cluster(self, start_point: Point) -> Dict[Point, int]:
+        """
+        Breadth first search from the point over the free cells of its cluster
+
+        :param start_point: The point to search from
+        :return: The number of moves to every free cell of the cluster that can be reached
+        """
+        cluster_row, cluster_column = self._get_cluster(start_point)
+        min_row = cluster_row * self.cluster_size
+        min_column = cluster_column * self.cluster_size
+        max_row = min(min_row + self.cluster_size, self.height)
+        max_column = min(min_column + self.cluster_size, self.width)
+
+        distances = {start_point: 0}
+        queue = deque([start_point])
+
+        while len(queue) > 0:
+            row, column = point = queue.popleft()
+
+            for neighbour_point in [(row - 1, column), (row + 1, column), (row, column + 1), (row, column - 1)]:
+                neighbour_row, neighbour_column = neighbour_point
+
+                if not (min_row <= neighbour_row < max_row and min_column <= neighbour_column < max_column) or \
+                        neighbour_point in distances or not self._is_free(neighbour_row, neighbour_column):
+                    continue
+
+                distances[neighbour_point] = distances[point] + 1
+                queue.append(neighbour_point)
+
+        return distances
+
+    def _get_cluster(self, point: Point) -> Cluster:
+        return point[0] // self.cluster_size, point[1] // self.cluster_size
+
+    def _is_free(self, row: int, column: int) -> bool:
+        # The same cells as the fastest path search, which never enters the border of the arena
+        return 0 < row < self.height - 1 and 0 < column < self.width - 1 and \
+            self.virtual_map[row][column] == Cell.FREE_AREA
+
+    @staticmethod
+    def _get_h_cost(point: Point, goal_point: Point) -> int:
+        return abs(point[0] - goal_point[0]) + abs(point[1] - goal_point[1])
@@ -1,10 +1,38 @@
+from collections import deque
 from typing import Callable, List, Union, Tuple, Dict
 
 from algorithms.exploration import Exploration, get_current_time_in_seconds
 from map import is_within_arena_range
 from utils import constants
 from utils.enums import Cell, Direction, Movement
-from utils.logger import print_general_log
+from utils.logger import print_error_log, print_general_log
+from utils.timing import span_recorder
+
+
+class PhotoRequest:
+    """
+    A request to take a photo of obstacle faces from the robot's pose at the time of the request
+    """
+
+    def __init__(self,
+                 robot_point: List[int],
+                 robot_direction: 'Direction',
+                 obstacles: List[Tuple[int, int]],
+                 face_direction: 'Direction'):
+        """
+        :param robot_point: The position of the robot when the photo is requested
+        :param robot_direction: The direction of the robot when the photo is requested
+        :param obstacles: The obstacles to take photo
+        :param face_direction: The face of the obstacles that is photographed
+        """
+        self.robot_point = robot_point
+        self.robot_direction = robot_direction
+        self.obstacles = obstacles
+        self.face_direction = face_direction
+
+    def __repr__(self) -> str:
+        return f'PhotoRequest(robot_point={self.robot_point}, robot_direction={self.robot_direction.name}, ' \
+               f'obstacles={self.obstacles}, face_direction={self.face_direction.name})'
 
 
 class ImageRecognitionExploration(Exploration):
@@ -20,29 +48,54 @@ class ImageRecognitionExploration(Exploration):
                  on_calibrate: Callable = None,
                  on_take_photo: Callable = None,
                  coverage_limit: float = 1,
-                 time_limit: float = 6):
+                 time_limit: float = 6,
+                 use_occupancy_grid: bool = False,
+                 use_view_planning: bool = False,
+                 decision_budget: float = None):
+        """
+        Initialises the image recognition exploration algorithm to explore the arena and take photos of obstacles.
+
+        :param on_take_photo: The callback function to take a photo. Receives the robot's point, the obstacles and
+                              the robot's direction. Returning False marks the photo as failed. Runs before the
+                              next movement of the robot
+        :param use_occupancy_grid: True to fuse the sensor readings in an occupancy grid
+        :param use_view_planning: True to explore the unexplored cells by information gain per move
+        :param decision_budget: The time in seconds that every decision step may take to pick the cell to explore next
+        """
         super().__init__(robot, explored_map, obstacle_map, on_update_map, on_calibrate, coverage_limit,
-                         time_limit)
+                         time_limit, use_occupancy_grid, use_view_planning, decision_budget)
 
         self.obstacle_direction_to_take_photo = {}
-        self.on_take_photo = on_take_photo if on_take_photo is not None else lambda rp, o: None
+        self.on_take_photo = on_take_photo if on_take_photo is not None else lambda rp, o, rd: None
+        self._failed_photo_requests = deque()  # Restored after the robot moves on, so they are not retaken at once
+        self.is_turning_to_take_photo = False  # The turns to take photos return to the same pose, so they are no loop
 
     def start_exploration(self) -> None:
         """
         Starts exploration
         """
         self.start_time = get_current_time_in_seconds()
-        self.sense_and_repaint_canvas()
-        self.right_hug()
 
-        self.hug_middle_obstacles_and_take_photo()
+        with self.profiler.phase('right_hug'):
+            self.sense_and_repaint_canvas()
+            self.right_hug()
+
+        with self.profiler.phase('middle_obstacles'):
+            self.hug_middle_obstacles_and_take_photo()
+
         print_general_log('Done hugging. Checking for unexplored cells now...')
 
-        self.explore_unexplored_cells()
-        self.explore_remaining_obstacle_faces_and_take_photo()
+        with self.profiler.phase('unexplored_cells'):
+            self.explore_unexplored_cells()
+
+        with self.profiler.phase('remaining_faces'):
+            self.restore_faces_of_failed_photos()
+            self.explore_remaining_obstacle_faces_and_take_photo()
+            self.restore_faces_of_failed_photos()
 
         print_general_log('Done with image exploration')
         print_general_log(f'Obstacles hash table: {self.obstacle_direction_to_take_photo}')
+        self.profiler.print_report()
 
     def mark_cell_as_explored(self,
                               current_sensor_point: List[int],
@@ -69,22 +122,46 @@ class ImageRecognitionExploration(Exploration):
             if not is_within_arena_range(cell_point_to_mark[0], cell_point_to_mark[1]):
                 continue
 
-            self.explored_map[cell_point_to_mark[0]][cell_point_to_mark[1]] = Cell.EXPLORED.value
+            self.set_cell_as_explored(cell_point_to_mark[0], cell_point_to_mark[1])
             self.on_update_map(cell_point_to_mark)
 
             if obstacle_distance_from_the_sensor is None or j != obstacle_distance_from_the_sensor:
                 continue
 
-            self.obstacle_map[cell_point_to_mark[0]][cell_point_to_mark[1]] = Cell.OBSTACLE.value
+            self.set_obstacle_cell(cell_point_to_mark[0], cell_point_to_mark[1], Cell.OBSTACLE.value)
 
             self.on_update_map(cell_point_to_mark)
+            self.add_obstacle_faces_to_take_photo(cell_point_to_mark)
+
+    def on_obstacle_cell_changed(self, cell_point: Tuple[int, int], is_obstacle: bool) -> None:
+        """
+        **OVERRIDES the parent exploration's method**
+
+        Adds the faces of the new obstacle to take photo, or forgets the faces of the phantom obstacle
+
+        :param cell_point: The cell point
+        :param is_obstacle: True if the cell is now an obstacle. Else False
+        """
+        if is_obstacle:
+            self.add_obstacle_faces_to_take_photo(cell_point)
+            return
+
+        self.obstacle_direction_to_take_photo.pop(cell_point, None)
+
+    def add_obstacle_faces_to_take_photo(self, obstacle_cell_point: Tuple[int, int]) -> None:
+        """
+        Adds the faces of the obstacle that are not grouped with other obstacles to the faces to take photo
+
+        :param obstacle_cell_point: The coordinate of the obstacle in the arena
+        """
+        if obstacle_cell_point in self.obstacle_direction_to_take_photo:
+            return
 
-            if cell_point_to_mark not in self.obstacle_direction_to_take_photo:
-                self.obstacle_direction_to_take_photo[cell_point_to_mark] = {Direction.NORTH,
-                                                                             Direction.EAST,
-                                                                             Direction.SOUTH,
-                                                                             Direction.WEST}
-                self.remove_grouped_obstacle_sides(cell_point_to_mark)
+        self.obstacle_direction_to_take_photo[obstacle_cell_point] = {Direction.NORTH,
+                                                                      Direction.EAST,
+                                                                      Direction.SOUTH,
+                                                                      Direction.WEST}
+        self.remove_grouped_obstacle_sides(obstacle_cell_point)
 
     def remove_grouped_obstacle_sides(self, obstacle_cell_point: Tuple[int, int]) -> None:
         """
@@ -271,8 +348,12 @@ class ImageRecognitionExploration(Exploration):
 
         :param initial_robot_position: The position of the robot to start hugging th obstacle cluster
         """
+        # Only the poses revisited while hugging this obstacle cluster are a loop of the hugging
+        self.is_revisited_pose = False
+
         while True:
-            if self.limit_has_exceeded:
+            # Back to the fastest path to the next obstacle cluster if the hugging goes around a loop
+            if self.limit_has_exceeded or self.is_stuck_in_a_loop():
                 return
 
             if self.right_of_robot_is_free():
@@ -305,7 +386,87 @@ class ImageRecognitionExploration(Exploration):
         if not self.is_running:
             return
 
-        self.take_photo_of_obstacle_face()
+        self.restore_faces_of_failed_photos()
+
+        # The turns to take photos call this method again, so only the outermost call resets the flag
+        was_turning_to_take_photo = self.is_turning_to_take_photo
+        self.is_turning_to_take_photo = True
+
+        with span_recorder.span('photo_request'):
+            self.take_photo_of_obstacle_face()
+
+        self.is_turning_to_take_photo = was_turning_to_take_photo
+
+    def record_pose(self) -> None:
+        """
+        **OVERRIDES the parent exploration's method**
+
+        Counts the visit of the robot's pose in the pose history, except for the turns to take photos. The robot turns
+        back to the pose that it took the photos from, which is not a loop.
+        """
+        if self.is_turning_to_take_photo:
+            return
+
+        super().record_pose()
+
+    def request_photo(self, obstacles: List[Tuple[int, int]], face_direction: 'Direction') -> None:
+        """
+        Requests a photo of the obstacle faces from the robot's current pose. \n
+        The photo is taken before the robot moves on. The upload and recognition of the photo happen outside the
+        exploration (on the RPI and in the image recognition service), so the robot moves on without waiting for them.
+
+        :param obstacles: The obstacles to take photo
+        :param face_direction: The face of the obstacles that is photographed
+        """
+        request = PhotoRequest(list(self.robot.point), self.robot.direction, obstacles, face_direction)
+        self.profiler.record_photo()
+
+        if self._take_photo(request):
+            self._on_photo_requested(request)
+        else:
+            self._on_photo_request_failed(request)
+
+    def _take_photo(self, request: 'PhotoRequest') -> bool:
+        """
+        Takes the photo with the on_take_photo callback
+
+        :param request: The photo request
+        :return: False if the callback reports that the photo request failed. Else True
+        """
+        with span_recorder.span('photo_capture'):
+            return self.on_take_photo(request.robot_point, request.obstacles, request.robot_direction) is not False
+
+    def _on_photo_requested(self, request: 'PhotoRequest') -> None:
+        """
+        Callback after the on_take_photo callback reported no failure.
+        The faces are already removed from the faces to take photo.
+
+        :param request: The photo request
+        """
+        print_general_log(f'Photo requested at position {request.robot_point} of obstacles {request.obstacles} '
+                          f'(Face: {request.face_direction.name})')
+
+    def _on_photo_request_failed(self, request: 'PhotoRequest') -> None:
+        """
+        Callback if the photo cannot be taken. The faces are restored in restore_faces_of_failed_photos after the
+        robot moves on, so that the faces are not photographed again from the same pose at once.
+
+        :param request: The photo request
+        """
+        print_error_log(f'Unable to take photo at position {request.robot_point} of obstacles {request.obstacles}')
+
+        self._failed_photo_requests.append(request)
+
+    def restore_faces_of_failed_photos(self) -> None:
+        """
+        Adds the faces of obstacles of the failed photos back to the faces to take photo so that they are revisited
+        """
+        while len(self._failed_photo_requests) > 0:
+            request = self._failed_photo_requests.popleft()
+
+            for point in request.obstacles:
+                if point in self.obstacle_direction_to_take_photo:
+                    self.obstacle_direction_to_take_photo[point].add(request.face_direction)
 
     def take_photo_of_obstacle_face(self):
         """
@@ -324,7 +485,7 @@ class ImageRecognitionExploration(Exploration):
             for point in obstacles:
                 opposite_direction = Direction.get_opposite_direction(right_direction_of_robot)
                 self.obstacle_direction_to_take_photo[point].remove(opposite_direction)
-            self.on_take_photo(self.robot.point, obstacles)
+            self.request_photo(obstacles, Direction.get_opposite_direction(right_direction_of_robot))
             print_general_log(f'Photo taken from the right side of the robot '
                               f'at position {robot_point} (Obstacle direction '
                               f'from the robot: {right_direction_of_robot.name})')
@@ -338,7 +499,7 @@ class ImageRecognitionExploration(Exploration):
                 opposite_direction = Direction.get_opposite_direction(robot_facing_direction)
                 self.obstacle_direction_to_take_photo[point].remove(opposite_direction)
             self.move(Movement.LEFT)
-            self.on_take_photo(self.robot.point, obstacles)
+            self.request_photo(obstacles, Direction.get_opposite_direction(robot_facing_direction))
             print_general_log(f'Photo taken from the front of the robot '
                               f'at position {robot_point} (Obstacle direction '
                               f'from the robot: {robot_facing_direction.name})')
@@ -356,7 +517,7 @@ class ImageRecognitionExploration(Exploration):
             if not has_front:
                 self.move(Movement.LEFT)
             self.move(Movement.LEFT)
-            self.on_take_photo(self.robot.point, obstacles)
+            self.request_photo(obstacles, Direction.get_opposite_direction(left_direction_of_robot))
             print_general_log(f'Photo taken from the left side of the robot '
                               f'at position {robot_point} (Obstacle direction '
                               f'from the robot: {left_direction_of_robot.name})')
@@ -379,7 +540,7 @@ class ImageRecognitionExploration(Exploration):
             else:
                 self.move(Movement.LEFT)
 
-            self.on_take_photo(self.robot.point, obstacles)
+            self.request_photo(obstacles, Direction.get_opposite_direction(back_direction_of_robot))
             print_general_log(f'Photo taken from the back of the robot '
                               f'at position {robot_point} (Obstacle direction from '
                               f'the robot: {back_direction_of_robot.name})')
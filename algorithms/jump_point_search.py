@@ -0,0 +1,233 @@
+"""
+Contain the Jump Point Search of the fastest path, for 4-connected movement with turn costs
+"""
+import heapq
+from typing import List, Optional, Tuple
+
+from utils import constants
+from utils.enums import Cell
+
+# The (row, column) offset of every direction, indexed by the direction divided by 2 (north, east, south, west)
+_DIRECTION_OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+# Indexed by the number of right rotations (in multiples of 90 degrees) from the current to the next direction
+_TURN_COSTS = [constants.NO_TURN_COST,
+               constants.TURN_COST_PERPENDICULAR,
+               constants.TURN_COST_OPPOSITE_DIRECTION,
+               constants.TURN_COST_PERPENDICULAR]
+
+PathStep = Tuple[int, int, int, int]  # row, column, direction divided by 2, g cost
+
+
+class JumpTable:
+    """
+    The free cells of an arena and, for every free cell and direction, the number of free cells in a straight line
+    from the cell in the direction. \n
+    The cells are numbered row by row. The cells on the border of the arena are never free, like in the A* search.
+    """
+
+    def __init__(self, arena: List[List[int]]):
+        """
+        :param arena: The arena with virtual walls
+        """
+        self.height = len(arena)
+        self.width = len(arena[0])
+
+        height, width = self.height, self.width
+        self.is_free = bytearray(height * width)
+
+        for row in range(1, height - 1):
+            for column in range(1, width - 1):
+                if arena[row][column] == Cell.FREE_AREA:
+                    self.is_free[row * width + column] = 1
+
+        # -1 for the cells that are not free
+        self.run_lengths = [[-1] * (height * width) for _ in _DIRECTION_OFFSETS]
+
+        for direction_index, (row_offset, column_offset) in enumerate(_DIRECTION_OFFSETS):
+            run_lengths = self.run_lengths[direction_index]
+            step = row_offset * width + column_offset
+
+            # Visit every cell after the cell next to it in the direction, so that its run length is known
+            rows = range(height) if row_offset <= 0 else range(height - 1, -1, -1)
+            columns = range(width) if column_offset <= 0 else range(width - 1, -1, -1)
+
+            for row in rows:
+                for column in columns:
+                    cell = row * width + column
+
+                    if self.is_free[cell]:
+                        next_cell = cell + step
+                        run_lengths[cell] = run_lengths[next_cell] + 1 if self.is_free[next_cell] else 0
+
+
+def _is_jump_point(table: 'JumpTable', cell: int, direction_index: int, goal_row: int, goal_column: int) -> bool:
+    """
+    Determines if the robot moving straight through the cell may have to turn at the cell. \n
+    A path that turns at the cell towards a side can turn one cell later instead at the same cost, if the cells
+    next to its sideways run are free. The robot only needs to turn at the cell if a sideways run from the cell next
+    to it is shorter, or if the goal is on the sideways run.
+
+    :param table: The jump table of the arena
+    :param cell: The cell the robot moves through
+    :param direction_index: The direction of the movement divided by 2
+    :param goal_row: The row of the goal
+    :param goal_column: The column of the goal
+    :return: True if the robot may have to turn at the cell
+    """
+    width = table.width
+    row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+    step = row_offset * width + column_offset
+    row, column = divmod(cell, width)
+
+    for side_direction_index in ((direction_index + 1) % 4, (direction_index + 3) % 4):
+        side_run_lengths = table.run_lengths[side_direction_index]
+        run_length = side_run_lengths[cell]
+
+        if run_length <= 0:
+            continue
+
+        for neighbour_cell in (cell + step, cell - step):
+            if not table.is_free[neighbour_cell] or side_run_lengths[neighbour_cell] < run_length:
+                return True
+
+        side_row_offset, side_column_offset = _DIRECTION_OFFSETS[side_direction_index]
+
+        if side_row_offset == 0:
+            distance_to_goal = (goal_column - column) * side_column_offset
+            goal_is_on_side_run = goal_row == row
+        else:
+            distance_to_goal = (goal_row - row) * side_row_offset
+            goal_is_on_side_run = goal_column == column
+
+        if goal_is_on_side_run and 0 < distance_to_goal <= run_length:
+            return True
+
+    return False
+
+
+def find_fastest_path_with_jump_points(table: 'JumpTable',
+                                       start_point: List[int],
+                                       start_direction_index: int,
+                                       start_g_cost: int,
+                                       goal_point: List[int]) -> Optional[List[PathStep]]:
+    """
+    Searches for the best path over the (cell, direction) states of the robot. \n
+    The robot only turns at the start and at jump points, and moves straight from a state to the next jump point in
+    one step of the search, so that the many paths of equal cost through an open area are not all expanded. The cost
+    of a path is the same as in the A* search: a move costs MOVE_COST, and a turn its turn cost.
+
+    :param table: The jump table of the arena
+    :param start_point: The start point of the robot
+    :param start_direction_index: The direction of the robot at the start point divided by 2
+    :param start_g_cost: The cost of the path before the start point
+    :param goal_point: Expects a way point or the goal point
+    :return: Every cell of the path after the start point, with its direction and cost. None if there is no path
+    """
+    width = table.width
+    is_free = table.is_free
+    goal_row, goal_column = goal_point
+    goal_cell = goal_row * width + goal_column
+    start_cell = start_point[0] * width + start_point[1]
+
+    # A state is the cell number times 4 plus the direction divided by 2
+    g_costs = {}
+    parent_states = {}
+    is_closed = bytearray(table.height * width * 4)
+
+    start_state = start_cell * 4 + start_direction_index
+    g_costs[start_state] = start_g_cost
+    parent_states[start_state] = -1
+
+    # (f cost, h cost, order of insertion, state). Ties go to the state closest to the goal, then first in, first out
+    start_h_cost = abs(start_point[0] - goal_row) + abs(start_point[1] - goal_column)
+    open_list = [(start_g_cost + start_h_cost, start_h_cost, 0, start_state)]
+    no_of_insertions = 1
+
+    while len(open_list) > 0:
+        _, h_cost, _, state = heapq.heappop(open_list)
+
+        if is_closed[state]:
+            continue  # An outdated entry of a state that was reached later at a lower cost
+
+        is_closed[state] = True
+        cell, direction_index = divmod(state, 4)
+
+        if cell == goal_cell:
+            return _rebuild_path(state, width, g_costs, parent_states)
+
+        g_cost = g_costs[state]
+        successors = []
+
+        # Turn on the spot, towards a free cell
+        for no_of_right_rotations in (1, 2, 3):
+            next_direction_index = (direction_index + no_of_right_rotations) % 4
+            row_offset, column_offset = _DIRECTION_OFFSETS[next_direction_index]
+
+            if is_free[cell + row_offset * width + column_offset]:
+                successors.append((cell * 4 + next_direction_index, g_cost + _TURN_COSTS[no_of_right_rotations],
+                                   h_cost))
+
+        # Move straight to the next jump point
+        row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+        step = row_offset * width + column_offset
+        next_cell = cell + step
+        no_of_moves = 1
+
+        while is_free[next_cell]:
+            if next_cell == goal_cell or _is_jump_point(table, next_cell, direction_index, goal_row, goal_column):
+                next_row, next_column = divmod(next_cell, width)
+                successors.append((next_cell * 4 + direction_index, g_cost + no_of_moves * constants.MOVE_COST,
+                                   abs(next_row - goal_row) + abs(next_column - goal_column)))
+                break
+
+            next_cell += step
+            no_of_moves += 1
+
+        for next_state, next_g_cost, next_h_cost in successors:
+            if is_closed[next_state] or next_g_cost >= g_costs.get(next_state, next_g_cost + 1):
+                continue
+
+            g_costs[next_state] = next_g_cost
+            parent_states[next_state] = state
+
+            heapq.heappush(open_list, (next_g_cost + next_h_cost, next_h_cost, no_of_insertions, next_state))
+            no_of_insertions += 1
+
+    return None
+
+
+def _rebuild_path(goal_state: int, width: int, g_costs: dict, parent_states: dict) -> List[PathStep]:
+    """
+    Reconstructs the path from the goal state to the start state, filling in the cells between the jump points
+
+    :return: Every cell of the path after the start point, with its direction and cost
+    """
+    states = []
+    state = goal_state
+
+    while state != -1:
+        states.append(state)
+        state = parent_states[state]
+
+    states.reverse()
+    path = []
+
+    for previous_state, state in zip(states, states[1:]):
+        previous_cell = previous_state // 4
+        cell, direction_index = divmod(state, 4)
+
+        if cell == previous_cell:
+            continue  # A turn on the spot
+
+        row_offset, column_offset = _DIRECTION_OFFSETS[direction_index]
+        row, column = divmod(previous_cell, width)
+        g_cost = g_costs[previous_state]
+
+        while row * width + column != cell:
+            row += row_offset
+            column += column_offset
+            g_cost += constants.MOVE_COST
+            path.append((row, column, direction_index, g_cost))
+
+    return path
@@ -0,0 +1,415 @@
+"""
+Contain the exploration of the arena by several simulated robots that share one map
+"""
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from algorithms.exploration import Exploration
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.view_planner import get_travel_distances
+from map import Map, is_within_arena_range
+from robot import SimulatorBot
+from utils import constants
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement
+from utils.logger import print_general_log
+
+# The offsets of the cells that the robot stands on, from the centre of the robot
+_FOOTPRINT_OFFSETS = [(row_offset, column_offset) for row_offset in (-1, 0, 1) for column_offset in (-1, 0, 1)]
+
+# The targets of the robots are at least this number of cells apart (Manhattan distance), so that they spread out
+_MIN_DISTANCE_BETWEEN_TARGETS = 4
+
+# The number of ticks that a robot waits for the robot blocking its path before it plans around it
+_MAX_NO_OF_BLOCKED_TICKS = 2
+
+_DEFAULT_MAX_NO_OF_TICKS = 2000
+
+
+def get_footprint(point: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    Gets the cells that the robot stands on
+
+    :param point: The centre of the robot
+    :return: The 3 x 3 cells around the centre
+    """
+    return [(point[0] + row_offset, point[1] + column_offset) for row_offset, column_offset in _FOOTPRINT_OFFSETS]
+
+
+def get_start_points(arena: List[List[int]], no_of_robots: int) -> List[List[int]]:
+    """
+    Finds the start points of the robots on the free cells of the arena, from the start area outwards, so that the
+    robots do not overlap
+
+    :param arena: The arena
+    :param no_of_robots: The number of robots
+    :return: The start point of every robot. Fewer points if the robots do not fit in the arena
+    """
+    start_point = tuple(ROBOT_START_POINT)
+    visited_points = {start_point}
+    points_to_visit = deque([start_point])
+    start_points = []
+
+    while len(points_to_visit) > 0 and len(start_points) < no_of_robots:
+        point = points_to_visit.popleft()
+
+        if all(max(abs(point[0] - row), abs(point[1] - column)) >= 3 for row, column in start_points):
+            start_points.append(point)
+
+        for row_offset, column_offset in constants.NEIGHBOURING_POSITIONS:
+            neighbour_point = (point[0] + row_offset, point[1] + column_offset)
+
+            if neighbour_point in visited_points or \
+                    not all(is_within_arena_range(row, column) and arena[row][column] != Cell.OBSTACLE
+                            for row, column in get_footprint(neighbour_point)):
+                continue
+
+            visited_points.add(neighbour_point)
+            points_to_visit.append(neighbour_point)
+
+    return [list(point) for point in start_points]
+
+
+def _get_turn_movements(direction: 'Direction', direction_to_face: 'Direction') -> List[Movement]:
+    """
+    Gets the turns from the direction to the direction to face
+
+    :param direction: The current direction of the robot
+    :param direction_to_face: The direction to turn to
+    :return: The list of turns
+    """
+    no_of_right_rotations = Direction.get_no_of_right_rotations_to_destination_cell(direction, direction_to_face)
+
+    if no_of_right_rotations == 6:
+        return [Movement.LEFT]
+
+    return [Movement.RIGHT] * (no_of_right_rotations // 2)
+
+
+class RobotAgent:
+    """
+    A robot of the multi robot exploration, with its target and the movements left to the target. \n
+    A robot that cannot reach any frontier target goes back to its start point, out of the way of the other robots.
+    """
+
+    def __init__(self, exploration: 'Exploration'):
+        """
+        :param exploration: The exploration of the robot on the shared maps, which senses and updates the maps
+        """
+        self.exploration = exploration
+        self.home_point = tuple(exploration.robot.point)
+        self.home_direction = exploration.robot.direction
+        self.target = None
+        self.direction_to_face = None
+        self.is_going_home = False
+        self.movements = deque()
+        self.no_of_blocked_ticks = 0
+        self.excluded_targets = set()  # Targets that the robot cannot reach, until more cells are explored
+
+    @property
+    def robot(self):
+        return self.exploration.robot
+
+    def drop_target(self) -> None:
+        self.target = None
+        self.direction_to_face = None
+        self.is_going_home = False
+        self.movements.clear()
+        self.no_of_blocked_ticks = 0
+
+
+class MultiRobotExploration:
+    """
+    Explores the arena with several simulated robots that share the explored and obstacle maps. \n
+    The exploration runs in ticks, and every robot makes at most one movement in a tick: \n
+    1. The frontier targets (the neighbours of the unexplored cells) are allocated to the robots without a target by
+       travel distance, so that the targets of the robots are apart \n
+    2. The decision steps of the robots (travel distances and paths, with the other robots as obstacles) run
+       concurrently, as they only read the maps \n
+    3. The robots move one after another. A robot only moves onto cells that are not reserved by another robot, so
+       the robots never collide. A robot that is blocked for too long plans around the robot in the way.
+    """
+
+    def __init__(self,
+                 robots: List['SimulatorBot'],
+                 explored_map: list,
+                 obstacle_map: list,
+                 on_update_map: Callable = None,
+                 coverage_limit: float = 1,
+                 max_no_of_ticks: int = _DEFAULT_MAX_NO_OF_TICKS,
+                 max_workers: int = None):
+        """
+        :param robots: The robots that explore the arena. The robots must not overlap
+        :param explored_map: The reference to keep track of the status of the exploration in the arena
+        :param obstacle_map: The reference to keep track of the obstacles detected by the robots in the arena
+        :param on_update_map: The callback function to update the map (Mainly used in simulator)
+        :param coverage_limit: The coverage limit for the robots to explore in the arena
+        :param max_no_of_ticks: The maximum number of ticks of the exploration
+        :param max_workers: The number of threads of the decision steps. One per robot if None
+        """
+        self.agents = [RobotAgent(Exploration(robot, explored_map, obstacle_map, on_update_map, time_limit=None))
+                       for robot in robots]
+        self.explored_map = explored_map
+        self.obstacle_map = obstacle_map
+        self.coverage_limit = coverage_limit
+        self.max_no_of_ticks = max_no_of_ticks
+        self.max_workers = max_workers if max_workers is not None else len(robots)
+        self.no_of_ticks = 0
+        self.reservations: Dict[Tuple[int, int], int] = {}  # The index of the robot that stands on every cell
+
+        for agent_index, agent in enumerate(self.agents):
+            for cell in get_footprint(agent.robot.point):
+                if cell in self.reservations:
+                    raise ValueError(f'Robot at {agent.robot.point} overlaps another robot')
+
+                self.reservations[cell] = agent_index
+
+    @property
+    def coverage(self) -> float:
+        return self.agents[0].exploration.coverage
+
+    def start_exploration(self) -> None:
+        """
+        Runs the exploration until the coverage limit is reached, no robot can reach an unexplored cell or the
+        maximum number of ticks is reached
+        """
+        for agent in self.agents:
+            agent.exploration.sense_and_repaint_canvas()
+            agent.exploration.mark_robot_area_as_explored(agent.robot.point[0], agent.robot.point[1])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while self.no_of_ticks < self.max_no_of_ticks and self.coverage < self.coverage_limit:
+                if not self.run_tick(executor):
+                    break
+
+        print_general_log(f'Explored {self.coverage * 100:.1f}% with {len(self.agents)} robots in '
+                          f'{self.no_of_ticks} ticks')
+
+    def run_tick(self, executor: 'ThreadPoolExecutor') -> bool:
+        """
+        Allocates the frontier targets, plans the paths and moves every robot by one movement
+
+        :param executor: The executor of the decision steps
+        :return: True if any robot has a target, or a target is found to be unreachable. Else False
+        """
+        frontier_targets = self.agents[0].exploration.find_neighbours_of_all_unexplored_cells()
+        virtual_maps = [self.get_virtual_obstacle_map(agent_index) for agent_index in range(len(self.agents))]
+
+        for agent in self.agents:
+            if agent.target is not None and not agent.is_going_home and agent.target not in frontier_targets:
+                agent.drop_target()  # Explored by another robot
+
+        # The robots going home take a frontier target as soon as they can reach one
+        agent_indexes_to_allocate = [agent_index for agent_index, agent in enumerate(self.agents)
+                                     if agent.target is None or agent.is_going_home]
+        travel_distances = executor.map(lambda agent_index: get_travel_distances(self.agents[agent_index].robot.point,
+                                                                                 virtual_maps[agent_index]),
+                                        agent_indexes_to_allocate)
+        self.allocate_frontier_targets(frontier_targets, dict(zip(agent_indexes_to_allocate, travel_distances)))
+
+        for agent in self.agents:
+            if agent.target is None and agent.home_point != tuple(agent.robot.point) and \
+                    agent.home_point not in agent.excluded_targets:
+                agent.target = agent.home_point
+                agent.direction_to_face = agent.home_direction
+                agent.is_going_home = True
+
+        agent_indexes_to_plan = [agent_index for agent_index, agent in enumerate(self.agents)
+                                 if agent.target is not None and len(agent.movements) <= 0]
+        movements_of_agents = executor.map(lambda agent_index: self.plan_movements(agent_index,
+                                                                                   virtual_maps[agent_index]),
+                                           agent_indexes_to_plan)
+
+        # Unreachable targets are tried by the other robots or allocated again in the next tick
+        is_target_excluded = False
+
+        for agent_index, movements in zip(agent_indexes_to_plan, movements_of_agents):
+            agent = self.agents[agent_index]
+
+            if not movements:
+                agent.excluded_targets.add(agent.target)
+                agent.drop_target()
+                is_target_excluded = True
+                continue
+
+            agent.movements.extend(movements)
+
+        no_of_explored_cells = sum(row.count(Cell.EXPLORED) for row in self.explored_map)
+        has_target = is_target_excluded
+
+        for agent_index, agent in enumerate(self.agents):
+            has_target |= agent.target is not None
+            self.move_agent(agent_index)
+
+        if sum(row.count(Cell.EXPLORED) for row in self.explored_map) > no_of_explored_cells:
+            for agent in self.agents:
+                agent.excluded_targets.clear()
+
+        self.no_of_ticks += 1
+
+        return has_target
+
+    def allocate_frontier_targets(self,
+                                  frontier_targets: Dict[tuple, 'Direction'],
+                                  travel_distances_of_agents: Dict[int, List[List[Optional[int]]]]) -> None:
+        """
+        Allocates the nearest frontier target to every robot without a target (or going home), away from the targets
+        of the other robots. A robot takes a target near the target of another robot only if there is no other target
+        left.
+
+        :param frontier_targets: The neighbours of the unexplored cells and the direction to face them
+        :param travel_distances_of_agents: The number of moves to every cell, of every robot to allocate
+        """
+        target_distances = sorted((travel_distances[target[0]][target[1]], agent_index, target)
+                                  for agent_index, travel_distances in travel_distances_of_agents.items()
+                                  for target in frontier_targets
+                                  if travel_distances[target[0]][target[1]] is not None and
+                                  target not in self.agents[agent_index].excluded_targets)
+
+        for is_spread_out in (True, False):
+            for _, agent_index, target in target_distances:
+                agent = self.agents[agent_index]
+
+                if (agent.target is not None and not agent.is_going_home) or \
+                        (is_spread_out and not self._is_away_from_other_targets(agent_index, target)):
+                    continue
+
+                agent.drop_target()
+                agent.target = target
+                agent.direction_to_face = frontier_targets[target]
+
+    def _is_away_from_other_targets(self, agent_index: int, target: Tuple[int, int]) -> bool:
+        return all(abs(target[0] - agent.target[0]) + abs(target[1] - agent.target[1]) >= _MIN_DISTANCE_BETWEEN_TARGETS
+                   for other_agent_index, agent in enumerate(self.agents)
+                   if other_agent_index != agent_index and agent.target is not None and not agent.is_going_home)
+
+    def get_virtual_obstacle_map(self, agent_index: int) -> List[List[int]]:
+        """
+        Copies the obstacle map with virtual walls around the obstacles, the other robots, the arena and the
+        unexplored cells
+
+        :param agent_index: The index of the robot that plans on the map
+        :return: The obstacle map that the robot can plan on
+        """
+        obstacle_map_copy = deepcopy(self.obstacle_map)
+
+        for (row, column), other_agent_index in self.reservations.items():
+            if other_agent_index != agent_index:
+                obstacle_map_copy[row][column] = Cell.OBSTACLE.value
+
+        Map.set_virtual_walls_on_map(obstacle_map_copy, self.explored_map)
+
+        return obstacle_map_copy
+
+    def plan_movements(self, agent_index: int, virtual_map: List[List[int]]) -> Optional[List[Movement]]:
+        """
+        Plans the movements of the robot to its target, including the turn to face the unexplored cell
+
+        :param agent_index: The index of the robot
+        :param virtual_map: The obstacle map of the robot with virtual walls
+        :return: The movements to the target. None if there is no path. Empty if the robot is at the target
+        """
+        agent = self.agents[agent_index]
+        robot_direction = agent.robot.direction
+        solver = AStarAlgorithm(virtual_map)
+        path = solver.run_algorithm_for_exploration(agent.robot.point, list(agent.target), robot_direction)
+
+        if path is None or len(path) <= 0:
+            return None
+
+        movements = solver.convert_fastest_path_to_movements(path, robot_direction)
+
+        return movements + _get_turn_movements(path[-1].direction_facing, agent.direction_to_face)
+
+    def move_agent(self, agent_index: int) -> None:
+        """
+        Makes the next movement of the robot if the cells ahead are free and not reserved by another robot
+
+        :param agent_index: The index of the robot
+        """
+        agent = self.agents[agent_index]
+
+        if len(agent.movements) <= 0:
+            return
+
+        movement = agent.movements[0]
+
+        if movement in (Movement.FORWARD, Movement.BACKWARD):
+            direction_offset = Direction.get_direction_offset(agent.robot.direction)
+            sign = 1 if movement == Movement.FORWARD else -1
+            next_point = (agent.robot.point[0] + sign * direction_offset[0],
+                          agent.robot.point[1] + sign * direction_offset[1])
+            next_footprint = get_footprint(next_point)
+
+            if not all(is_within_arena_range(row, column) and self.obstacle_map[row][column] != Cell.OBSTACLE
+                       for row, column in next_footprint):
+                agent.movements.clear()  # An obstacle found on the path, plan again
+                return
+
+            if any(self.reservations.get(cell, agent_index) != agent_index for cell in next_footprint):
+                agent.no_of_blocked_ticks += 1
+
+                if agent.no_of_blocked_ticks > _MAX_NO_OF_BLOCKED_TICKS:
+                    agent.movements.clear()  # Plan around the robot in the way
+                    agent.no_of_blocked_ticks = 0
+
+                return
+
+            for cell in get_footprint(agent.robot.point):
+                del self.reservations[cell]
+
+            for cell in next_footprint:
+                self.reservations[cell] = agent_index
+
+        agent.movements.popleft()
+        agent.no_of_blocked_ticks = 0
+        agent.exploration.move(movement)
+
+        if len(agent.movements) <= 0:
+            agent.drop_target()  # Reached the target
+
+
+def run_multi_robot_benchmark(arena: List[List[int]],
+                              max_no_of_robots: int,
+                              max_no_of_ticks: int = _DEFAULT_MAX_NO_OF_TICKS) -> None:
+    """
+    Explores the arena with 1 to max_no_of_robots simulated robots and prints the number of ticks to explore the
+    arena for every number of robots
+
+    :param arena: The arena to explore
+    :param max_no_of_robots: The maximum number of robots
+    :param max_no_of_ticks: The maximum number of ticks of every exploration
+    """
+    for no_of_robots in range(1, max_no_of_robots + 1):
+        map_object = Map()
+        robots = [SimulatorBot(start_point, arena, Direction.EAST, lambda m: None, update_interval=0)
+                  for start_point in get_start_points(arena, no_of_robots)]
+        multi_robot_exploration = MultiRobotExploration(robots,
+                                                        map_object.explored_map,
+                                                        map_object.obstacle_map,
+                                                        max_no_of_ticks=max_no_of_ticks)
+
+        start_time = perf_counter()
+        multi_robot_exploration.start_exploration()
+        time_taken = perf_counter() - start_time
+
+        no_of_moves = sum(agent.exploration.no_of_steps_taken for agent in multi_robot_exploration.agents)
+        print_general_log(f'{len(robots)} robots: {multi_robot_exploration.coverage * 100:.1f}% in '
+                          f'{multi_robot_exploration.no_of_ticks} ticks, {no_of_moves} moves, '
+                          f'{time_taken / max(1, multi_robot_exploration.no_of_ticks) * 1000:.1f} ms per tick')
+
+
+if __name__ == '__main__':
+    from fake_rpi_server import load_arena
+
+    parser = ArgumentParser(description='Benchmark the exploration time against the number of robots')
+    parser.add_argument('--arena', type=str, default='sample_arena_1', help='Arena filename in ./maps')
+    parser.add_argument('--max-no-of-robots', type=int, default=4, help='Maximum number of robots')
+    parser.add_argument('--max-no-of-ticks', type=int, default=_DEFAULT_MAX_NO_OF_TICKS, help='Maximum ticks')
+    arguments = parser.parse_args()
+
+    run_multi_robot_benchmark(load_arena(arguments.arena), arguments.max_no_of_robots, arguments.max_no_of_ticks)
@@ -0,0 +1,424 @@
+"""
+Contain MultiWaypointPlanner Class
+"""
+from itertools import permutations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from algorithms.cost_to_go_field import CostToGoField
+from algorithms.fastest_path_solver import CoordinateList, INFINITE_COST, Node
+from utils.enums import Cell, Direction, Movement
+from utils.logger import print_error_log
+
+# Beyond this number of way points, the visiting order is found with a heuristic instead of dynamic programming
+MAX_NO_OF_WAY_POINTS_TO_SOLVE_EXACTLY = 8
+
+_DIRECTIONS = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
+
+# (index of the point, direction the robot faces at the point). Index 0 is the start point, index i is way point i - 1
+State = Tuple[int, 'Direction']
+
+
+class MultiWaypointPlanner:
+    """
+    Finds the fastest path from the start point through several way points to the goal point. \n
+    The cost between every pair of points is computed once from the cost to go fields of the way points, for every
+    direction the robot can face, so that the turns at the way points are counted. The fields weigh the steps and turns
+    like AStarAlgorithm, so the path costs as much as the fastest paths between the way points in the visiting order.
+    The fields are cached until the arena changes. The visiting order is solved exactly for a few way points and with a
+    heuristic for more. \n
+    The FP run of the robot plans with it once way points are added to the WP way point with the AWP command.
+    """
+
+    def __init__(self, arena: List[List[int]]):
+        """
+        :param arena: The arena with virtual walls, where the robot can only stand on free cells
+        """
+        self.arena = arena
+        self._cost_to_go_fields: Dict[Tuple[Tuple[int, int], Optional['Direction']], 'CostToGoField'] = {}
+
+    def set_map(self, new_arena_map: List[List[int]]) -> None:
+        self.arena = new_arena_map
+        self._cost_to_go_fields.clear()
+
+    def run_algorithm(self,
+                      start_point: CoordinateList,
+                      way_points: Sequence[CoordinateList],
+                      goal_point: CoordinateList,
+                      direction_facing: 'Direction',
+                      ordering_constraints: Sequence[Tuple[int, int]] = ()) -> Optional[List['Node']]:
+        """
+        Finds the fastest path from the start point through all the way points to the goal point
+
+        :param start_point: The starting point of the robot
+        :param way_points: The way points to visit, in any order allowed by the ordering constraints
+        :param goal_point: The goal point
+        :param direction_facing: Current facing direction of the robot
+        :param ordering_constraints: Pairs of way point indexes (i, j) where way point i must be visited before j
+        :return: A list of nodes for the fastest path, like AStarAlgorithm.run_algorithm, so that it can be converted
+                 with AStarAlgorithm.convert_fastest_path_to_movements. None if there is no path
+        """
+        states = self.find_visiting_order(start_point, way_points, goal_point, direction_facing, ordering_constraints)
+
+        if states is None:
+            return None
+
+        points = [start_point] + list(way_points)
+        path = []
+
+        for (point_index, direction), (next_point_index, next_direction) in zip(states, states[1:]):
+            path.extend(self._get_path(points[point_index], direction, points[next_point_index], next_direction))
+
+        last_point_index, last_direction = states[-1]
+        path.extend(self._get_path(points[last_point_index], last_direction, goal_point, None))
+
+        return path
+
+    def find_visiting_order(self,
+                            start_point: CoordinateList,
+                            way_points: Sequence[CoordinateList],
+                            goal_point: CoordinateList,
+                            direction_facing: 'Direction',
+                            ordering_constraints: Sequence[Tuple[int, int]] = ()) -> Optional[List['State']]:
+        """
+        Finds the order to visit the way points in and the direction to face at every way point
+
+        :param start_point: The starting point of the robot
+        :param way_points: The way points to visit
+        :param goal_point: The goal point
+        :param direction_facing: Current facing direction of the robot
+        :param ordering_constraints: Pairs of way point indexes (i, j) where way point i must be visited before j
+        :return: The start state followed by the state at every way point in the visiting order. None if there is no
+                 path or the ordering constraints cannot be satisfied
+        """
+        points = [start_point] + list(way_points)
+
+        for point in points + [goal_point]:
+            if self._is_not_free(point):
+                print_error_log(f'Point {point} is out of range, an obstacle or a virtual wall')
+                return None
+
+        if _has_cycle(len(way_points), ordering_constraints):
+            print_error_log('The ordering constraints of the way points contain a cycle')
+            return None
+
+        costs = self.get_costs_between_points(points, goal_point)
+
+        # Way point i is point i + 1. Predecessors are stored as bit masks over the way points
+        predecessor_masks = [0] * len(way_points)
+
+        for before_index, after_index in ordering_constraints:
+            predecessor_masks[after_index] |= 1 << before_index
+
+        if len(way_points) <= MAX_NO_OF_WAY_POINTS_TO_SOLVE_EXACTLY:
+            states = _solve_exactly(len(way_points), direction_facing, costs, predecessor_masks)
+        else:
+            states = _solve_heuristically(len(way_points), direction_facing, costs, predecessor_masks)
+
+        if states is None:
+            print_error_log('No fastest path found through all the way points.')
+
+        return states
+
+    def get_costs_between_points(self,
+                                 points: List[CoordinateList],
+                                 goal_point: CoordinateList) -> Dict[Tuple['State', 'State'], int]:
+        """
+        Gets the cost between every pair of states of the points, and from every state to the goal
+
+        :param points: The start point followed by the way points
+        :param goal_point: The goal point
+        :return: The cost keyed by the pair of states. The goal state is (len(points), None).
+                 Pairs without a path are left out
+        """
+        costs = {}
+        goal_index = len(points)
+        targets = [(point_index, direction) for point_index in range(1, len(points)) for direction in _DIRECTIONS]
+        targets.append((goal_index, None))
+
+        for target_index, target_direction in targets:
+            target_point = goal_point if target_index == goal_index else points[target_index]
+            cost_to_go_field = self._get_cost_to_go_field(target_point, target_direction)
+
+            for point_index, point in enumerate(points):
+                if point_index == target_index:
+                    continue
+
+                for direction in _DIRECTIONS:
+                    cost_to_target = cost_to_go_field.get_no_of_moves(point, direction)
+
+                    if cost_to_target is not None:
+                        costs[((point_index, direction), (target_index, target_direction))] = \
+                            cost_to_target
+
+        return costs
+
+    def _get_cost_to_go_field(self,
+                              goal_point: CoordinateList,
+                              goal_direction: Optional['Direction']) -> 'CostToGoField':
+        key = (tuple(goal_point), goal_direction)
+
+        if key not in self._cost_to_go_fields:
+            cost_to_go_field = CostToGoField(goal_point, goal_direction, use_solver_costs=True)
+            cost_to_go_field.update(self.arena)
+            self._cost_to_go_fields[key] = cost_to_go_field
+
+        return self._cost_to_go_fields[key]
+
+    def _get_path(self,
+                  point: CoordinateList,
+                  direction: 'Direction',
+                  goal_point: CoordinateList,
+                  goal_direction: Optional['Direction']) -> List['Node']:
+        """
+        Follows the cost to go field of the goal and records a node for every step forward
+
+        :return: The nodes after every step forward, facing the direction of the step
+        """
+        list_of_movements = self._get_cost_to_go_field(goal_point, goal_direction).get_movements(point, direction)
+        path = []
+
+        for movement in list_of_movements:
+            if movement == Movement.RIGHT:
+                direction = Direction.get_clockwise_direction(direction)
+
+            elif movement == Movement.LEFT:
+                direction = Direction.get_anti_clockwise_direction(direction)
+
+            else:
+                direction_offset = Direction.get_direction_offset(direction)
+                point = [point[0] + direction_offset[0], point[1] + direction_offset[1]]
+                path.append(Node(point, direction))
+
+        return path
+
+    def _is_not_free(self, point: CoordinateList) -> bool:
+        row, column = point
+
+        return not (0 <= row < len(self.arena) and 0 <= column < len(self.arena[0])) or \
+            self.arena[row][column] != Cell.FREE_AREA
+
+
+def _has_cycle(no_of_way_points: int, ordering_constraints: Sequence[Tuple[int, int]]) -> bool:
+    """
+    Determines if the ordering constraints contradict each other, by removing way points without predecessors
+
+    :param no_of_way_points: The number of way points
+    :param ordering_constraints: Pairs of way point indexes (i, j) where way point i must be visited before j
+    :return: True if some way points can never be visited. Else False
+    """
+    no_of_predecessors = [0] * no_of_way_points
+
+    for _, after_index in ordering_constraints:
+        no_of_predecessors[after_index] += 1
+
+    way_points_to_remove = [i for i in range(no_of_way_points) if no_of_predecessors[i] == 0]
+    no_of_removed_way_points = 0
+
+    while len(way_points_to_remove) > 0:
+        way_point_index = way_points_to_remove.pop()
+        no_of_removed_way_points += 1
+
+        for before_index, after_index in ordering_constraints:
+            if before_index != way_point_index:
+                continue
+
+            no_of_predecessors[after_index] -= 1
+
+            if no_of_predecessors[after_index] == 0:
+                way_points_to_remove.append(after_index)
+
+    return no_of_removed_way_points < no_of_way_points
+
+
+def _solve_exactly(no_of_way_points: int,
+                   direction_facing: 'Direction',
+                   costs: Dict[Tuple['State', 'State'], int],
+                   predecessor_masks: List[int]) -> Optional[List['State']]:
+    """
+    Finds the visiting order with the lowest cost with dynamic programming over the sets of visited way points
+    (Held-Karp), where the state at a way point includes the direction the robot faces
+
+    :return: The start state followed by the state at every way point in the visiting order. None if there is no path
+    """
+    start_state = (0, direction_facing)
+    goal_state = (no_of_way_points + 1, None)
+
+    # Indexed by the bit mask of the visited way points, then keyed by the last state
+    lowest_costs: List[Dict['State', int]] = [{} for _ in range(1 << no_of_way_points)]
+    previous_states: List[Dict['State', 'State']] = [{} for _ in range(1 << no_of_way_points)]
+    lowest_costs[0][start_state] = 0
+
+    for visited_mask in range(1 << no_of_way_points):
+        for state, cost_to_state in lowest_costs[visited_mask].items():
+            for way_point_index in range(no_of_way_points):
+                way_point_bit = 1 << way_point_index
+
+                if visited_mask & way_point_bit or \
+                        predecessor_masks[way_point_index] & visited_mask != predecessor_masks[way_point_index]:
+                    continue
+
+                next_mask = visited_mask | way_point_bit
+
+                for direction in _DIRECTIONS:
+                    next_state = (way_point_index + 1, direction)
+                    cost_to_next_state = costs.get((state, next_state))
+
+                    if cost_to_next_state is None:
+                        continue
+
+                    cost_to_next_state += cost_to_state
+
+                    if cost_to_next_state < lowest_costs[next_mask].get(next_state, INFINITE_COST):
+                        lowest_costs[next_mask][next_state] = cost_to_next_state
+                        previous_states[next_mask][next_state] = state
+
+    all_visited_mask = (1 << no_of_way_points) - 1
+    last_state = None
+    lowest_total_cost = INFINITE_COST
+
+    for state, cost_to_state in lowest_costs[all_visited_mask].items():
+        cost_to_goal = costs.get((state, goal_state))
+
+        if cost_to_goal is not None and cost_to_state + cost_to_goal < lowest_total_cost:
+            lowest_total_cost = cost_to_state + cost_to_goal
+            last_state = state
+
+    if last_state is None:
+        return None
+
+    states = [last_state]
+    visited_mask = all_visited_mask
+
+    while visited_mask != 0:
+        previous_state = previous_states[visited_mask][states[-1]]
+        visited_mask &= ~(1 << (states[-1][0] - 1))
+        states.append(previous_state)
+
+    states.reverse()
+
+    return states
+
+
+def _get_states_of_order(order: Sequence[int],
+                         direction_facing: 'Direction',
+                         costs: Dict[Tuple['State', 'State'], int]) -> Tuple[int, Optional[List['State']]]:
+    """
+    Finds the best direction to face at every way point for a fixed visiting order
+
+    :param order: The way point indexes in the visiting order
+    :return: The cost and the states of the order. INFINITE_COST and None if there is no path
+    """
+    goal_state = (len(order) + 1, None)
+    lowest_costs = {(0, direction_facing): (0, [(0, direction_facing)])}
+
+    for way_point_index in order:
+        next_lowest_costs = {}
+
+        for direction in _DIRECTIONS:
+            next_state = (way_point_index + 1, direction)
+
+            for state, (cost_to_state, states) in lowest_costs.items():
+                cost_to_next_state = costs.get((state, next_state))
+
+                if cost_to_next_state is None:
+                    continue
+
+                cost_to_next_state += cost_to_state
+
+                if cost_to_next_state < next_lowest_costs.get(next_state, (INFINITE_COST,))[0]:
+                    next_lowest_costs[next_state] = (cost_to_next_state, states + [next_state])
+
+        lowest_costs = next_lowest_costs
+
+    best_cost, best_states = INFINITE_COST, None
+
+    for state, (cost_to_state, states) in lowest_costs.items():
+        cost_to_goal = costs.get((state, goal_state))
+
+        if cost_to_goal is not None and cost_to_state + cost_to_goal < best_cost:
+            best_cost, best_states = cost_to_state + cost_to_goal, states
+
+    return best_cost, best_states
+
+
+def _is_valid_order(order: Sequence[int], predecessor_masks: List[int]) -> bool:
+    visited_mask = 0
+
+    for way_point_index in order:
+        if predecessor_masks[way_point_index] & visited_mask != predecessor_masks[way_point_index]:
+            return False
+
+        visited_mask |= 1 << way_point_index
+
+    return True
+
+
+def _solve_heuristically(no_of_way_points: int,
+                         direction_facing: 'Direction',
+                         costs: Dict[Tuple['State', 'State'], int],
+                         predecessor_masks: List[int]) -> Optional[List['State']]:
+    """
+    Builds the visiting order by going to the nearest allowed way point, then improves it by reversing segments of the
+    order (2-opt) and moving single way points (or-opt) while the cost decreases
+
+    :return: The start state followed by the state at every way point in the visiting order. None if there is no path
+    """
+    order = []
+    visited_mask = 0
+    state = (0, direction_facing)
+
+    for _ in range(no_of_way_points):
+        nearest_way_point_index, nearest_state, lowest_cost = None, None, INFINITE_COST
+
+        for way_point_index in range(no_of_way_points):
+            if visited_mask & (1 << way_point_index) or \
+                    predecessor_masks[way_point_index] & visited_mask != predecessor_masks[way_point_index]:
+                continue
+
+            for direction in _DIRECTIONS:
+                cost_to_next_state = costs.get((state, (way_point_index + 1, direction)), INFINITE_COST)
+
+                if cost_to_next_state < lowest_cost:
+                    nearest_way_point_index = way_point_index
+                    nearest_state = (way_point_index + 1, direction)
+                    lowest_cost = cost_to_next_state
+
+        if nearest_way_point_index is None:
+            return None
+
+        order.append(nearest_way_point_index)
+        visited_mask |= 1 << nearest_way_point_index
+        state = nearest_state
+
+    best_cost, best_states = _get_states_of_order(order, direction_facing, costs)
+    is_improved = True
+
+    while is_improved:
+        is_improved = False
+
+        for candidate_order in _get_neighbouring_orders(order):
+            if not _is_valid_order(candidate_order, predecessor_masks):
+                continue
+
+            candidate_cost, candidate_states = _get_states_of_order(candidate_order, direction_facing, costs)
+
+            if candidate_cost < best_cost:
+                order, best_cost, best_states = candidate_order, candidate_cost, candidate_states
+                is_improved = True
+                break
+
+    return best_states
+
+
+def _get_neighbouring_orders(order: List[int]):
+    """
+    Generates the orders with one segment reversed (2-opt) or one way point moved elsewhere (or-opt)
+
+    :param order: The way point indexes in the visiting order
+    """
+    for i, j in permutations(range(len(order)), 2):
+        if i < j:
+            yield order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+
+        moved_order = order[:i] + order[i + 1:]
+        yield moved_order[:j] + [order[i]] + moved_order[j:]
@@ -0,0 +1,147 @@
+"""
+Contain OccupancyGrid Class
+"""
+from math import exp, log
+from typing import Dict, List, Optional, Tuple
+
+from robot import Sensor
+from utils import constants
+
+# Probability that an obstacle reported at the distance (in cells) from the sensor is really there, and that a cell
+# reported free is really free. Long range readings are less reliable further away and at 2 to 3 cells, where the
+# exploration used to ignore the obstacles reported by the long range sensor entirely.
+_SHORT_RANGE_HIT_PROBABILITIES = {1: 0.9}
+_SHORT_RANGE_FREE_PROBABILITIES = {1: 0.9}
+_LONG_RANGE_HIT_PROBABILITIES = {1: 0.85, 2: 0.6, 3: 0.6, 4: 0.75, 5: 0.7, 6: 0.65}
+_LONG_RANGE_FREE_PROBABILITIES = {1: 0.85, 2: 0.8, 3: 0.8, 4: 0.75, 5: 0.7, 6: 0.65}
+_DEFAULT_PROBABILITY = 0.6  # For distances without a measured probability, if the sensor ranges change
+
+# The log odds are clamped so that a cell can still change its state after many consistent readings
+_MAX_LOG_ODDS = 4.0
+# Between the log odds of a single obstacle reading at 2 to 3 cells of the long range sensor and at other distances
+_DEFAULT_OCCUPIED_THRESHOLD = 0.5
+
+# (sensor point, direction offset, is short range sensor, obstacle distance from the sensor or None)
+SensorReading = Tuple[Tuple[int, int], List[int], bool, Optional[int]]
+
+
+def _convert_probability_to_log_odds(probability: float) -> float:
+    return log(probability / (1 - probability))
+
+
+def _build_sensor_model(sensor_range: List[int],
+                        hit_probabilities: Dict[int, float],
+                        free_probabilities: Dict[int, float]) -> Tuple[List[float], List[float]]:
+    """
+    Builds the log odds added to a cell that the sensor reports as free or as an obstacle, indexed by the distance
+
+    :param sensor_range: The range of the sensor. Range is inclusive at lower bound, exclusive at upper bound
+    :param hit_probabilities: The probability that an obstacle reported at the distance is really there
+    :param free_probabilities: The probability that a cell reported free at the distance is really free
+    :return: The log odds of the free readings (negative) and of the obstacle readings (positive)
+    """
+    free_log_odds = [0.0] * sensor_range[1]
+    occupied_log_odds = [0.0] * sensor_range[1]
+
+    for distance in range(sensor_range[0], sensor_range[1]):
+        free_log_odds[distance] = -_convert_probability_to_log_odds(free_probabilities.get(distance,
+                                                                                           _DEFAULT_PROBABILITY))
+        occupied_log_odds[distance] = _convert_probability_to_log_odds(hit_probabilities.get(distance,
+                                                                                             _DEFAULT_PROBABILITY))
+
+    return free_log_odds, occupied_log_odds
+
+
+class OccupancyGrid:
+    """
+    Fuses the sensor readings into the log odds of every cell being an obstacle. \n
+    A single obstacle reading of a reliable sensor flips a cell at once, so that the robot never moves onto an obstacle.
+    A single obstacle reading of the long range sensor at 2 to 3 cells does not, and a cell flipped by a single reading
+    is cleared again by later free readings, so phantom obstacles do not stay in the view that the planner sees.
+    """
+
+    def __init__(self,
+                 height: int = constants.ARENA_HEIGHT,
+                 width: int = constants.ARENA_WIDTH,
+                 occupied_threshold: float = _DEFAULT_OCCUPIED_THRESHOLD):
+        """
+        :param height: The number of rows of the arena
+        :param width: The number of columns of the arena
+        :param occupied_threshold: The log odds above which a cell is an obstacle
+        """
+        self.height = height
+        self.width = width
+        self.occupied_threshold = occupied_threshold
+        self.log_odds = [[0.0] * width for _ in range(height)]
+        self.is_occupied = [[False] * width for _ in range(height)]
+
+        # Indexed by is_short_range
+        self._sensor_models = {
+            True: _build_sensor_model(Sensor.SR_RANGE, _SHORT_RANGE_HIT_PROBABILITIES, _SHORT_RANGE_FREE_PROBABILITIES),
+            False: _build_sensor_model(Sensor.LR_RANGE, _LONG_RANGE_HIT_PROBABILITIES, _LONG_RANGE_FREE_PROBABILITIES)
+        }
+        self._sensor_ranges = {True: Sensor.SR_RANGE, False: Sensor.LR_RANGE}
+
+    def update(self, sensor_readings: List['SensorReading']) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Adds the log odds of the cells along the rays of all sensor readings, then thresholds the observed cells once
+
+        :param sensor_readings: The readings of the sensors of the robot
+        :return: The cells observed by the sensors, and the cells whose obstacle state changed
+        """
+        log_odds_of_observed_cells: Dict[Tuple[int, int], float] = {}  # Cells seen by several sensors add up
+
+        for sensor_point, direction_offset, is_short_range, obstacle_distance in sensor_readings:
+            sensor_range = self._sensor_ranges[is_short_range]
+            free_log_odds, occupied_log_odds = self._sensor_models[is_short_range]
+
+            last_distance = sensor_range[1] - 1
+
+            if obstacle_distance is not None:
+                last_distance = min(last_distance, obstacle_distance)
+
+            for distance in range(sensor_range[0], last_distance + 1):
+                row = sensor_point[0] + distance * direction_offset[0]
+                column = sensor_point[1] + distance * direction_offset[1]
+
+                if not (0 <= row < self.height and 0 <= column < self.width):
+                    break
+
+                cell_log_odds = occupied_log_odds[distance] if distance == obstacle_distance \
+                    else free_log_odds[distance]
+                log_odds_of_observed_cells[(row, column)] = log_odds_of_observed_cells.get((row, column), 0) + \
+                    cell_log_odds
+
+        changed_cells = []
+
+        for (row, column), cell_log_odds in log_odds_of_observed_cells.items():
+            updated_log_odds = max(-_MAX_LOG_ODDS, min(_MAX_LOG_ODDS, self.log_odds[row][column] + cell_log_odds))
+            self.log_odds[row][column] = updated_log_odds
+
+            is_occupied = updated_log_odds > self.occupied_threshold
+
+            if is_occupied != self.is_occupied[row][column]:
+                self.is_occupied[row][column] = is_occupied
+                changed_cells.append((row, column))
+
+        return list(log_odds_of_observed_cells), changed_cells
+
+    def set_free_area(self, row: int, column: int) -> None:
+        """
+        Marks the cell as certainly free, e.g. the start and goal area
+
+        :param row: The row coordinate of the cell
+        :param column: The column coordinate of the cell
+        """
+        self.log_odds[row][column] = -_MAX_LOG_ODDS
+        self.is_occupied[row][column] = False
+
+    def get_probability(self, row: int, column: int) -> float:
+        """
+        Gets the probability that the cell is an obstacle
+
+        :param row: The row coordinate of the cell
+        :param column: The column coordinate of the cell
+        :return: The probability that the cell is an obstacle
+        """
+        return 1 - 1 / (1 + exp(self.log_odds[row][column]))
@@ -0,0 +1,78 @@
+"""
+Contain PathCache Class
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, List, Optional
+
+_DEFAULT_MAX_SIZE = 256
+
+
+class PathCache:
+    """
+    Keeps the most recently used fastest paths, keyed by a hash of the content of the map and the end points of the
+    search. \n
+    The map may be replaced or modified in place without telling the cache, as a path found on a map is never returned
+    for a map with a different content. Paths found on earlier maps age out of the cache, as the least recently used
+    path is evicted when the cache is full.
+    """
+
+    def __init__(self, max_size: int = _DEFAULT_MAX_SIZE):
+        """
+        :param max_size: The maximum number of paths to keep
+        """
+        self.max_size = max_size
+        self.no_of_hits = 0
+        self.no_of_misses = 0
+        self._paths = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def get_map_key(arena: List[List[int]]) -> int:
+        """
+        Gets the hash of the content of the map to key the paths with, so that the keys do not keep copies of the map
+
+        :param arena: The map searched
+        :return: The hash of the content of the map
+        """
+        return hash(tuple(map(tuple, arena)))
+
+    def get(self, key: Hashable) -> Optional[list]:
+        """
+        Gets the path and marks it as the most recently used
+
+        :param key: The key of the search
+        :return: A copy of the path, so that the cached path cannot be modified. None if the path is not cached
+        """
+        with self._lock:
+            path = self._paths.get(key)
+
+            if path is None:
+                self.no_of_misses += 1
+                return None
+
+            self._paths.move_to_end(key)
+            self.no_of_hits += 1
+
+        return list(path)
+
+    def put(self, key: Hashable, path: list) -> None:
+        """
+        Caches the path, evicting the least recently used path if the cache is full
+
+        :param key: The key of the search
+        :param path: The path found by the search
+        """
+        with self._lock:
+            self._paths[key] = tuple(path)
+            self._paths.move_to_end(key)
+
+            while len(self._paths) > self.max_size:
+                self._paths.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+
+    def __len__(self) -> int:
+        return len(self._paths)
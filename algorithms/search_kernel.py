@@ -0,0 +1,133 @@
+"""
+Contain the search kernel of the A* search, over flat arrays of the arena
+"""
+import heapq
+from itertools import chain
+from typing import List, Optional, Tuple
+
+from utils import constants
+
+INFINITE_COST = 999999
+
+# The (row, column) offset of every direction, indexed by the direction divided by 2 (north, east, south, west)
+_DIRECTION_OFFSETS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+# The direction of every neighbouring position divided by 2, in the order of constants.NEIGHBOURING_POSITIONS
+_NEIGHBOUR_DIRECTION_INDEXES = [_DIRECTION_OFFSETS.index(tuple(position))
+                                for position in constants.NEIGHBOURING_POSITIONS]
+
+# Indexed by the number of right rotations (in multiples of 90 degrees) from the current to the next direction
+_TURN_COSTS = [constants.NO_TURN_COST,
+               constants.TURN_COST_PERPENDICULAR,
+               constants.TURN_COST_OPPOSITE_DIRECTION,
+               constants.TURN_COST_PERPENDICULAR]
+
+SearchResult = Tuple[List[int], List[int], bytearray]  # g costs, parent cells and directions divided by 2
+
+
+def get_blocked_cells(arena: List[List[int]]) -> bytearray:
+    """
+    Flattens the arena row by row into the cells the search cannot enter: the cells that are not free and the border
+    of the arena. \n
+    A row of blocked cells is added after the arena, so that a neighbour of any cell of the arena is in the array.
+    A neighbour above the first row wraps around to that row.
+
+    :param arena: The arena with virtual walls
+    :return: A value other than 0 for every blocked cell, 0 for every free cell
+    """
+    height = len(arena)
+    width = len(arena[0])
+
+    # The free cells are 0 and the obstacles and virtual walls are not
+    blocked_cells = bytearray(chain.from_iterable(arena))
+    blocked_cells[:width] = blocked_cells[(height - 1) * width:] = b'\x01' * width
+    blocked_cells[::width] = b'\x01' * height
+    blocked_cells[width - 1::width] = b'\x01' * height
+    blocked_cells.extend(b'\x01' * width)
+
+    return blocked_cells
+
+
+def search_cells(blocked_cells: bytearray,
+                 width: int,
+                 start_cell: int,
+                 start_direction_index: int,
+                 start_g_cost: int,
+                 goal_cell: int) -> Optional[SearchResult]:
+    """
+    Searches for the best path from the start cell to the goal cell. \n
+    The search expands the cells in the same order as the A* search of AStarAlgorithm: by f cost, then h cost, then
+    order of insertion. The blocked and the closed cells are kept in one array, so that a neighbour is skipped with
+    a single lookup, and the cost of every move and turn is looked up by the direction of the robot.
+
+    :param blocked_cells: The blocked cells of the arena, from get_blocked_cells
+    :param width: The number of columns of the arena
+    :param start_cell: The cell number (row * width + column) of the start point
+    :param start_direction_index: The direction of the robot at the start point divided by 2
+    :param start_g_cost: The cost of the path before the start point
+    :param goal_cell: The cell number of the goal
+    :return: The g costs, parent cells and directions of the cells. None if there is no path
+    """
+    no_of_cells = len(blocked_cells)
+    goal_row, goal_column = divmod(goal_cell, width)
+
+    g_costs = [INFINITE_COST] * no_of_cells
+    parent_cells = [-1] * no_of_cells
+    direction_indexes = bytearray(no_of_cells)
+
+    # A cell is done once it is closed, or if it can never be entered
+    is_done = bytearray(blocked_cells)
+    is_done[start_cell] = 0
+
+    g_costs[start_cell] = start_g_cost
+    direction_indexes[start_cell] = start_direction_index
+
+    # The (cell offset, direction divided by 2, cost) of every neighbour, for every direction of the robot
+    moves_by_direction = [[(row_offset * width + column_offset, neighbour_direction_index,
+                            constants.MOVE_COST + _TURN_COSTS[(neighbour_direction_index - direction_index) % 4])
+                           for (row_offset, column_offset), neighbour_direction_index in
+                           zip(constants.NEIGHBOURING_POSITIONS, _NEIGHBOUR_DIRECTION_INDEXES)]
+                          for direction_index in range(4)]
+
+    start_row, start_column = divmod(start_cell, width)
+    start_h_cost = abs(start_row - goal_row) + abs(start_column - goal_column)
+    open_list = [(start_g_cost + start_h_cost, start_h_cost, 0, start_cell)]
+    no_of_insertions = 1
+
+    heappop = heapq.heappop
+    heappush = heapq.heappush
+
+    while open_list:
+        cell = heappop(open_list)[3]
+
+        if is_done[cell]:
+            continue  # An outdated entry of a cell that was reached later at a lower cost
+
+        is_done[cell] = 1
+
+        if cell == goal_cell:
+            return g_costs, parent_cells, direction_indexes
+
+        g_cost = g_costs[cell]
+
+        for cell_offset, neighbour_direction_index, cost in moves_by_direction[direction_indexes[cell]]:
+            neighbour_cell = cell + cell_offset
+
+            if is_done[neighbour_cell]:
+                continue
+
+            neighbour_g_cost = g_cost + cost
+
+            if neighbour_g_cost >= g_costs[neighbour_cell]:
+                continue
+
+            g_costs[neighbour_cell] = neighbour_g_cost
+            parent_cells[neighbour_cell] = cell
+            direction_indexes[neighbour_cell] = neighbour_direction_index
+
+            neighbour_row, neighbour_column = divmod(neighbour_cell, width)
+            h_cost = abs(neighbour_row - goal_row) + abs(neighbour_column - goal_column)
+            heappush(open_list, (neighbour_g_cost + h_cost, h_cost, no_of_insertions, neighbour_cell))
+            no_of_insertions += 1
+
+    return None
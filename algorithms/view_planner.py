@@ -0,0 +1,103 @@
+"""
+Contain functions to pick the next pose to explore by how much of the arena the robot would see from it
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from map import is_within_arena_range
+from utils import constants
+from utils.enums import Cell, Direction
+
+Pose = Tuple[Tuple[int, int], 'Direction']
+
+
+def count_cells_revealed_at_poses(poses: List['Pose'],
+                                  explored_map: List[List[int]],
+                                  obstacle_map: List[List[int]],
+                                  sensor_rays: Dict['Direction', list]) -> List[int]:
+    """
+    Counts the unexplored cells that the sensors would see from every pose. \n
+    Unexplored cells are assumed to be free, so a ray only stops at a known obstacle or at the wall of the arena.
+
+    :param poses: The positions and directions of the robot to evaluate
+    :param explored_map: The explored map of the exploration
+    :param obstacle_map: The obstacle map of the exploration
+    :param sensor_rays: The sensor ray table of the robot, indexed by the direction of the robot
+    :return: The number of distinct unexplored cells revealed at every pose
+    """
+    no_of_revealed_cells = []
+
+    for (robot_row, robot_column), direction in poses:
+        revealed_cells = set()
+
+        for sensor_ray in sensor_rays[direction]:
+            for row_offset, column_offset in sensor_ray.cell_offsets:
+                row = robot_row + row_offset
+                column = robot_column + column_offset
+
+                if not is_within_arena_range(row, column) or obstacle_map[row][column] == Cell.OBSTACLE:
+                    break
+
+                if explored_map[row][column] == Cell.UNEXPLORED:
+                    revealed_cells.add((row, column))
+
+        no_of_revealed_cells.append(len(revealed_cells))
+
+    return no_of_revealed_cells
+
+
+def get_travel_distances(start_point: List[int], virtual_map: List[List[int]]) -> List[List[Optional[int]]]:
+    """
+    Finds the number of moves from the start point to every cell that the robot can stand on, in one breadth first
+    search. Turns are not counted.
+
+    :param start_point: The position of the robot
+    :param virtual_map: The obstacle map with virtual walls, where the robot can only stand on free cells
+    :return: The number of moves to every cell. None if the cell cannot be reached
+    """
+    travel_distances = [[None] * constants.ARENA_WIDTH for _ in range(constants.ARENA_HEIGHT)]
+    travel_distances[start_point[0]][start_point[1]] = 0
+    points_to_visit = deque([tuple(start_point)])
+
+    while len(points_to_visit) > 0:
+        row, column = points_to_visit.popleft()
+
+        for row_offset, column_offset in constants.NEIGHBOURING_POSITIONS:
+            neighbour_row, neighbour_column = row + row_offset, column + column_offset
+
+            if not is_within_arena_range(neighbour_row, neighbour_column) or \
+                    virtual_map[neighbour_row][neighbour_column] != Cell.FREE_AREA or \
+                    travel_distances[neighbour_row][neighbour_column] is not None:
+                continue
+
+            travel_distances[neighbour_row][neighbour_column] = travel_distances[row][column] + 1
+            points_to_visit.append((neighbour_row, neighbour_column))
+
+    return travel_distances
+
+
+def rank_poses_by_information_gain(poses: List['Pose'],
+                                   no_of_revealed_cells: List[int],
+                                   travel_distances: List[List[Optional[int]]]) -> List['Pose']:
+    """
+    Ranks the reachable poses that reveal unexplored cells by the number of revealed cells per move
+
+    :param poses: The positions and directions of the robot
+    :param no_of_revealed_cells: The number of unexplored cells revealed at every pose
+    :param travel_distances: The number of moves to every cell
+    :return: The poses from the highest to the lowest information gain per move
+    """
+    scored_poses = []
+
+    for i, (pose, information_gain) in enumerate(zip(poses, no_of_revealed_cells)):
+        travel_distance = travel_distances[pose[0][0]][pose[0][1]]
+
+        if information_gain <= 0 or travel_distance is None:
+            continue
+
+        # The index breaks ties in the order of the poses, so that the ranking is deterministic
+        scored_poses.append((-information_gain / (travel_distance + 1), i, pose))
+
+    scored_poses.sort()
+
+    return [pose for _, _, pose in scored_poses]
@@ -0,0 +1,430 @@
+"""
+Contain a fake RPI server that simulates the robot on a loaded arena, for running the algorithms without hardware
+"""
+import random
+import re
+import socket
+from argparse import ArgumentParser
+from collections import Counter
+from copy import deepcopy
+from os.path import join
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from typing import List, Optional, Tuple
+
+from map import Map
+from robot import SimulatorBot
+from rpi_service import RPIService
+from utils.constants import DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES, ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement
+from utils.logger import print_error_log, print_exception_log, print_general_log
+from utils.timing import get_percentile, span_recorder
+
+# The RPI does not delimit the messages, so the messages are split at the headers.
+# Assumes that the payloads do not contain the lower case headers, which holds for the Arduino instructions,
+# the MDF strings (upper case hex) and the photo requests.
+_MESSAGE_REGEX_PATTERN = re.compile(rf'([{RPIService.ARDUINO_HEADER}{RPIService.ANDROID_HEADER}'
+                                    rf'{RPIService.TAKE_PHOTO_HEADER}])'
+                                    rf'([^{RPIService.ARDUINO_HEADER}{RPIService.ANDROID_HEADER}'
+                                    rf'{RPIService.TAKE_PHOTO_HEADER}]*)')
+# Arduino instructions are a letter (or #) with an optional number of steps, terminated by |. E.g. W3|, P|, #|
+_ARDUINO_INSTRUCTION_REGEX_PATTERN = re.compile(r'([A-Z#])(\d*)\|')
+
+_MAPS_DIRECTORY_PATH = './maps'
+_DEFAULT_ARENA_FILENAME = 'sample_arena_1'
+
+
+def load_arena(filename: str) -> List[List[int]]:
+    """
+    Loads the arena from the map descriptor file in the maps directory
+
+    :param filename: The filename of the arena without the extension
+    :return: The arena decoded from the map descriptor
+    """
+    map_object = Map()
+    p1, p2 = map_object.load_map_from_disk(join(_MAPS_DIRECTORY_PATH, f'{filename}.txt'))
+
+    return map_object.decode_map_descriptor_for_fastest_path_task(p1.strip(), p2.strip())
+
+
+def _convert_sensor_values_to_arduino_format(sensor_values: List[int]) -> str:
+    """
+    Converts the sensor values of the simulator to the Arduino format. None (No obstacle) is sent as 0
+
+    :param sensor_values: The sensor values of the simulator
+    :return: The sensor values separated by spaces
+    """
+    return ' '.join('0' if sensor_value is None else str(sensor_value) for sensor_value in sensor_values)
+
+
+class FakeRPIServer:
+    """
+    Stands in for the RPI and the Arduino. \n
+    Speaks the RPI header protocol over TCP/IP socket and moves a simulated robot on the arena for every Arduino
+    instruction. Every message is delayed by the link latency (plus a random jitter) in each direction. \n
+    After the fastest path indicator, every executed batch of instructions is acknowledged with the number of batches
+    executed so far, until the exploration indicator.
+    """
+    HOST = '127.0.0.1'
+
+    def __init__(self,
+                 arena: List[List[int]],
+                 robot_point: List[int] = ROBOT_START_POINT,
+                 robot_direction: 'Direction' = Direction.EAST,
+                 latency: float = 0,
+                 jitter: float = 0,
+                 false_reading_probability: float = 0,
+                 step_duration: float = 0,
+                 seed: int = None):
+        """
+        :param arena: The arena that the simulated robot explores
+        :param robot_point: The initial position of the simulated robot
+        :param robot_direction: The initial direction of the simulated robot
+        :param latency: The one-way delay of every message in seconds
+        :param jitter: The maximum random delay in seconds added to the latency of every message
+        :param false_reading_probability: The probability that a sensor reports a random distance instead
+        :param step_duration: The time in seconds that the simulated robot takes for every step of a movement
+        :param seed: The seed of the random jitter and false readings
+        """
+        self.robot = SimulatorBot(list(robot_point), arena, robot_direction, update_interval=0)
+        self.latency = latency
+        self.jitter = jitter
+        self.false_reading_probability = false_reading_probability
+        self.step_duration = step_duration
+        self.is_running = False
+        self.is_fastest_path_mode = False
+        self.no_of_fastest_path_batches = 0
+        self.received_messages: List[Tuple[str, str]] = []
+        self.no_of_instructions = Counter()
+
+        self._random = random.Random(seed)
+        self._server_socket = None
+        self._client_socket = None
+        self._arduino_instructions = ''  # Instructions may be split across messages, e.g. long fastest paths
+        self._send_lock = Lock()
+
+    def start(self, host: str = HOST, port: int = 0) -> Tuple[str, int]:
+        """
+        Starts listening for the RPI service on a background thread
+
+        :param host: The host to listen on
+        :param port: The port to listen on. Any free port if 0
+        :return: The host and port that the server is listening on
+        """
+        self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server_socket.bind((host, port))
+        self._server_socket.listen(1)
+        self.is_running = True
+
+        Thread(target=self._serve, daemon=True).start()
+
+        return self._server_socket.getsockname()
+
+    def stop(self) -> None:
+        """
+        Closes the connection and stops the server
+        """
+        self.is_running = False
+
+        for connection in (self._client_socket, self._server_socket):
+            if connection is None:
+                continue
+
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+    @property
+    def is_connected(self) -> bool:
+        return self.is_running and self._client_socket is not None
+
+    def send_message(self, header_type: str, message: str = '') -> None:
+        """
+        Sends the message to the RPI service in the RPI format (HEADER$message), e.g. to start the exploration
+
+        :param header_type: The header of the message
+        :param message: The message to send
+        """
+        sleep(self._get_link_delay())
+
+        try:
+            with self._send_lock:
+                self._client_socket.sendall(f'{header_type}{RPIService.MESSAGE_SEPARATOR}{message}'
+                                            .encode(RPIService.DEFAULT_ENCODING_TYPE))
+        except Exception as e:
+            print_error_log('Fake RPI server is unable to send a message')
+            print_exception_log(e)
+
+    def _add_false_readings(self, sensor_values: List[Optional[int]]) -> List[Optional[int]]:
+        """
+        Replaces some sensor values with a random distance within the range of the sensor, or no obstacle
+
+        :param sensor_values: The sensor values of the simulated robot
+        :return: The sensor values with false readings
+        """
+        noisy_sensor_values = []
+
+        for sensor, sensor_value in zip(self.robot.sensor_offset_points, sensor_values):
+            if self._random.random() < self.false_reading_probability:
+                sensor_value = self._random.choice(list(range(*sensor.get_sensor_range())) + [None])
+
+            noisy_sensor_values.append(sensor_value)
+
+        return noisy_sensor_values
+
+    def _get_link_delay(self) -> float:
+        return self.latency + self._random.uniform(0, self.jitter)
+
+    def _serve(self) -> None:
+        """
+        Accepts a single RPI service and handles its messages until it disconnects
+        """
+        try:
+            self._client_socket, _ = self._server_socket.accept()
+        except OSError:
+            return
+
+        while self.is_running:
+            try:
+                payload = self._client_socket.recv(DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES)
+            except OSError:
+                break
+
+            if not payload:
+                break
+
+            messages = _MESSAGE_REGEX_PATTERN.findall(payload.decode(RPIService.DEFAULT_ENCODING_TYPE))
+
+            for header_type, message in messages:
+                sleep(self._get_link_delay())
+                self.received_messages.append((header_type, message))
+
+                if header_type == RPIService.ARDUINO_HEADER:
+                    self._handle_arduino_instructions(message)
+
+        self.is_running = False
+
+    def _handle_arduino_instructions(self, message: str) -> None:
+        """
+        Executes the complete Arduino instructions received so far
+
+        :param message: The Arduino instructions from the RPI service
+        """
+        self._arduino_instructions += message
+        last_instruction_end = 0
+        has_movement = False
+
+        for instruction in _ARDUINO_INSTRUCTION_REGEX_PATTERN.finditer(self._arduino_instructions):
+            instruction_type, no_of_steps = instruction.groups()
+            last_instruction_end = instruction.end()
+
+            self.no_of_instructions[instruction_type] += 1
+            has_movement |= self._execute_arduino_instruction(instruction_type, int(no_of_steps) if no_of_steps else 1)
+
+        self._arduino_instructions = self._arduino_instructions[last_instruction_end:]
+
+        if self.is_fastest_path_mode and has_movement:
+            self.no_of_fastest_path_batches += 1
+            self.send_message(RPIService.ARDUINO_BUFFER_READY_HEADER, str(self.no_of_fastest_path_batches))
+
+    def _execute_arduino_instruction(self, instruction_type: str, no_of_steps: int) -> bool:
+        """
+        Moves the simulated robot, replies with the sensor values or switches between the fastest path and exploration
+        modes. Calibration instructions are ignored.
+
+        :param instruction_type: The type of the Arduino instruction
+        :param no_of_steps: The number of times to repeat the movement
+        :return: True if the instruction is a movement. Else False
+        """
+        if instruction_type == RPIService.SENSOR_READING_SEND_HEADER[0]:
+            sensor_values = _convert_sensor_values_to_arduino_format(self._add_false_readings(self.robot.sense()))
+            self.send_message(RPIService.SENSOR_READING_RECEIVING_HEADER, sensor_values)
+            return False
+
+        if instruction_type == RPIService.ARDUINO_FASTEST_PATH_INDICATOR[0]:
+            self.is_fastest_path_mode = True
+            self.no_of_fastest_path_batches = 0
+            return False
+
+        if instruction_type == RPIService.ARDUINO_EXPLORATION_INDICATOR[0]:
+            self.is_fastest_path_mode = False
+            return False
+
+        for movement in Movement:
+            if Movement.to_string(movement) != instruction_type:
+                continue
+
+            for _ in range(no_of_steps):
+                sleep(self.step_duration)
+                self.robot.move(movement, invoke_callback=False)
+
+            return True
+
+        return False
+
+
+def run_exploration_benchmark(arena: List[List[int]],
+                              latency: float = 0,
+                              jitter: float = 0,
+                              time_limit: float = None,
+                              profile_path: str = None,
+                              false_reading_probability: float = 0,
+                              use_occupancy_grid: bool = False,
+                              use_view_planning: bool = False,
+                              step_duration: float = 0,
+                              decision_budget: float = None) -> None:
+    """
+    Runs the exploration against the fake RPI server without the GUI and prints the per-move latency and throughput
+
+    :param arena: The arena to explore
+    :param latency: The one-way delay of every message in seconds
+    :param jitter: The maximum random delay in seconds added to the latency of every message
+    :param time_limit: The time limit of the exploration in seconds. No time limit if None
+    :param profile_path: The file to export the timings of the stages of every move to. Not timed if None
+    :param false_reading_probability: The probability that a sensor reports a random distance instead
+    :param use_occupancy_grid: True to fuse the sensor readings in an occupancy grid during the exploration
+    :param use_view_planning: True to explore the unexplored cells by information gain per move
+    :param step_duration: The time in seconds that the simulated robot takes for every step of a movement
+    :param decision_budget: The time in seconds that every decision step of the exploration may take to plan. Not
+                            bounded if None
+    """
+    from algorithms.exploration import Exploration
+    from robot import RealRobot
+
+    fake_rpi_server = FakeRPIServer(arena,
+                                    latency=latency,
+                                    jitter=jitter,
+                                    false_reading_probability=false_reading_probability,
+                                    step_duration=step_duration)
+    host, port = fake_rpi_server.start()
+
+    rpi_service = RPIService()
+    rpi_service.connect_to_rpi(host, port)
+    Thread(target=rpi_service.always_listen_for_instructions, daemon=True).start()
+
+    move_durations = []
+
+    def on_move(movement: 'Movement') -> List[int]:
+        start_time = perf_counter()
+        sensor_values = rpi_service.send_movement_to_rpi_and_get_sensor_values(movement)
+        move_durations.append(perf_counter() - start_time)
+
+        return sensor_values
+
+    map_object = Map()
+    robot = RealRobot(deepcopy(ROBOT_START_POINT),
+                      Direction.EAST,
+                      on_move=on_move,
+                      get_sensor_values=rpi_service.receive_sensor_values)
+    exploration = Exploration(robot,
+                              map_object.explored_map,
+                              map_object.obstacle_map,
+                              on_calibrate=lambda: rpi_service.send_message_with_header_type(
+                                  RPIService.ARDUINO_HEADER, RPIService.CALIBRATE_ROBOT_HEADER),
+                              time_limit=time_limit,
+                              use_occupancy_grid=use_occupancy_grid,
+                              use_view_planning=use_view_planning,
+                              decision_budget=decision_budget)
+
+    if profile_path is not None:
+        span_recorder.enable()
+
+    start_time = perf_counter()
+    exploration.start_exploration()
+    time_taken = perf_counter() - start_time
+
+    if profile_path is not None:
+        span_recorder.disable()
+        span_recorder.export(profile_path)
+
+        for stage, stage_summary in span_recorder.get_summary().items():
+            print_general_log(f'{stage}: {stage_summary["count"]} spans, mean {stage_summary["mean_in_ms"]:.2f} ms, '
+                              f'p95 {stage_summary["p95_in_ms"]:.2f} ms, total {stage_summary["total_in_ms"]:.0f} ms')
+
+    rpi_service.disconnect_rpi()
+    fake_rpi_server.stop()
+
+    if robot.point != fake_rpi_server.robot.point or robot.direction != fake_rpi_server.robot.direction:
+        print_error_log(f'Robot pose {robot.point} {robot.direction.name} does not match the fake RPI server '
+                        f'{fake_rpi_server.robot.point} {fake_rpi_server.robot.direction.name}')
+
+    if len(move_durations) <= 0:
+        print_general_log('No moves made')
+        return
+
+    no_of_phantom_obstacles = sum(obstacle_cell == Cell.OBSTACLE and arena_cell != Cell.OBSTACLE
+                                  for obstacle_row, arena_row in zip(exploration.obstacle_map, arena)
+                                  for obstacle_cell, arena_cell in zip(obstacle_row, arena_row))
+
+    sorted_durations = sorted(move_durations)
+    print_general_log(f'Phantom obstacles on the obstacle map: {no_of_phantom_obstacles}')
+    print_general_log(f'Explored {exploration.coverage * 100:.1f}% with {len(move_durations)} moves in '
+                      f'{time_taken:.2f} s ({len(move_durations) / time_taken:.2f} moves/s)')
+    print_general_log(f'Per move: mean {sum(move_durations) / len(move_durations) * 1000:.1f} ms, '
+                      f'p50 {get_percentile(sorted_durations, 50) * 1000:.1f} ms, '
+                      f'p95 {get_percentile(sorted_durations, 95) * 1000:.1f} ms')
+    print_general_log(f'Arduino instructions: {dict(fake_rpi_server.no_of_instructions)}')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Benchmark the exploration against a fake RPI server')
+    parser.add_argument('--arena', type=str, default=_DEFAULT_ARENA_FILENAME, help='Arena filename in ./maps')
+    parser.add_argument('--latency', type=float, default=0.01, help='One-way link latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.005, help='Maximum link jitter in seconds')
+    parser.add_argument('--time-limit', type=float, default=None, help='Exploration time limit in seconds')
+    parser.add_argument('--false-reading-probability',
+                        type=float,
+                        default=0,
+                        help='Probability that a sensor reports a random distance')
+    parser.add_argument('--step-duration',
+                        type=float,
+                        default=0,
+                        help='Time in seconds that the simulated robot takes for every step of a movement')
+    parser.add_argument('--occupancy-grid', action='store_true', help='Fuse the sensor readings in an occupancy grid')
+    parser.add_argument('--view-planning', action='store_true', help='Explore by information gain per move')
+    parser.add_argument('--decision-budget',
+                        type=float,
+                        default=None,
+                        help='Time in seconds that every decision step of the exploration may take to plan')
+    parser.add_argument('--profile',
+                        type=str,
+                        default=None,
+                        help='Export the timings of the stages of every move to this file (.json or .csv)')
+    parser.add_argument('--serve',
+                        action='store_true',
+                        help='Wait for actual_algorithm_run.py to connect instead of running the benchmark')
+    parser.add_argument('--port', type=int, default=RPIService.PORT, help='Port to listen on with --serve')
+    parser.add_argument('--command',
+                        type=str,
+                        default=RPIService.EXPLORATION_HEADER,
+                        help='Android command sent once connected with --serve, e.g. EXP, IR or FP')
+    arguments = parser.parse_args()
+
+    if not arguments.serve:
+        run_exploration_benchmark(load_arena(arguments.arena),
+                                  arguments.latency,
+                                  arguments.jitter,
+                                  arguments.time_limit,
+                                  arguments.profile,
+                                  arguments.false_reading_probability,
+                                  arguments.occupancy_grid,
+                                  arguments.view_planning,
+                                  arguments.step_duration,
+                                  arguments.decision_budget)
+    else:
+        server = FakeRPIServer(load_arena(arguments.arena),
+                               latency=arguments.latency,
+                               jitter=arguments.jitter,
+                               false_reading_probability=arguments.false_reading_probability,
+                               step_duration=arguments.step_duration)
+        print_general_log(f'Fake RPI server listening on {server.start(port=arguments.port)}')
+
+        while not server.is_connected:
+            sleep(0.1)
+
+        server.send_message(arguments.command)
+
+        while server.is_running:
+            sleep(0.1)
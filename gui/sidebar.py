@@ -5,6 +5,7 @@ from tkinter import ttk
 from algorithms.exploration import Exploration
 from algorithms.fastest_path_solver import AStarAlgorithm
 from algorithms.image_recognition_exploration import ImageRecognitionExploration
+from algorithms.path_cache import PathCache
 from configs.gui_config import SAMPLE_ARENA_OPTIONS
 from utils.constants import ROBOT_START_POINT, ROBOT_END_POINT
 from utils.enums import Direction
@@ -55,7 +56,7 @@ class Sidebar(tk.Frame):
 
         self.arena_widget = arena_widget
         self.exploration_algorithm = None
-        self.fastest_path_solver = AStarAlgorithm(self.arena_widget.arena_map)
+        self.fastest_path_solver = AStarAlgorithm(self.arena_widget.arena_map, PathCache())
 
         self._waypoint_x_input: 'tk.StringVar' = tk.StringVar()
         self._waypoint_y_input: 'tk.StringVar' = tk.StringVar()
@@ -1,11 +1,16 @@
 """
 Contain ImageRecogniser Class
 """
+from typing import List, Optional, Tuple, Union
+
 import cv2
 import matplotlib.pyplot as plt
 import numpy as np
 from detecto import core, utils
 
+_CONFIDENCE_THRESHOLD = 0.7
+_MAX_REGION_SIDE_IN_PIXELS = 480
+
 
 def detecto_test(img_path: str) -> None:
     """
@@ -64,47 +69,124 @@ class ImageRecogniser:
 
         cv2.destroyAllWindows()
 
-    def cv2_predict(self, img_path: str) -> (str, np.ndarray):
+    def cv2_predict(self, img: Union[str, np.ndarray], region: List[float] = None) -> (str, np.ndarray):
         """
         Predicts and draws bounding boxes over the provided image.
-        :param img_path: The input image
+        :param img: The path to the input image or the input image in BGR format
+        :param region: The normalised region (x_min, y_min, x_max, y_max) where the obstacle is expected to appear
         :return: list of items, modified image
         """
+        img = cv2.imread(img) if isinstance(img, str) else img.copy()
+
+        label, score, bound_box = self.predict(img, region)
+
+        if label is not None:
+            self.draw_prediction(img, label, score, bound_box)
+
+        return label, img
+
+    @staticmethod
+    def draw_prediction(img: np.ndarray, label: str, score: float, bound_box: List[int]) -> None:
+        """
+        Draws the bounding box and the label of the prediction over the image in place.
+        :param img: The input image in BGR format
+        :param label: The predicted label
+        :param score: The confidence score of the predicted label
+        :param bound_box: The bounding box of the prediction (x_min, y_min, x_max, y_max)
+        """
         colour = (0, 255, 0)
-        img = utils.read_image(img_path)
 
+        cv2.rectangle(img, (bound_box[0], bound_box[1]), (bound_box[2], bound_box[3]), colour, 2)
+        cv2.putText(img, '{}: {}'.format(label, round(score, 2)), (bound_box[0], bound_box[1] - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, colour, 3)
+
+    def predict(self,
+                img: np.ndarray,
+                region: List[float] = None) -> Tuple[Optional[str], float, Optional[List[int]]]:
+        """
+        Runs the detection on the region of the image where the obstacle is expected to appear.
+        Falls back to the full image if nothing is detected with enough confidence in the region.
+
+        :param img: The input image in BGR format
+        :param region: The normalised region (x_min, y_min, x_max, y_max) where the obstacle is expected to appear
+        :return: The label, score and bounding box in full image coordinates. (None, 0, None) if nothing is detected
+        """
+        if region is not None:
+            label, score, bound_box = self._predict_in_region(img, region)
+
+            if label is not None:
+                return label, score, bound_box
+
+        return self._predict_on_image(img)
+
+    def _predict_in_region(self,
+                           img: np.ndarray,
+                           region: List[float]) -> Tuple[Optional[str], float, Optional[List[int]]]:
+        """
+        Crops and downsizes the region of the image before running the detection on it.
+
+        :param img: The input image in BGR format
+        :param region: The normalised region (x_min, y_min, x_max, y_max) of the image
+        :return: The label, score and bounding box in full image coordinates
+        """
+        height, width = img.shape[:2]
+        x_min, y_min = int(region[0] * width), int(region[1] * height)
+        x_max, y_max = int(region[2] * width), int(region[3] * height)
+
+        if x_max - x_min <= 0 or y_max - y_min <= 0:
+            return None, 0, None
+
+        cropped_img = img[y_min:y_max, x_min:x_max]
+        scale = min(1.0, _MAX_REGION_SIDE_IN_PIXELS / max(cropped_img.shape[:2]))
+
+        if scale < 1.0:
+            cropped_img = cv2.resize(cropped_img, (int(cropped_img.shape[1] * scale),
+                                                   int(cropped_img.shape[0] * scale)),
+                                     interpolation=cv2.INTER_AREA)
+
+        label, score, bound_box = self._predict_on_image(cropped_img)
+
+        if label is None:
+            return None, 0, None
+
+        bound_box = [int(bound_box[0] / scale) + x_min,
+                     int(bound_box[1] / scale) + y_min,
+                     int(bound_box[2] / scale) + x_min,
+                     int(bound_box[3] / scale) + y_min]
+
+        return label, score, bound_box
+
+    def _predict_on_image(self, img: np.ndarray) -> Tuple[Optional[str], float, Optional[List[int]]]:
+        """
+        Runs the detection on the image and picks the widest bounding box with a score above the threshold.
+
+        :param img: The input image in BGR format
+        :return: The label, score and bounding box of the detected symbol. (None, 0, None) if nothing is detected
+        """
         defaults = utils.default_transforms()
-        new_img = defaults(img)
+        new_img = defaults(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
         labels, boxes, scores = self.model.predict(new_img)
 
-        img = cv2.imread(img_path)
-
         scores = scores.tolist()
         boxes = boxes.tolist()
-        img_lab = None
 
-        if len(scores) > 0 and max(scores) > 0.7:
-            index_list = list()
-            for i in range(len(scores)):
-                if scores[i] > 0.7:
-                    index_list.append(i)
+        if len(scores) <= 0 or max(scores) <= _CONFIDENCE_THRESHOLD:
+            return None, 0, None
 
-            size_list = list()
-            for i in index_list:
-                x_width = boxes[i][0] - boxes[i][1]
-                size_list.append(x_width)
+        index_list = list()
+        for i in range(len(scores)):
+            if scores[i] > _CONFIDENCE_THRESHOLD:
+                index_list.append(i)
 
-            max_index = size_list.index(max(size_list))
-            max_index = index_list[max_index]
-            # max_index = scores.index(max(scores))
+        size_list = list()
+        for i in index_list:
+            x_width = boxes[i][0] - boxes[i][1]
+            size_list.append(x_width)
 
-            bound_box = [int(x) for x in boxes[max_index]]
-            label = labels[max_index]
-            score = scores[max_index]
-            cv2.rectangle(img, (bound_box[0], bound_box[1]), (bound_box[2], bound_box[3]), colour, 2)
-            cv2.putText(img, '{}: {}'.format(label, round(score, 2)), (bound_box[0], bound_box[1] - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, colour, 3)
+        max_index = size_list.index(max(size_list))
+        max_index = index_list[max_index]
+        # max_index = scores.index(max(scores))
 
-            img_lab = label
+        bound_box = [int(x) for x in boxes[max_index]]
 
-        return img_lab, img
+        return labels[max_index], scores[max_index], bound_box
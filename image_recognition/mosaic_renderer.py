@@ -0,0 +1,131 @@
+"""
+Contain MosaicRenderer Class
+"""
+from queue import Empty, Queue
+
+import cv2
+import numpy as np
+
+_WINDOW_NAME = 'Detected symbols'
+_ESCAPE_KEY = 27
+_QUEUE_POLL_INTERVAL_IN_SECONDS = 0.1
+
+
+class MosaicRenderer:
+    """
+    Renders the detected images as tiles of a mosaic. \n
+    Images are submitted from any thread and drawn by the thread running the render loop, which owns the canvas.
+    """
+
+    def __init__(self,
+                 no_of_rows: int = 2,
+                 no_of_columns: int = 3,
+                 tile_width: int = 320,
+                 tile_height: int = 240,
+                 headless: bool = False,
+                 output_path: str = None):
+        """
+        :param no_of_rows: The number of rows of tiles in the mosaic
+        :param no_of_columns: The number of columns of tiles in the mosaic
+        :param tile_width: The width of a tile in pixels
+        :param tile_height: The height of a tile in pixels
+        :param headless: True to save the mosaic to disk instead of displaying it in a CV2 window
+        :param output_path: The path to save the mosaic to. Required in headless mode
+        """
+        if headless and output_path is None:
+            raise ValueError('Output path is required in headless mode')
+
+        self.no_of_columns = no_of_columns
+        self.no_of_tiles = no_of_rows * no_of_columns
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.headless = headless
+        self.output_path = output_path
+        self.is_running = False
+
+        # Preallocated once, new images are written into their tile in place
+        self.canvas = np.zeros((no_of_rows * tile_height, no_of_columns * tile_width, 3), dtype=np.uint8)
+        self.no_of_images_rendered = 0
+        self._queue = Queue()
+
+    def submit(self, image: np.ndarray) -> None:
+        """
+        Queues the image to be drawn in the next free tile of the mosaic. Safe to call from any thread.
+
+        :param image: The image in BGR format
+        """
+        self._queue.put(image)
+
+    def run(self) -> None:
+        """
+        Draws the queued images on the mosaic until stopped (or the escape key is pressed in the CV2 window). The images
+        queued before the render loop is stopped are still drawn
+        """
+        self.is_running = True
+
+        while self.is_running:
+            has_new_image = self._draw_queued_images()
+
+            if self.headless:
+                if has_new_image:
+                    cv2.imwrite(self.output_path, self.canvas)
+
+                continue
+
+            cv2.imshow(_WINDOW_NAME, self.canvas)
+
+            if cv2.waitKey(1) == _ESCAPE_KEY:
+                break
+
+        self.is_running = False
+
+        if self._draw_queued_images(timeout=0) and self.headless:
+            cv2.imwrite(self.output_path, self.canvas)
+
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+    def stop(self) -> None:
+        """
+        Stops the render loop
+        """
+        self.is_running = False
+
+    def _draw_queued_images(self, timeout: float = _QUEUE_POLL_INTERVAL_IN_SECONDS) -> bool:
+        """
+        Waits briefly for queued images and draws all of them on the canvas
+
+        :param timeout: The maximum duration to wait for an image in seconds
+        :return: True if any image is drawn. Else False
+        """
+        try:
+            image = self._queue.get(timeout=timeout)
+        except Empty:
+            return False
+
+        while image is not None:
+            self._draw_tile(image)
+
+            try:
+                image = self._queue.get_nowait()
+            except Empty:
+                image = None
+
+        return True
+
+    def _draw_tile(self, image: np.ndarray) -> None:
+        """
+        Resizes the image into the next tile of the canvas, overwriting the oldest tile when the mosaic is full
+
+        :param image: The image in BGR format
+        """
+        tile_index = self.no_of_images_rendered % self.no_of_tiles
+        row, column = divmod(tile_index, self.no_of_columns)
+
+        y = row * self.tile_height
+        x = column * self.tile_width
+
+        self.canvas[y:y + self.tile_height, x:x + self.tile_width] = cv2.resize(image,
+                                                                               (self.tile_width, self.tile_height),
+                                                                               interpolation=cv2.INTER_AREA)
+        self.no_of_images_rendered += 1
@@ -0,0 +1,143 @@
+"""
+Contain RecognitionCache Class
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+_HASH_SIZE = 8
+_DEFAULT_MAX_NO_OF_FACES = 64
+_DEFAULT_MAX_HASH_DISTANCE = 10
+_MAX_NO_OF_HASHES_PER_FACE = 8
+
+
+def compute_difference_hash(img: np.ndarray) -> int:
+    """
+    Computes the 64 bit difference hash (dHash) of the image. Similar images have hashes with small hamming distance.
+
+    :param img: The input image in BGR format
+    :return: The perceptual hash of the image
+    """
+    grey_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    resized_img = cv2.resize(grey_img, (_HASH_SIZE + 1, _HASH_SIZE), interpolation=cv2.INTER_AREA)
+    differences = (resized_img[:, 1:] > resized_img[:, :-1]).flatten()
+
+    return int(''.join('1' if is_brighter else '0' for is_brighter in differences), 2)
+
+
+def get_hamming_distance(first_hash: int, second_hash: int) -> int:
+    return bin(first_hash ^ second_hash).count('1')
+
+
+class _FaceRecord:
+    """
+    Recognition results of all captures of an obstacle face
+    """
+
+    def __init__(self):
+        self.image_hashes: List[int] = []
+        self.label: Optional[str] = None
+        self.score: float = 0
+
+
+class RecognitionCache:
+    """
+    Bounded LRU cache of the recognition results keyed by the obstacle face (obstacle cell, face direction)
+    """
+
+    def __init__(self,
+                 max_no_of_faces: int = _DEFAULT_MAX_NO_OF_FACES,
+                 max_hash_distance: int = _DEFAULT_MAX_HASH_DISTANCE):
+        """
+        :param max_no_of_faces: The maximum number of obstacle faces to keep before evicting the least recently used
+        :param max_hash_distance: The maximum hamming distance for two captures to be considered the same image
+        """
+        self.max_no_of_faces = max_no_of_faces
+        self.max_hash_distance = max_hash_distance
+        self._face_records = OrderedDict()
+        self._lock = Lock()
+
+    def has_similar_image(self, face_key: Hashable, image_hash: int) -> bool:
+        """
+        Determines if a similar capture of the obstacle face has been recognised before
+
+        :param face_key: The (obstacle cell, face direction) of the capture
+        :param image_hash: The perceptual hash of the capture
+        :return: True if recognition can be skipped for the capture. Else False
+        """
+        with self._lock:
+            face_record = self._face_records.get(face_key)
+
+            if face_record is None:
+                return False
+
+            self._face_records.move_to_end(face_key)
+
+            return any(get_hamming_distance(image_hash, cached_hash) <= self.max_hash_distance
+                       for cached_hash in face_record.image_hashes)
+
+    def get_result(self, face_key: Hashable) -> Tuple[Optional[str], float]:
+        """
+        Gets the most confident recognition result of the obstacle face
+
+        :param face_key: The (obstacle cell, face direction) of the capture
+        :return: The label and score of the obstacle face. (None, 0) if the face was not recognised before
+        """
+        with self._lock:
+            face_record = self._face_records.get(face_key)
+
+            if face_record is None:
+                return None, 0
+
+            return face_record.label, face_record.score
+
+    def reconcile(self,
+                  face_key: Hashable,
+                  image_hash: int,
+                  label: Optional[str],
+                  score: float) -> Tuple[Optional[str], Optional[str], float]:
+        """
+        Records the recognition result of a capture and keeps the most confident result across captures of the face.
+        The previous label is read under the same lock, so that concurrent captures of the face each see the label that
+        their result replaces. The hash of a capture with nothing recognised is not kept, so that a later similar
+        capture of the face is still recognised
+
+        :param face_key: The (obstacle cell, face direction) of the capture
+        :param image_hash: The perceptual hash of the capture
+        :param label: The recognised label of the capture. None if nothing is recognised
+        :param score: The confidence score of the recognised label
+        :return: The most confident label of the obstacle face before the capture, and the most confident label and
+                 score of the obstacle face after the capture
+        """
+        with self._lock:
+            face_record = self._face_records.get(face_key)
+
+            if label is None:
+                if face_record is None:
+                    return None, None, 0
+
+                self._face_records.move_to_end(face_key)
+
+                return face_record.label, face_record.label, face_record.score
+
+            if face_record is None:
+                face_record = _FaceRecord()
+                self._face_records[face_key] = face_record
+
+            self._face_records.move_to_end(face_key)
+            previous_label = face_record.label
+
+            face_record.image_hashes.append(image_hash)
+            del face_record.image_hashes[:-_MAX_NO_OF_HASHES_PER_FACE]
+
+            if score > face_record.score:
+                face_record.label = label
+                face_record.score = score
+
+            while len(self._face_records) > self.max_no_of_faces:
+                self._face_records.popitem(last=False)
+
+            return previous_label, face_record.label, face_record.score
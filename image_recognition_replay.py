@@ -0,0 +1,80 @@
+"""
+Replays the images of a capture archive through the image recogniser to benchmark it without the robot
+"""
+from argparse import ArgumentParser
+from collections import Counter
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from image_recognition import ImageRecogniser
+from utils.capture_archive import CaptureArchiveReader
+from utils.logger import print_img_rec_general_log
+from utils.message_conversion import decode_photo_request
+from utils.timing import get_percentile
+
+_CLASSES_TEXT_PATH = './image_recognition/classes.txt'
+_MODEL_WEIGHTS_PATH = './image_recognition/model_weights4.pth'
+
+
+def replay_capture_archive(archive_path: str,
+                           image_recogniser: 'ImageRecogniser',
+                           use_region: bool = True,
+                           limit: int = None) -> None:
+    """
+    Runs the recogniser on every image of the archive as fast as possible and prints the timing summary
+
+    :param archive_path: The path of the capture archive
+    :param image_recogniser: The recogniser to benchmark
+    :param use_region: True to crop to the region in the photo request (if any). Else use the full image
+    :param limit: The maximum number of images to replay. Replays all images if None
+    """
+    archive_reader = CaptureArchiveReader(archive_path)
+    durations = []
+    labels = Counter()
+
+    no_of_images = len(archive_reader) if limit is None else min(limit, len(archive_reader))
+
+    # The records are read by index, so that no record past the limit holds a view into the memory map on close
+    for i in range(no_of_images):
+        record = archive_reader[i]
+        photo_request = decode_photo_request(record.photo_request)
+        region = photo_request['region'] if use_region else None
+
+        start_time = perf_counter()
+
+        with record.image_bytes as image_bytes:
+            img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+        label, score, _ = image_recogniser.predict(img, region)
+        durations.append(perf_counter() - start_time)
+
+        labels[label] += 1
+        print_img_rec_general_log(f'Image {i}: {label} ({score:.2f}) in {durations[-1] * 1000:.1f} ms '
+                                  f'for photo request {record.photo_request}')
+
+    archive_reader.close()
+
+    if len(durations) <= 0:
+        print_img_rec_general_log('No images in the capture archive')
+        return
+
+    sorted_durations = sorted(durations)
+    print_img_rec_general_log(f'Replayed {len(durations)} images in {sum(durations):.2f} s '
+                              f'(mean {sum(durations) / len(durations) * 1000:.1f} ms, '
+                              f'p50 {get_percentile(sorted_durations, 50) * 1000:.1f} ms, '
+                              f'p95 {get_percentile(sorted_durations, 95) * 1000:.1f} ms)')
+    print_img_rec_general_log(f'Labels: {dict(labels)}')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Replay a capture archive through the image recogniser')
+    parser.add_argument('archive_path', type=str, help='Path to the capture archive (.bin)')
+    parser.add_argument('--weights', type=str, default=_MODEL_WEIGHTS_PATH, help='Path to the model weights')
+    parser.add_argument('--full-image', action='store_true', help='Ignore the regions in the photo requests')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum number of images to replay')
+    arguments = parser.parse_args()
+
+    recogniser = ImageRecogniser(_CLASSES_TEXT_PATH, arguments.weights)
+    replay_capture_archive(arguments.archive_path, recogniser, not arguments.full_image, arguments.limit)
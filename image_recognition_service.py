@@ -4,18 +4,29 @@ Contain class for image recognition service
 import socket
 import struct
 import time
-from threading import Thread
+from datetime import datetime
+from os import makedirs
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 
 from image_recognition import ImageRecogniser
+from image_recognition.mosaic_renderer import MosaicRenderer
+from image_recognition.recognition_cache import RecognitionCache, compute_difference_hash
 from rpi_service import RPIService
+from utils.arguments_constructor import get_image_recognition_service_parser
+from utils.capture_archive import CaptureArchiveWriter
 from utils.constants import DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES
+from utils.enums import Direction
 from utils.logger import print_img_rec_error_log, print_img_rec_general_log, print_img_rec_exception_log
+from utils.message_conversion import decode_photo_request
 
 _DEFAULT_IMAGE_PATH = './image_recognition/Picture.jpg'
 _CLASSES_TEXT_PATH = './image_recognition/classes.txt'
 _MODEL_WEIGHTS_PATH = './image_recognition/model_weights4.pth'
+_MOSAIC_OUTPUT_PATH = './image_recognition/Mosaic.jpg'
+_CAPTURE_ARCHIVE_DIRECTORY_PATH = './image_recognition/captures'
 
 
 class ImageRecognitionService:
@@ -28,13 +39,18 @@ class ImageRecognitionService:
     ANDROID_HEADER = 'a'
     ALGORITHM_HEADER = ''
 
-    def __init__(self):
+    def __init__(self, headless: bool = False):
+        """
+        :param headless: True to save the detected images to disk instead of displaying them in a CV2 window
+        """
         self.rpi_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.is_connected = False
         self.image_recogniser = ImageRecogniser(_CLASSES_TEXT_PATH, _MODEL_WEIGHTS_PATH)
-        self.image = None
-        self.img_count = 0
-        self.label_list = list(str)
+        self.mosaic_renderer = MosaicRenderer(headless=headless, output_path=_MOSAIC_OUTPUT_PATH)
+        self.capture_archive = self._create_capture_archive()
+        self.label_list: List[str] = []
+        self.recognition_cache = RecognitionCache()
+        self._label_lock = Lock()  # Orders the updates of the labels and the messages to Android across recognitions
 
     def connect_to_rpi(self, host: str = HOST, port: int = PORT):
         """
@@ -105,19 +121,10 @@ class ImageRecognitionService:
 
     def display_image(self):
         """
-        Displays found images in a CV2 window
+        Displays found images in a CV2 window (or saves them to disk in headless mode) until the escape key is pressed
         @return: None
         """
-        while True:
-            if self.image is None:
-                time.sleep(5)
-                continue
-            cv2.imshow("{}".format(int(self.img_count / 5)), self.image)
-            k = cv2.waitKey(1)
-            if k == 27:
-                break
-
-        cv2.destroyAllWindows()
+        self.mosaic_renderer.run()
 
     def receive_image(self,
                       image_path: str = _DEFAULT_IMAGE_PATH,
@@ -147,60 +154,116 @@ class ImageRecognitionService:
             robot_pos = self.rpi_server.recv(buffer_size)
             robot_str = robot_pos.decode('utf-8')
             print_img_rec_general_log("Received robot position: {}".format(robot_str))
+            self.capture_archive.append(time.time(), robot_str, image_bytes)
         return robot_str
 
+    @staticmethod
+    def _create_capture_archive() -> 'CaptureArchiveWriter':
+        """
+        Creates the archive to keep every image received in this run for replaying offline
+
+        :return: The writer of the capture archive
+        """
+        makedirs(_CAPTURE_ARCHIVE_DIRECTORY_PATH, exist_ok=True)
+        datetime_now_in_string = datetime.now().strftime('%Y-%m-%d_%H_%M_%S')
+
+        return CaptureArchiveWriter(f'{_CAPTURE_ARCHIVE_DIRECTORY_PATH}/{datetime_now_in_string}.bin')
+
     def image_recognition(self, robot_str: str, img_path: str = _DEFAULT_IMAGE_PATH):
         """
         Decodes the base64 image recognition string and runs the object detection on it
-        Multi-threaded due to low prediction speed
+        Multi-threaded due to low prediction speed \n
+        When a more confident label replaces the label of an obstacle face sent earlier, the new label is sent to
+        Android for the same obstacle, which replaces the symbol shown on the obstacle
 
         @param img_path: The path to the image to read
         @param robot_str: The string containing the robot's position and direction
         """
         print_img_rec_general_log('Starting image recognition.')
 
-        label, new_image = self.image_recogniser.cv2_predict(img_path)
-
-        print_img_rec_general_log('Image recognition finished.')
+        photo_request = decode_photo_request(robot_str)
+        face_key = self._get_face_key(photo_request)
+        img = cv2.imread(img_path)
 
-        if label is None:
-            print('No symbol detected.')
+        if img is None:
+            print_img_rec_error_log(f'Unable to read the image for photo request {robot_str}')
             return
-        elif label in self.label_list:
-            print('Symbol already detected.')
+
+        image_hash = compute_difference_hash(img)
+
+        if face_key is not None and self.recognition_cache.has_similar_image(face_key, image_hash):
+            print_img_rec_general_log('Obstacle face already recognised. Skipping image recognition.')
             return
 
-        resize_val = 0.5
-        new_image = cv2.resize(new_image, (int(new_image.shape[1] * resize_val), int(new_image.shape[0] * resize_val)))
+        label, score, bound_box = self.image_recogniser.predict(img, photo_request['region'])
 
-        if self.image is None:
-            self.image = new_image
-        else:
-            self.image = cv2.hconcat([new_image, self.image])
-        self.img_count += 1
+        print_img_rec_general_log('Image recognition finished.')
+
+        with self._label_lock:
+            is_correction = False
+
+            if face_key is not None:
+                previous_label, reconciled_label, _ = self.recognition_cache.reconcile(face_key, image_hash, label,
+                                                                                       score)
+
+                if reconciled_label != label:
+                    print_img_rec_general_log('Keeping the more confident symbol detected earlier for this obstacle '
+                                              'face.')
+                    return
+
+                if previous_label is not None and previous_label != label:
+                    print_img_rec_general_log(f'Replacing {previous_label} with the more confident {label}.')
+                    is_correction = True
+
+                    if previous_label in self.label_list:
+                        self.label_list.remove(previous_label)
+
+            if label is None:
+                print('No symbol detected.')
+                return
+            elif label in self.label_list and not is_correction:
+                print('Symbol already detected.')
+                return
 
-        if self.img_count % 5 == 0:
-            self.image = None
+            if label not in self.label_list:
+                self.label_list.append(label)
 
-        self.label_list.append(label)
+            # IMAGE ID X Y
+            x, y = photo_request['point']
+            img_str = "IMAGE {} {} {}".format(label.split("_")[0], x, y)
 
-        # IMAGE ID X Y
-        x, y = robot_str.split(",")
-        label = label.split("_")[0]
-        img_str = "IMAGE {} {} {}".format(label, x, y)
+            # Sent while holding the lock, so that a correction always reaches Android after the label it replaces
+            print_img_rec_general_log('Sending image location: {}.'.format(img_str))
+            self.send_message_with_header_type(ImageRecognitionService.ANDROID_HEADER, img_str)
 
-        print_img_rec_general_log('Sending image location: {}.'.format(img_str))
-        self.send_message_with_header_type(ImageRecognitionService.ANDROID_HEADER, img_str)
+            if len(self.label_list) > 5:
+                self.send_message_with_header_type(ImageRecognitionService.ALGORITHM_HEADER,
+                                                   RPIService.ANDROID_QUIT_HEADER + RPIService.MESSAGE_SEPARATOR)
 
-        if len(self.label_list) > 5:
-            self.send_message_with_header_type(ImageRecognitionService.ALGORITHM_HEADER,
-                                               RPIService.ANDROID_QUIT_HEADER + RPIService.MESSAGE_SEPARATOR)
+        self.image_recogniser.draw_prediction(img, label, score, bound_box)
+        self.mosaic_renderer.submit(img)
 
         print_img_rec_general_log('Symbol location sent.')
 
+    @staticmethod
+    def _get_face_key(photo_request: Dict) -> Optional[Tuple[Tuple[int, int], 'Direction']]:
+        """
+        Gets the key of the photographed obstacle face for the recognition cache
+
+        :param photo_request: The decoded photo request
+        :return: The (obstacle cell, face direction) of the photo. None if the face direction is not given
+        """
+        if photo_request['face'] is None:
+            return None
+
+        x, y = photo_request['point']
+
+        return (int(x), int(y)), photo_request['face']
+
 
 if __name__ == '__main__':
-    image_recognition_service = ImageRecognitionService()
+    arguments = get_image_recognition_service_parser()
+    image_recognition_service = ImageRecognitionService(arguments.headless)
 
     image_recognition_service.connect_to_rpi()
     Thread(target=image_recognition_service.check_for_image, daemon=True).start()
@@ -106,7 +106,7 @@ class Map:
     def set_virtual_walls_on_map(virtual_arena: List[int], explored_arena: List[int] = None) -> None:
         """
         Pads virtual wall around obstacles and the surrounding of the area.
-        Used for fastest path
+        Used for fastest path. The arena can be larger than the 20 x 15 arena
         """
         Map._set_virtual_wall_around_arena(virtual_arena)
         Map._set_virtual_walls_around_obstacles(virtual_arena)
@@ -123,19 +123,22 @@ class Map:
 
         :param arena: The arena to pad virtual wall
         """
-        for x in range(constants.ARENA_WIDTH):
+        height = len(arena)
+        width = len(arena[0])
+
+        for x in range(width):
             if arena[0][x] != 1:
                 arena[0][x] = Cell.VIRTUAL_WALL.value
 
-            if arena[constants.ARENA_HEIGHT - 1][x] != 1:
-                arena[constants.ARENA_HEIGHT - 1][x] = Cell.VIRTUAL_WALL.value
+            if arena[height - 1][x] != 1:
+                arena[height - 1][x] = Cell.VIRTUAL_WALL.value
 
-        for y in range(constants.ARENA_HEIGHT):
+        for y in range(height):
             if arena[y][0] != 1:
                 arena[y][0] = Cell.VIRTUAL_WALL.value
 
-            if arena[y][constants.ARENA_WIDTH - 1] != 1:
-                arena[y][constants.ARENA_WIDTH - 1] = Cell.VIRTUAL_WALL.value
+            if arena[y][width - 1] != 1:
+                arena[y][width - 1] = Cell.VIRTUAL_WALL.value
 
     @staticmethod
     def _set_virtual_walls_around_obstacles(arena: List[int]) -> None:
@@ -144,37 +147,24 @@ class Map:
 
         :param arena: The arena to pad virtual wall
         """
-        for row in range(constants.ARENA_HEIGHT):
-            for column in range(constants.ARENA_WIDTH):
+        for row in range(len(arena)):
+            for column in range(len(arena[0])):
                 if arena[row][column] == Cell.OBSTACLE:
                     Map._pad_obstacle_surrounding_with_virtual_wall(arena, row, column)
 
     @staticmethod
     def _pad_obstacle_surrounding_with_virtual_wall(arena: List[int], row: int, column: int) -> None:
-        # north
-        if is_within_arena_range(row - 1, column) and arena[row - 1][column] == 0:
-            arena[row - 1][column] = Cell.VIRTUAL_WALL.value
-        # south
-        if is_within_arena_range(row + 1, column) and arena[row + 1][column] == 0:
-            arena[row + 1][column] = Cell.VIRTUAL_WALL.value
-        # east
-        if is_within_arena_range(row, column + 1) and arena[row][column + 1] == 0:
-            arena[row][column + 1] = Cell.VIRTUAL_WALL.value
-        # west
-        if is_within_arena_range(row, column - 1) and arena[row][column - 1] == 0:
-            arena[row][column - 1] = Cell.VIRTUAL_WALL.value
-        # north east
-        if is_within_arena_range(row - 1, column + 1) and arena[row - 1][column + 1] == 0:
-            arena[row - 1][column + 1] = Cell.VIRTUAL_WALL.value
-        # north west
-        if is_within_arena_range(row - 1, column - 1) and arena[row - 1][column - 1] == 0:
-            arena[row - 1][column - 1] = Cell.VIRTUAL_WALL.value
-        # south east
-        if is_within_arena_range(row + 1, column + 1) and arena[row + 1][column + 1] == 0:
-            arena[row + 1][column + 1] = Cell.VIRTUAL_WALL.value
-        # south west
-        if is_within_arena_range(row + 1, column - 1) and arena[row + 1][column - 1] == 0:
-            arena[row + 1][column - 1] = Cell.VIRTUAL_WALL.value
+        height = len(arena)
+        width = len(arena[0])
+
+        # north, south, east, west, north east, north west, south east and south west
+        for row_offset, column_offset in [(-1, 0), (1, 0), (0, 1), (0, -1), (-1, 1), (-1, -1), (1, 1), (1, -1)]:
+            neighbour_row = row + row_offset
+            neighbour_column = column + column_offset
+
+            if 0 <= neighbour_row < height and 0 <= neighbour_column < width and \
+                    arena[neighbour_row][neighbour_column] == 0:
+                arena[neighbour_row][neighbour_column] = Cell.VIRTUAL_WALL.value
 
     @staticmethod
     def _set_unexplored_cell_as_virtual_wall(virtual_arena, explored_arena) -> None:
@@ -185,8 +175,8 @@ class Map:
         :param explored_arena: The explored arena
         :return:
         """
-        for row in range(constants.ARENA_HEIGHT):
-            for column in range(constants.ARENA_WIDTH):
+        for row in range(len(virtual_arena)):
+            for column in range(len(virtual_arena[0])):
                 if explored_arena[row][column] != Cell.UNEXPLORED:
                     continue
 
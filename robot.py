@@ -1,5 +1,5 @@
 from time import sleep
-from typing import Callable, List, Union, Tuple, Optional
+from typing import Callable, Dict, List, Union, Tuple, Optional
 
 from utils.constants import ARENA_HEIGHT, ARENA_WIDTH, ROBOT_START_POINT
 from utils.enums import Cell, Direction, Movement
@@ -43,6 +43,7 @@ class Robot:
             Sensor(True, [1, 1], Direction.EAST),
             Sensor(True, [-1, 1], Direction.EAST)
         ]
+        self.sensor_rays = build_sensor_ray_table(self.sensor_offset_points)
 
     @property
     def speed(self):
@@ -219,20 +220,27 @@ class SimulatorBot(Robot):
 
         :return: List of neighbouring points from the robot that can be explored or contains obstacles
         """
-        may_contain_obstacles = []
+        return self.sense_at(self.point, self.direction)
+
+    def sense_at(self, point: List[int], direction: 'Direction') -> List[Union[None, int]]:
+        """
+        Determines the sensor values of the robot if it is at the pose, without moving the robot.
 
-        for sensor in self.sensor_offset_points:
-            direction_vector = Direction.get_direction_offset(sensor.get_current_direction(self.direction))
-            sensor_point = sensor.get_current_point(self.point, self.direction)
-            sensor_range = sensor.get_sensor_range()
+        :param point: The position of the robot
+        :param direction: The direction of the robot
+        :return: List of neighbouring points from the robot that can be explored or contains obstacles
+        """
+        may_contain_obstacles = []
+        robot_row, robot_column = point
 
-            for i in range(1, sensor_range[1]):
-                point_to_check = [sensor_point[0] + i * direction_vector[0], sensor_point[1] + i * direction_vector[1]]
+        for sensor_ray in self.sensor_rays[direction]:
+            for i, (row_offset, column_offset) in enumerate(sensor_ray.cell_offsets, 1):
+                row = robot_row + row_offset
+                column = robot_column + column_offset
 
-                if not (0 <= point_to_check[0] < ARENA_HEIGHT) or \
-                        not (0 <= point_to_check[1] < ARENA_WIDTH) or \
-                        self.reference_map[point_to_check[0]][point_to_check[1]] == Cell.OBSTACLE:
-                    if i < sensor_range[0]:
+                if not (0 <= row < ARENA_HEIGHT) or not (0 <= column < ARENA_WIDTH) or \
+                        self.reference_map[row][column] == Cell.OBSTACLE:
+                    if i < sensor_ray.sensor_range[0]:
                         # If the sensor detection is not within the sensor range
                         may_contain_obstacles.append(-1)
                     else:
@@ -245,6 +253,75 @@ class SimulatorBot(Robot):
 
         return may_contain_obstacles
 
+    def sense_at_poses(self, poses: List[Tuple[List[int], 'Direction']]) -> List[List[Union[None, int]]]:
+        """
+        Determines the sensor values at every pose in one call, e.g. for bulk simulations on the same arena. \n
+        The distance to the first obstacle from every cell in every direction is computed once for the arena, so that
+        every sensor value is a lookup at the sensor's cell instead of a walk along the ray. Faster than sense_at from
+        about a hundred poses.
+
+        :param poses: The list of positions and directions of the robot
+        :return: The sensor values at every pose
+        """
+        distances_to_obstacle = self.get_distances_to_obstacle()
+        sensor_values_at_poses = []
+
+        for point, direction in poses:
+            robot_row, robot_column = point
+
+            # The sensors are on the robot, so they are all in the arena if the robot is
+            if not (1 <= robot_row <= ARENA_HEIGHT - 2) or not (1 <= robot_column <= ARENA_WIDTH - 2):
+                sensor_values_at_poses.append(self.sense_at(point, direction))
+                continue
+
+            sensor_values = []
+
+            for sensor_ray in self.sensor_rays[direction]:
+                distance = distances_to_obstacle[sensor_ray.direction_offset][robot_row + sensor_ray.point_offset[0]][
+                    robot_column + sensor_ray.point_offset[1]]
+
+                if distance >= sensor_ray.sensor_range[1]:
+                    sensor_values.append(None)
+                elif distance < sensor_ray.sensor_range[0]:
+                    sensor_values.append(-1)
+                else:
+                    sensor_values.append(distance)
+
+            sensor_values_at_poses.append(sensor_values)
+
+        return sensor_values_at_poses
+
+    def get_distances_to_obstacle(self) -> Dict[Tuple[int, int], List[List[int]]]:
+        """
+        Determines the distance from every cell to the first obstacle or wall in every direction, in one pass over the
+        arena per direction
+
+        :return: The distances indexed by the direction offset, the row and the column. The distance starts from 1
+        """
+        distances_to_obstacle = {}
+
+        for row_offset, column_offset in (Direction.get_direction_offset(direction) for direction in
+                                          (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)):
+            distances = [[0] * ARENA_WIDTH for _ in range(ARENA_HEIGHT)]
+
+            # The next cell in the direction is visited before the cell
+            rows = range(ARENA_HEIGHT) if row_offset <= 0 else range(ARENA_HEIGHT - 1, -1, -1)
+            columns = range(ARENA_WIDTH) if column_offset <= 0 else range(ARENA_WIDTH - 1, -1, -1)
+
+            for row in rows:
+                for column in columns:
+                    next_row, next_column = row + row_offset, column + column_offset
+
+                    if not (0 <= next_row < ARENA_HEIGHT) or not (0 <= next_column < ARENA_WIDTH) or \
+                            self.reference_map[next_row][next_column] == Cell.OBSTACLE:
+                        distances[row][column] = 1
+                    else:
+                        distances[row][column] = distances[next_row][next_column] + 1
+
+            distances_to_obstacle[(row_offset, column_offset)] = distances
+
+        return distances_to_obstacle
+
 
 class Sensor:
     """
@@ -306,6 +383,41 @@ class Sensor:
             return point[0] - self.point[1], point[1] - self.point[0]
 
 
+class SensorRay:
+    """
+    The ray of a sensor when the robot faces a direction, relative to the robot's position
+    """
+    __slots__ = ('point_offset', 'direction_offset', 'sensor_range', 'cell_offsets')
+
+    def __init__(self, sensor: 'Sensor', robot_direction: 'Direction'):
+        """
+        :param sensor: The sensor on the robot
+        :param robot_direction: The direction of the robot
+        """
+        self.point_offset: Tuple[int, int] = sensor.get_current_point([0, 0], robot_direction)
+        self.direction_offset: Tuple[int, int] = tuple(
+            Direction.get_direction_offset(sensor.get_current_direction(robot_direction)))
+        self.sensor_range: List[int] = sensor.get_sensor_range()
+
+        # Offsets of the cells at distance 1, 2, ... from the sensor, up to the upper bound of the sensor range
+        self.cell_offsets: List[Tuple[int, int]] = [(self.point_offset[0] + i * self.direction_offset[0],
+                                                     self.point_offset[1] + i * self.direction_offset[1])
+                                                    for i in range(1, self.sensor_range[1])]
+
+
+def build_sensor_ray_table(sensors: List['Sensor']) -> Dict['Direction', List['SensorRay']]:
+    """
+    Precomputes the rays of the sensors for every direction that the robot can face,
+    so that sensing does not recompute the sensor positions and directions on every move. \n
+    Must be rebuilt if the sensors are changed.
+
+    :param sensors: The sensors on the robot
+    :return: The sensor rays indexed by the direction of the robot, in the same order as the sensors
+    """
+    return {direction: [SensorRay(sensor, direction) for sensor in sensors]
+            for direction in (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)}
+
+
 if __name__ == '__main__':
     from map import Map
 
@@ -1,19 +1,24 @@
 """
 Contain classes for RPI server connection
 """
+import re
 import socket
 from collections import deque
-from threading import Thread
-from time import sleep
-from typing import Callable, List, Tuple, Union
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from typing import Callable, List, Optional, Tuple, Union
 
 from utils.constants import DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES
-from utils.enums import Movement
+from utils.enums import Direction, Movement
 from utils.logger import print_error_log, print_general_log, print_exception_log
-from utils.message_conversion import validate_and_convert_sensor_values_from_arduino
+from utils.message_conversion import encode_photo_request, validate_and_convert_sensor_values_from_arduino
+from utils.timing import span_recorder
 
 _THREAD_SLEEP_DURATION_IN_SECONDS = 0.1
 
+# The messages are not delimited, so a message may be followed by the next one, e.g. 2B$3 for two acknowledgements
+_NO_OF_BATCHES_REGEX_PATTERN = re.compile(r'\d+')
+
 
 class RPIService:
     """
@@ -31,11 +36,13 @@ class RPIService:
     ANDROID_MDF_STRING_HEADER = 'MDF'
 
     WAYPOINT_HEADER = 'WP'
+    ADD_WAYPOINT_HEADER = 'AWP'  # Adds a way point to visit after the WP way point, in the fastest order
     NEW_ROBOT_POSITION_HEADER = 'START'
     ANDROID_FASTEST_PATH_HEADER = 'FP'
     ARDUINO_FASTEST_PATH_INDICATOR = 'F|'
     ARDUINO_EXPLORATION_INDICATOR = 'E|'
     ARDUINO_MOVE_FORWARD_AT_HOME_INDICATOR = 'T|'
+    ARDUINO_BUFFER_READY_HEADER = 'B'  # Followed by the number of fastest path batches that the Arduino has executed
 
     ANDROID_QUIT_HEADER = 'Q'
     ARDUINO_QUIT_HEADER = '#|'
@@ -52,6 +59,7 @@ class RPIService:
         self.is_connected = False
         self.on_quit = on_quit if on_quit is not None else lambda: None
         self._fifo_queue = deque([])
+        self._send_lock = Lock()  # Photos are requested from a separate thread
 
     def connect_to_rpi(self, host: str = HOST, port: int = PORT) -> None:
         """
@@ -79,18 +87,23 @@ class RPIService:
             print_error_log('Unable to close connection to rpi service')
             print_exception_log(e)
 
-    def _send_message(self, payload: str) -> None:
+    def _send_message(self, payload: str) -> bool:
         """
         Sends the payload to the RPI
 
         :param payload: Message to send
+        :return: True if the message is sent successfully. Else False
         """
         try:
-            self.rpi_server.sendall(str.encode(payload))
+            with self._send_lock, span_recorder.span('rpi_send'):
+                self.rpi_server.sendall(str.encode(payload))
+
             print_general_log(f'Message sent successfully! {payload}')
+            return True
         except Exception as e:
             print_error_log('Unable to send a message to RPI')
             print_exception_log(e)
+            return False
 
     def _receive_message(self, buffer_size: int = DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES) -> str:
         """
@@ -110,19 +123,20 @@ class RPIService:
             print_error_log('Unable to receive a message from RPI')
             print_exception_log(e)
 
-    def send_message_with_header_type(self, header_type: str, payload: str = None):
+    def send_message_with_header_type(self, header_type: str, payload: str = None) -> bool:
         """
         Concatenate the payload to header type and sends the message to the RPI
 
         :param header_type: Accepted headers established in the RPI class for RPI communication
         :param payload: Message to send to the RPI
+        :return: True if the message is sent successfully. Else False
         """
         full_payload = header_type
 
         if payload is not None:
             full_payload += payload
 
-        self._send_message(full_payload)
+        return self._send_message(full_payload)
 
     def get_message_from_rpi_queue(self) -> Tuple[str, str]:
         """
@@ -154,6 +168,58 @@ class RPIService:
 
         return header_type, message
 
+    def wait_for_message(self, header_type: str, timeout: float) -> Optional[str]:
+        """
+        Gets messages from the RPI queue until a message with the header type is received. \n
+        The messages with other header types are discarded.
+
+        :param header_type: The header of the message to wait for
+        :param timeout: The maximum time to wait in seconds
+        :return: The message. None if the time out is reached first
+        """
+        end_time = perf_counter() + timeout
+
+        while perf_counter() < end_time:
+            message_header_type, message = self.get_message_from_rpi_queue()
+
+            if message_header_type == header_type:
+                return message
+
+        return None
+
+    def stream_instruction_batches(self,
+                                   instruction_batches: List[str],
+                                   no_of_batches_ahead: int = 1,
+                                   acknowledgement_timeout: float = 7) -> None:
+        """
+        Sends the batches of Arduino instructions of the fastest path, as soon as the Arduino has space for them. \n
+        The Arduino acknowledges every executed batch with the number of batches executed so far, so at most
+        no_of_batches_ahead batches are sent but not yet executed. If no acknowledgement arrives within the time out,
+        the oldest batch is assumed to be executed, as with a fixed delay between the batches.
+
+        :param instruction_batches: The batches of Arduino instructions, from check_and_separate_long_instructions
+        :param no_of_batches_ahead: The number of batches that the Arduino can buffer
+        :param acknowledgement_timeout: The maximum time to wait for the acknowledgement of a batch in seconds
+        """
+        no_of_batches_executed = 0
+
+        for batch_index, instruction_batch in enumerate(instruction_batches):
+            while batch_index - no_of_batches_executed >= no_of_batches_ahead:
+                message = self.wait_for_message(RPIService.ARDUINO_BUFFER_READY_HEADER, acknowledgement_timeout)
+
+                if message is None:
+                    print_error_log(f'No acknowledgement of batch {no_of_batches_executed + 1} from Arduino')
+                    no_of_batches_executed += 1
+                    continue
+
+                no_of_batches = _NO_OF_BATCHES_REGEX_PATTERN.match(message)
+
+                # The count is cumulative, so a count that is lost is made up by the next one
+                if no_of_batches is not None:
+                    no_of_batches_executed = max(no_of_batches_executed, int(no_of_batches.group()))
+
+            self.send_message_with_header_type(RPIService.ARDUINO_HEADER, instruction_batch)
+
     def send_movement_to_rpi_and_get_sensor_values(self, movement: 'Movement') -> List[Union[None, int]]:
         """
         Sends the movement from exploration computation, the robot's position and direction to the RPI
@@ -176,32 +242,45 @@ class RPIService:
         :return: List of neighbouring points from the robot that it can explore or contains obstacles
         """
         if start_sensing:
-            sleep(0.3)
+            with span_recorder.span('sensor_request_delay'):
+                sleep(0.3)
+
             self.send_message_with_header_type(RPIService.ARDUINO_HEADER, RPIService.SENSOR_READING_SEND_HEADER)
 
-        while True:
-            message_header_type, message = self.get_message_from_rpi_queue()
+        with span_recorder.span('sensor_reply_wait'):
+            while True:
+                message_header_type, message = self.get_message_from_rpi_queue()
 
-            if message_header_type == RPIService.ANDROID_QUIT_HEADER:
-                self.on_quit()
-                return []
+                if message_header_type == RPIService.ANDROID_QUIT_HEADER:
+                    self.on_quit()
+                    return []
 
-            if message_header_type != RPIService.SENSOR_READING_RECEIVING_HEADER:
-                continue
+                if message_header_type == RPIService.SENSOR_READING_RECEIVING_HEADER:
+                    break
 
+        with span_recorder.span('sensor_parse'):
             sensor_values = validate_and_convert_sensor_values_from_arduino(message)
 
-            return sensor_values
+        return sensor_values
 
-    def take_photo(self, obstacle_point: List[int]) -> None:
+    def take_photo(self,
+                   obstacle_point: List[int],
+                   region: List[float] = None,
+                   face_direction: 'Direction' = None,
+                   robot_point: List[int] = None,
+                   robot_direction: 'Direction' = None) -> bool:
         """
         Sends the instruction to the RPI to take a photo.
         :param obstacle_point: Nearest obstacle from the robot
+        :param region: The normalised region of the photo where the obstacle is expected to appear
+        :param face_direction: The face of the obstacle that is photographed
+        :param robot_point: The position of the robot when the photo is taken
+        :param robot_direction: The direction of the robot when the photo is taken
+        :return: True if the instruction is sent successfully. Else False
         """
-        row, column = obstacle_point
-        payload = f'{row},{column}'
+        payload = encode_photo_request(obstacle_point, region, face_direction, robot_point, robot_direction)
 
-        self.send_message_with_header_type(RPIService.TAKE_PHOTO_HEADER, payload)
+        return self.send_message_with_header_type(RPIService.TAKE_PHOTO_HEADER, payload)
 
     def always_listen_for_instructions(self):
         """
@@ -0,0 +1,108 @@
+"""
+Contain tests for the bidirectional search of the fastest path
+"""
+import random
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm
+from map import Map, SAMPLE_ARENA
+from utils.constants import ROBOT_END_POINT, ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement, SearchMode
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+def _get_random_arena(size, obstacle_ratio, random_generator):
+    arena = [[Cell.OBSTACLE.value if random_generator.random() < obstacle_ratio else Cell.FREE_AREA.value
+              for _ in range(size)] for _ in range(size)]
+
+    for i in range(size):
+        arena[0][i] = arena[size - 1][i] = arena[i][0] = arena[i][size - 1] = Cell.VIRTUAL_WALL.value
+
+    return arena
+
+
+class BidirectionalSearchTest(unittest.TestCase):
+    def test_path_goes_through_the_way_point_on_free_cells(self):
+        arena = _get_virtual_arena()
+        solver = AStarAlgorithm(arena, search_mode=SearchMode.BIDIRECTIONAL)
+
+        path = solver.run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+        points_of_path = [node.point for node in path]
+
+        self.assertIn([11, 2], points_of_path)
+        self.assertEqual(ROBOT_END_POINT, points_of_path[-1])
+
+        for previous_node, node in zip(path, path[1:]):
+            self.assertEqual(1, abs(previous_node.point[0] - node.point[0]) + abs(previous_node.point[1] -
+                                                                                   node.point[1]))
+            self.assertEqual(Cell.FREE_AREA, arena[node.point[0]][node.point[1]])
+            self.assertIs(previous_node, node.parent_node)
+
+    def test_movements_have_the_cost_of_the_path(self):
+        solver = AStarAlgorithm(_get_virtual_arena(), search_mode=SearchMode.BIDIRECTIONAL)
+
+        path = solver.run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+        movements = solver.convert_fastest_path_to_movements(path, Direction.NORTH)
+
+        # A move costs 1 and a turn of 90 degrees costs 2
+        self.assertEqual(path[-1].g, len(movements) + len([movement for movement in movements
+                                                           if movement != Movement.FORWARD]))
+
+    def test_path_has_the_cost_of_the_jump_point_search(self):
+        random_generator = random.Random(0)
+
+        for obstacle_ratio in (0, 0.05, 0.2, 0.35):
+            for _ in range(20):
+                arena = _get_random_arena(random_generator.randint(5, 20), obstacle_ratio, random_generator)
+                free_points = [[row, column] for row in range(len(arena)) for column in range(len(arena))
+                               if arena[row][column] == Cell.FREE_AREA]
+
+                if len(free_points) < 2:
+                    continue
+
+                start_point, goal_point = random_generator.sample(free_points, 2)
+                direction = random_generator.choice([Direction.NORTH, Direction.EAST, Direction.SOUTH,
+                                                     Direction.WEST])
+
+                # Both searches keep the direction of the robot in their states, so both find the cheapest path
+                jump_point_path = AStarAlgorithm(arena, search_mode=SearchMode.JUMP_POINT_SEARCH) \
+                    .run_algorithm_for_exploration(start_point, goal_point, direction)
+                bidirectional_path = AStarAlgorithm(arena, search_mode=SearchMode.BIDIRECTIONAL) \
+                    .run_algorithm_for_exploration(start_point, goal_point, direction)
+
+                if jump_point_path is None:
+                    self.assertIsNone(bidirectional_path)
+                    continue
+
+                self.assertEqual(jump_point_path[-1].g, bidirectional_path[-1].g)
+                self.assertEqual(goal_point, bidirectional_path[-1].point)
+
+    def test_turn_at_the_start_is_paid(self):
+        size = 10
+        solver = AStarAlgorithm(_get_random_arena(size, 0, random.Random(0)), search_mode=SearchMode.BIDIRECTIONAL)
+
+        # The goal is straight behind the robot
+        path = solver.run_algorithm_for_exploration([1, 4], [8, 4], Direction.NORTH)
+
+        self.assertEqual(7 + 4, path[-1].g)
+        self.assertTrue(all(node.direction_facing == Direction.SOUTH for node in path))
+
+    def test_no_path_to_an_enclosed_goal(self):
+        arena = _get_random_arena(10, 0, random.Random(0))
+
+        for row, column in [(4, 5), (6, 5), (5, 4), (5, 6)]:
+            arena[row][column] = Cell.OBSTACLE.value
+
+        solver = AStarAlgorithm(arena, search_mode=SearchMode.BIDIRECTIONAL)
+
+        self.assertIsNone(solver.run_algorithm_for_exploration([1, 1], [5, 5], Direction.NORTH))
+
+
+if __name__ == '__main__':
+    unittest.main()
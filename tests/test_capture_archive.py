@@ -0,0 +1,79 @@
+"""
+Contain tests for the archive of images received during a run
+"""
+import os
+import tempfile
+import unittest
+
+from utils.capture_archive import CaptureArchiveReader, CaptureArchiveWriter, INDEX_FILE_EXTENSION
+
+_RECORDS = [(1.5, '10,5;p=2,3;f=0;r=10,20,30,40', b'\xff\xd8first image'),
+            (2.5, '4,6', b'\xff\xd8second image, a bit longer')]
+
+
+class CaptureArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.directory.name, 'captures.bin')
+
+        archive_writer = CaptureArchiveWriter(self.archive_path)
+
+        for timestamp, photo_request, image_bytes in _RECORDS:
+            archive_writer.append(timestamp, photo_request, image_bytes)
+
+        archive_writer.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read_all_records(self):
+        archive_reader = CaptureArchiveReader(self.archive_path)
+        records = []
+
+        for record in archive_reader:
+            with record.image_bytes as image_bytes:
+                records.append((record.timestamp, record.photo_request, bytes(image_bytes)))
+
+        archive_reader.close()
+
+        return records
+
+    def test_records_round_trip(self):
+        self.assertEqual(_RECORDS, self._read_all_records())
+
+    def test_index_is_rebuilt_from_the_archive(self):
+        os.remove(self.archive_path + INDEX_FILE_EXTENSION)
+
+        self.assertEqual(_RECORDS, self._read_all_records())
+
+    def test_partially_written_record_is_ignored(self):
+        with open(self.archive_path, 'ab') as archive_file:
+            archive_file.write(b'\x00\x01')
+
+        os.remove(self.archive_path + INDEX_FILE_EXTENSION)
+
+        self.assertEqual(_RECORDS, self._read_all_records())
+
+    def test_close_after_partial_iteration(self):
+        archive_reader = CaptureArchiveReader(self.archive_path)
+
+        for record in archive_reader:
+            self.assertEqual(_RECORDS[0][2], bytes(record.image_bytes))
+            record.image_bytes.release()
+            break
+
+        archive_reader.close()
+
+    def test_close_with_unreleased_image_bytes_fails(self):
+        archive_reader = CaptureArchiveReader(self.archive_path)
+        record = archive_reader[1]
+
+        with self.assertRaises(BufferError):
+            archive_reader.close()
+
+        record.image_bytes.release()
+        archive_reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
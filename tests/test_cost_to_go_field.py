@@ -0,0 +1,148 @@
+"""
+Contain tests for the cost to home field of the exploration
+"""
+import unittest
+from unittest.mock import patch
+
+from algorithms.cost_to_go_field import CostToGoField
+from algorithms.exploration import Exploration
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils import constants
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement
+
+
+def _get_virtual_map(obstacle_points=()):
+    virtual_map = [[Cell.FREE_AREA.value] * constants.ARENA_WIDTH for _ in range(constants.ARENA_HEIGHT)]
+
+    for row, column in obstacle_points:
+        virtual_map[row][column] = Cell.OBSTACLE.value
+
+    Map.set_virtual_walls_on_map(virtual_map)
+
+    return virtual_map
+
+
+class CostToGoFieldTest(unittest.TestCase):
+    def test_turns_are_counted(self):
+        cost_to_go_field = CostToGoField(ROBOT_START_POINT, Direction.EAST)
+        cost_to_go_field.update(_get_virtual_map())
+
+        self.assertEqual(0, cost_to_go_field.get_no_of_moves(ROBOT_START_POINT, Direction.EAST))
+        self.assertEqual(1, cost_to_go_field.get_no_of_moves(ROBOT_START_POINT, Direction.NORTH))
+        self.assertEqual(2, cost_to_go_field.get_no_of_moves(ROBOT_START_POINT, Direction.WEST))
+        # Forward 5 cells facing south, then turn to face east
+        self.assertEqual(6, cost_to_go_field.get_no_of_moves([13, 1], Direction.SOUTH))
+
+    def test_turns_are_weighted_like_the_fastest_path_solver(self):
+        cost_to_go_field = CostToGoField(ROBOT_START_POINT, Direction.EAST, use_solver_costs=True)
+        cost_to_go_field.update(_get_virtual_map())
+
+        self.assertEqual(constants.TURN_COST_PERPENDICULAR,
+                         cost_to_go_field.get_no_of_moves(ROBOT_START_POINT, Direction.NORTH))
+        self.assertEqual(constants.TURN_COST_OPPOSITE_DIRECTION,
+                         cost_to_go_field.get_no_of_moves(ROBOT_START_POINT, Direction.WEST))
+        self.assertEqual(5 * constants.MOVE_COST + constants.TURN_COST_PERPENDICULAR,
+                         cost_to_go_field.get_no_of_moves([13, 1], Direction.SOUTH))
+        self.assertEqual([Movement.FORWARD] * 5 + [Movement.LEFT],
+                         cost_to_go_field.get_movements([13, 1], Direction.SOUTH))
+
+    def test_obstacles_lengthen_the_path(self):
+        cost_to_go_field = CostToGoField(ROBOT_START_POINT, Direction.EAST)
+        cost_to_go_field.update(_get_virtual_map())
+        no_of_moves_without_obstacles = cost_to_go_field.get_no_of_moves([10, 1], Direction.SOUTH)
+
+        cost_to_go_field.update(_get_virtual_map([(14, 1), (14, 2)]))
+
+        self.assertGreater(cost_to_go_field.get_no_of_moves([10, 1], Direction.SOUTH), no_of_moves_without_obstacles)
+        self.assertIsNone(cost_to_go_field.get_no_of_moves([14, 1], Direction.SOUTH))
+
+    def test_movements_follow_the_field(self):
+        cost_to_go_field = CostToGoField(ROBOT_START_POINT, Direction.EAST)
+        cost_to_go_field.update(_get_virtual_map([(14, 1), (14, 2)]))
+        robot = SimulatorBot([10, 1], SAMPLE_ARENA, Direction.NORTH, lambda m: None, update_interval=0)
+
+        list_of_movements = cost_to_go_field.get_movements(robot.point, robot.direction)
+
+        for movement in list_of_movements:
+            robot.move(movement, invoke_callback=False)
+
+        self.assertEqual(cost_to_go_field.get_no_of_moves([10, 1], Direction.NORTH), len(list_of_movements))
+        self.assertEqual(ROBOT_START_POINT, robot.point)
+        self.assertEqual(Direction.EAST, robot.direction)
+        self.assertNotIn(Movement.BACKWARD, list_of_movements)
+
+    def test_field_is_rebuilt_when_the_obstacles_change(self):
+        map_object = Map()
+        robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0)
+        exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+        exploration.sense_and_repaint_canvas()
+        exploration.mark_robot_area_as_explored(*ROBOT_START_POINT)
+
+        with patch.object(exploration.cost_to_home_field, 'update',
+                          wraps=exploration.cost_to_home_field.update) as update:
+            exploration.update_cost_to_home_field()
+            self.assertEqual(1, update.call_count)
+
+            # Newly explored free cells only open up shorter ways home
+            exploration.set_cell_as_explored(10, 7)
+            exploration.update_cost_to_home_field()
+            self.assertEqual(1, update.call_count)
+
+            exploration.update_cost_to_home_field(is_exact=True)
+            self.assertEqual(2, update.call_count)
+
+            exploration.set_obstacle_cell(10, 7, Cell.OBSTACLE.value)
+            exploration.update_cost_to_home_field()
+            self.assertEqual(3, update.call_count)
+
+    def test_field_is_an_upper_bound_until_the_obstacles_change(self):
+        map_object = Map()
+        robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0)
+        exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+        exploration.sense_and_repaint_canvas()
+        exploration.mark_robot_area_as_explored(*ROBOT_START_POINT)
+        exploration.update_cost_to_home_field()
+
+        for row in range(constants.ARENA_HEIGHT):
+            for column in range(constants.ARENA_WIDTH):
+                if SAMPLE_ARENA[row][column] != Cell.OBSTACLE.value:
+                    exploration.set_cell_as_explored(row, column)
+
+        exploration.update_cost_to_home_field()
+        exact_cost_to_home_field = CostToGoField(ROBOT_START_POINT, Direction.EAST)
+        exact_cost_to_home_field.update(exploration.get_virtual_obstacle_map())
+
+        for row in range(constants.ARENA_HEIGHT):
+            for column in range(constants.ARENA_WIDTH):
+                for direction in (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST):
+                    no_of_moves = exploration.cost_to_home_field.get_no_of_moves([row, column], direction)
+
+                    if no_of_moves is not None:
+                        self.assertLessEqual(exact_cost_to_home_field.get_no_of_moves([row, column], direction),
+                                             no_of_moves)
+
+    def test_exploration_returns_within_the_time_limit(self):
+        time_limit = 30
+        robot_speed = 2
+        clock = [0.0]
+
+        def on_move(_):
+            clock[0] += 1 / robot_speed
+
+        robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, on_move,
+                             time_interval=1 / robot_speed, update_interval=0)
+        map_object = Map()
+
+        with patch('algorithms.exploration.get_current_time_in_seconds', lambda: clock[0]):
+            exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=time_limit)
+            exploration.start_exploration()
+
+        self.assertLess(exploration.coverage, 1)
+        self.assertLessEqual(clock[0], time_limit)
+        self.assertEqual(ROBOT_START_POINT, robot.point)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Contain tests for the time budget of the decision steps of the exploration
+"""
+import unittest
+
+from algorithms import exploration
+from algorithms.decision_budget import DecisionBudget
+from algorithms.exploration import Exploration, get_min_no_of_movements
+from algorithms.view_planner import get_travel_distances
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Direction, Movement
+
+
+class DecisionBudgetTest(unittest.TestCase):
+    def setUp(self):
+        map_object = Map()
+        robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None,
+                             update_interval=0)
+        self.exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+        self.exploration.sense_and_repaint_canvas()
+        self.exploration.mark_robot_area_as_explored(*ROBOT_START_POINT)
+        self.unexplored_cells_to_check = self.exploration.find_neighbours_of_all_unexplored_cells()
+
+        self.movements_explored = []
+        self.exploration.move_robot_to_destination_cell = lambda movements, _: self.movements_explored.append(
+            movements)
+
+    def test_unlimited_budget_never_runs_out(self):
+        self.assertFalse(DecisionBudget().has_run_out)
+        self.assertTrue(DecisionBudget(0).has_run_out)
+
+    def test_path_with_fewest_movements_is_explored_given_time(self):
+        self.exploration.decision_budget = 10
+        fewest_no_of_movements = min(len(movements) for movements in (
+            self.exploration.find_fastest_path_to_node(self.exploration.robot.point, point, Direction.EAST)
+            for point in self.unexplored_cells_to_check) if movements is not None)
+
+        self.assertTrue(self.exploration.move_to_best_path_of_nearest_unexplored_cell(self.unexplored_cells_to_check))
+        self.assertEqual([fewest_no_of_movements], [len(movements) for movements in self.movements_explored])
+
+    def test_best_path_so_far_is_explored_when_budget_runs_out(self):
+        self.exploration.decision_budget = 0
+
+        self.assertTrue(self.exploration.move_to_best_path_of_nearest_unexplored_cell(self.unexplored_cells_to_check))
+        self.assertEqual(1, len(self.movements_explored))
+
+    def test_budget_that_runs_out_at_once_explores_like_no_budget(self):
+        self.exploration.decision_budget = None
+        self.assertTrue(self.exploration.move_to_best_path_of_nearest_unexplored_cell(self.unexplored_cells_to_check))
+
+        self.exploration.decision_budget = 0
+        self.assertTrue(self.exploration.move_to_best_path_of_nearest_unexplored_cell(self.unexplored_cells_to_check))
+
+        self.assertEqual(self.movements_explored[0], self.movements_explored[1])
+
+    def test_min_no_of_movements_counts_the_turns(self):
+        self.assertEqual(5, get_min_no_of_movements([10, 5], Direction.NORTH, (5, 5)))
+        self.assertEqual(6, get_min_no_of_movements([10, 5], Direction.EAST, (5, 5)))
+        self.assertEqual(7, get_min_no_of_movements([10, 5], Direction.SOUTH, (5, 5)))
+        self.assertEqual(10, get_min_no_of_movements([10, 5], Direction.SOUTH, (5, 8)))
+        self.assertEqual(0, get_min_no_of_movements([10, 5], Direction.SOUTH, (10, 5)))
+
+        for point in self.unexplored_cells_to_check:
+            for direction in (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST):
+                movements = self.exploration.find_fastest_path_to_node(self.exploration.robot.point, point, direction)
+
+                if movements is not None:
+                    self.assertLessEqual(get_min_no_of_movements(self.exploration.robot.point, direction, point),
+                                         len(movements))
+
+    def test_unreachable_neighbours_are_not_planned_once_budget_runs_out(self):
+        travel_distances = get_travel_distances(self.exploration.robot.point,
+                                                self.exploration.get_virtual_obstacle_map())
+        reachable_point = next(point for point in self.unexplored_cells_to_check
+                               if travel_distances[point[0]][point[1]] is not None)
+        # The cells of the arena border are nearer, but the robot cannot stand on them
+        unexplored_cells_to_check = {(19, 1): Direction.NORTH, (18, 0): Direction.NORTH,
+                                     reachable_point: self.unexplored_cells_to_check[reachable_point]}
+        planned_points = []
+        find_fastest_path_to_node = self.exploration.find_fastest_path_to_node
+
+        def find_planned_path(robot_point, destination_point, robot_facing_direction):
+            planned_points.append(destination_point)
+            return find_fastest_path_to_node(robot_point, destination_point, robot_facing_direction)
+
+        self.exploration.find_fastest_path_to_node = find_planned_path
+        self.exploration.decision_budget = 0
+
+        self.assertTrue(self.exploration.move_to_best_path_of_nearest_unexplored_cell(unexplored_cells_to_check))
+        self.assertEqual([reachable_point], planned_points)
+
+    def test_planning_after_budget_runs_out_is_capped(self):
+        travel_distances = get_travel_distances(self.exploration.robot.point,
+                                                self.exploration.get_virtual_obstacle_map())
+        reachable_cells_to_check = {(row, column): Direction.NORTH for row, distances in enumerate(travel_distances)
+                                    for column, distance in enumerate(distances) if distance}
+        planned_points = []
+
+        def find_planned_path(robot_point, destination_point, robot_facing_direction):
+            planned_points.append(destination_point)
+            return [Movement.FORWARD]
+
+        self.exploration.find_fastest_path_to_node = find_planned_path
+        # No path found can be followed, so the decision step never finds a path
+        self.exploration.can_return_in_time_after_moving = lambda movements, direction: False
+        self.exploration.decision_budget = 0
+
+        self.assertGreater(len(reachable_cells_to_check), exploration._MAX_NO_OF_CANDIDATES_AFTER_DEADLINE)
+        self.assertFalse(self.exploration.move_to_best_path_of_nearest_unexplored_cell(reachable_cells_to_check))
+        self.assertEqual(exploration._MAX_NO_OF_CANDIDATES_AFTER_DEADLINE, len(planned_points))
+
+    def test_budget_shrinks_near_the_time_limit(self):
+        self.exploration.decision_budget = 1
+        self.assertEqual(1, self.exploration.start_decision().duration)
+
+        self.exploration.decision_budget = None
+        self.assertIsNone(self.exploration.start_decision().duration)
+
+        # No time to spare before the robot has to return to the start area
+        self.exploration.decision_budget = 1
+        self.exploration.time_limit = self.exploration.time_elapsed
+        self.assertEqual(0, self.exploration.start_decision().duration)
+
+    def test_nearest_view_is_counted_when_budget_runs_out(self):
+        candidate_poses = list(self.unexplored_cells_to_check.items())
+        travel_distances = get_travel_distances(self.exploration.robot.point,
+                                                self.exploration.get_virtual_obstacle_map())
+        reachable_poses = [pose for pose in candidate_poses if travel_distances[pose[0][0]][pose[0][1]] is not None]
+
+        counted_poses, no_of_revealed_cells = self.exploration.count_cells_revealed_within_budget(
+            candidate_poses, travel_distances, DecisionBudget(0))
+
+        self.assertEqual([min(reachable_poses, key=lambda pose: travel_distances[pose[0][0]][pose[0][1]])],
+                         counted_poses)
+        self.assertEqual(1, len(no_of_revealed_cells))
+
+        counted_poses, _ = self.exploration.count_cells_revealed_within_budget(candidate_poses, travel_distances,
+                                                                               DecisionBudget())
+        self.assertEqual(len(reachable_poses), len(counted_poses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Contain tests for the loop detection and the path following of the exploration
+"""
+import unittest
+
+from algorithms.exploration import Exploration
+from fake_rpi_server import load_arena
+from map import Map
+from robot import SimulatorBot
+from utils import constants
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction
+
+
+def _get_arena_with_island():
+    arena = [[Cell.FREE_AREA.value] * constants.ARENA_WIDTH for _ in range(constants.ARENA_HEIGHT)]
+
+    for row in range(9, 12):
+        for column in range(6, 9):
+            arena[row][column] = Cell.OBSTACLE.value
+
+    return arena
+
+
+class ExplorationTest(unittest.TestCase):
+    def setUp(self):
+        self.map_object = Map()
+
+    def _get_exploration(self, robot_point, robot_direction):
+        robot = SimulatorBot(robot_point, _get_arena_with_island(), robot_direction, lambda m: None,
+                             update_interval=0)
+
+        # The time limit only stops the test if the loop is not detected
+        return Exploration(robot, self.map_object.explored_map, self.map_object.obstacle_map, time_limit=60)
+
+    def test_hugging_around_an_island_is_escaped(self):
+        # The island is on the right of the robot, so the right hug goes around the island
+        exploration = self._get_exploration([10, 4], Direction.NORTH)
+        exploration.start_exploration()
+
+        self.assertEqual(1, round(exploration.coverage, 2))
+        self.assertEqual(ROBOT_START_POINT, exploration.robot.point)
+        self.assertLess(exploration.no_of_steps_taken, 300)
+
+    def test_pose_is_revisited_with_the_same_maps(self):
+        exploration = self._get_exploration([10, 4], Direction.NORTH)
+
+        exploration.record_pose()
+        self.assertFalse(exploration.is_stuck_in_a_loop())
+
+        exploration.record_pose()
+        self.assertTrue(exploration.is_stuck_in_a_loop())
+
+        exploration.set_cell_as_explored(0, 0)
+        exploration.record_pose()
+        self.assertFalse(exploration.is_stuck_in_a_loop())
+
+    def test_incremental_state_of_the_maps(self):
+        exploration = self._get_exploration([10, 4], Direction.NORTH)
+        obstacle_map_hash = exploration.obstacle_map_hash
+
+        exploration.set_obstacle_cell(5, 5, Cell.OBSTACLE.value)
+        self.assertNotEqual(obstacle_map_hash, exploration.obstacle_map_hash)
+
+        # A phantom obstacle that is unset leaves the same obstacle map
+        exploration.set_obstacle_cell(5, 5, Cell.FREE_AREA.value)
+        self.assertEqual(obstacle_map_hash, exploration.obstacle_map_hash)
+
+        exploration.start_exploration()
+
+        self.assertEqual(sum(cell != Cell.UNEXPLORED for row in exploration.explored_map for cell in row),
+                         exploration.no_of_explored_cells)
+
+    def test_robot_never_moves_onto_an_obstacle(self):
+        # The paths to the unexplored cells run past cells whose obstacles are only sensed on the way
+        for arena_filename in ('sample_arena_2', 'sample_arena_3'):
+            arena = load_arena(arena_filename)
+            cells_under_robot = []
+
+            def on_move(_):
+                row, column = robot.point
+                cells_under_robot.extend(arena[row + row_offset][column + column_offset]
+                                         for row_offset in (-1, 0, 1) for column_offset in (-1, 0, 1))
+
+            robot = SimulatorBot(list(ROBOT_START_POINT), arena, Direction.EAST, on_move, update_interval=0)
+            map_object = Map()
+            exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+            exploration.start_exploration()
+
+            self.assertEqual(1, exploration.coverage)
+            self.assertEqual(ROBOT_START_POINT, robot.point)
+            self.assertNotIn(Cell.OBSTACLE.value, cells_under_robot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Contain tests for the profiler of the phases of the exploration
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from algorithms.exploration import Exploration
+from algorithms.exploration_profiler import ExplorationProfiler
+from algorithms.image_recognition_exploration import ImageRecognitionExploration
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement
+
+
+class ExplorationProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.coverage = 0
+        self.profiler = ExplorationProfiler(lambda: self.coverage)
+        self.robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None,
+                                  update_interval=0)
+
+    def test_movements_and_coverage_are_attributed_to_phases(self):
+        with self.profiler.phase('right_hug'):
+            self.profiler.record_movement(Movement.FORWARD)
+            self.profiler.record_movement(Movement.RIGHT)
+            self.coverage = 0.5
+
+        self.profiler.record_movement(Movement.FORWARD)  # Not in a phase
+
+        with self.profiler.phase('go_home'):
+            self.profiler.record_movement(Movement.LEFT)
+            self.coverage = 0.75
+
+        report = self.profiler.get_report()
+
+        self.assertEqual(['right_hug', 'go_home'], [phase['phase'] for phase in report['phases']])
+        self.assertEqual([1, 0], [phase['no_of_steps'] for phase in report['phases']])
+        self.assertEqual([1, 1], [phase['no_of_turns'] for phase in report['phases']])
+        self.assertEqual([0.5, 0.25], [phase['coverage_gained'] for phase in report['phases']])
+        self.assertEqual(0.75, report['total']['coverage_gained'])
+
+    def test_plans_and_replans_are_counted(self):
+        with self.profiler.phase('unexplored_cells'):
+            self.profiler.record_plan()
+            self.profiler.record_movement(Movement.FORWARD)
+            self.profiler.record_replan()
+            self.profiler.record_plan()
+
+        phase = self.profiler.get_report()['phases'][0]
+
+        self.assertEqual(2, phase['no_of_plans'])
+        self.assertEqual(1, phase['no_of_replans'])
+
+    def test_decision_step_is_one_plan(self):
+        map_object = Map()
+        exploration = Exploration(self.robot, map_object.explored_map, map_object.obstacle_map, time_limit=None,
+                                  decision_budget=10)
+        exploration.sense_and_repaint_canvas()
+        exploration.mark_robot_area_as_explored(*ROBOT_START_POINT)
+
+        with exploration.profiler.phase('unexplored_cells'):
+            self.assertTrue(exploration.move_to_best_path_of_nearest_unexplored_cell(
+                exploration.find_neighbours_of_all_unexplored_cells()))
+
+        phase = exploration.profiler.get_report()['phases'][0]
+
+        self.assertEqual(1, phase['no_of_plans'])
+        self.assertEqual(0, phase['no_of_replans'])
+
+    def test_plan_abandoned_on_an_obstacle_is_a_replan(self):
+        arena = [row[:] for row in SAMPLE_ARENA]
+        arena[18][4] = Cell.OBSTACLE.value
+        robot = SimulatorBot(list(ROBOT_START_POINT), arena, Direction.EAST, lambda m: None, update_interval=0)
+        map_object = Map()
+        exploration = Exploration(robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+
+        with exploration.profiler.phase('unexplored_cells'):
+            self.assertFalse(exploration.move_robot_to_destination_cell([Movement.FORWARD] * 3, Direction.EAST))
+
+        phase = exploration.profiler.get_report()['phases'][0]
+
+        self.assertEqual([18, 2], robot.point)
+        self.assertEqual(1, phase['no_of_plans'])
+        self.assertEqual(1, phase['no_of_replans'])
+
+    def test_nested_planning_is_timed_once(self):
+        with self.profiler.phase('unexplored_cells'):
+            with self.profiler.planning():
+                with self.profiler.planning():
+                    pass
+
+        phase = self.profiler.phases[0]
+
+        self.assertGreater(phase.planning_duration, 0)
+        self.assertLessEqual(phase.planning_duration, phase.duration)
+
+    def test_exploration_phases(self):
+        map_object = Map()
+        exploration = Exploration(self.robot, map_object.explored_map, map_object.obstacle_map, time_limit=None)
+        exploration.start_exploration()
+
+        report = exploration.profiler.get_report()
+
+        self.assertEqual(['right_hug', 'unexplored_cells', 'go_home'], [phase['phase'] for phase in report['phases']])
+        self.assertEqual(exploration.no_of_steps_taken, report['total']['no_of_steps'] + report['total']['no_of_turns'])
+        self.assertAlmostEqual(exploration.coverage, report['total']['coverage_gained'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'phases.json')
+            exploration.profiler.export(file_path)
+
+            with open(file_path) as file_handler:
+                self.assertEqual(report, json.load(file_handler))
+
+    def test_image_recognition_exploration_phases(self):
+        map_object = Map()
+        exploration = ImageRecognitionExploration(self.robot, map_object.explored_map, map_object.obstacle_map,
+                                                  time_limit=None)
+        exploration.start_exploration()
+
+        report = exploration.profiler.get_report()
+
+        self.assertEqual(['right_hug', 'middle_obstacles', 'unexplored_cells', 'remaining_faces'],
+                         [phase['phase'] for phase in report['phases']])
+        self.assertGreater(report['total']['no_of_photos'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Contain tests for the fastest path plans precomputed for every way point
+"""
+import unittest
+
+from algorithms.fastest_path_plans import plan_fastest_path, precompute_fastest_path_plans
+from map import Map, SAMPLE_ARENA
+from utils.constants import ROBOT_END_POINT, ROBOT_START_POINT
+from utils.enums import Direction
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+class FastestPathPlansTest(unittest.TestCase):
+    def setUp(self):
+        self.arena = _get_virtual_arena()
+
+    def test_plans_match_the_plan_of_the_way_point(self):
+        fastest_path_plans = precompute_fastest_path_plans(self.arena, ROBOT_START_POINT, ROBOT_END_POINT,
+                                                           Direction.NORTH, max_workers=2)
+
+        for way_point in [(11, 2), (16, 11), (6, 5)]:
+            fastest_path_plan = plan_fastest_path(self.arena, ROBOT_START_POINT, list(way_point), ROBOT_END_POINT,
+                                                  Direction.NORTH)
+
+            self.assertEqual(fastest_path_plan.arduino_format_movements,
+                             fastest_path_plans[way_point].arduino_format_movements)
+            self.assertEqual([node.point for node in fastest_path_plan.get_path()],
+                             [node.point for node in fastest_path_plans[way_point].get_path()])
+
+    def test_only_free_cells_are_planned(self):
+        fastest_path_plans = precompute_fastest_path_plans(self.arena, ROBOT_START_POINT, ROBOT_END_POINT,
+                                                           Direction.NORTH, max_workers=1)
+
+        self.assertGreater(len(fastest_path_plans), 0)
+
+        for row, column in fastest_path_plans:
+            self.assertEqual(0, self.arena[row][column])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Contain tests for the A* search of the fastest path
+"""
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm, Node
+from map import Map, SAMPLE_ARENA
+from utils.constants import ROBOT_END_POINT, ROBOT_START_POINT
+from utils.enums import Cell, Direction
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+def _get_open_arena(size):
+    arena = [[Cell.FREE_AREA.value] * size for _ in range(size)]
+
+    for i in range(size):
+        arena[0][i] = arena[size - 1][i] = arena[i][0] = arena[i][size - 1] = Cell.VIRTUAL_WALL.value
+
+    return arena
+
+
+class AStarAlgorithmTest(unittest.TestCase):
+    def test_path_goes_through_the_way_point_on_free_cells(self):
+        arena = _get_virtual_arena()
+
+        path = AStarAlgorithm(arena).run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+        points_of_path = [node.point for node in path]
+
+        self.assertIn([11, 2], points_of_path)
+        self.assertEqual(ROBOT_END_POINT, points_of_path[-1])
+
+        for previous_node, node in zip(path, path[1:]):
+            self.assertEqual(1, abs(previous_node.point[0] - node.point[0]) + abs(previous_node.point[1] -
+                                                                                   node.point[1]))
+            self.assertEqual(Cell.FREE_AREA, arena[node.point[0]][node.point[1]])
+            self.assertIs(previous_node, node.parent_node)
+
+    def test_no_path_to_an_enclosed_goal(self):
+        arena = _get_open_arena(10)
+
+        for row, column in [(4, 5), (6, 5), (5, 4), (5, 6)]:
+            arena[row][column] = Cell.OBSTACLE.value
+
+        self.assertIsNone(AStarAlgorithm(arena).run_algorithm_for_exploration([1, 1], [5, 5], Direction.NORTH))
+
+    def test_path_on_a_large_open_arena_is_the_shortest(self):
+        size = 100
+
+        path = AStarAlgorithm(_get_open_arena(size)).run_algorithm_for_exploration([size - 2, 1],
+                                                                                   [1, size - 2],
+                                                                                   Direction.NORTH)
+
+        self.assertEqual(2 * (size - 3), len(path))
+        # Straight north, one turn, then straight east
+        self.assertEqual(1, sum(previous_node.direction_facing != node.direction_facing
+                                for previous_node, node in zip(path, path[1:])))
+
+    def test_node_has_no_attribute_dictionary(self):
+        self.assertFalse(hasattr(Node([1, 1]), '__dict__'))
+
+    def test_arduino_format_is_the_same_as_the_consolidated_movements(self):
+        solver = AStarAlgorithm(_get_virtual_arena())
+        path = solver.run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+
+        movements = solver.convert_fastest_path_to_movements(path, Direction.NORTH)
+
+        self.assertEqual(solver.consolidate_movements_to_string(movements),
+                         solver.convert_fastest_path_to_arduino_format(path, Direction.NORTH))
+
+    def test_arduino_format_merges_forward_movements_and_turns_the_shorter_way(self):
+        path = [Node([0, 0], direction) for direction in
+                [Direction.NORTH] * 9 + [Direction.WEST] * 2 + [Direction.EAST] + [Direction.NORTH]]
+
+        self.assertEqual('W7|W2|A1|W2|D1|D1|W1|A1|W1|',
+                         AStarAlgorithm(None).convert_fastest_path_to_arduino_format(path, Direction.NORTH))
+        self.assertEqual('', AStarAlgorithm(None).convert_fastest_path_to_arduino_format([], Direction.NORTH))
+
+    def test_long_instructions_are_separated_between_commands(self):
+        movements = 'W7|D1|' * 8 + 'W3|A1|' * 9 + 'W12|'
+
+        messages = AStarAlgorithm.check_and_separate_long_instructions(movements)
+
+        self.assertEqual(movements, ''.join(messages))
+
+        for message in messages:
+            self.assertLessEqual(len(message), 63)
+            self.assertTrue(message.endswith('|'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Contain tests for the hierarchical planning of the fastest path on large arenas
+"""
+import random
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.hierarchical_planner import HierarchicalPlanner
+from map import Map
+from utils.enums import Cell, Direction
+
+_ARENA_SIZE = 40
+
+
+def _get_arena_with_walls(random_generator):
+    arena = [[Cell.FREE_AREA.value] * _ARENA_SIZE for _ in range(_ARENA_SIZE)]
+
+    for _ in range(8):
+        row, column = random_generator.randrange(_ARENA_SIZE), random_generator.randrange(_ARENA_SIZE)
+        is_horizontal = random_generator.random() < 0.5
+
+        for i in range(random_generator.randint(5, 15)):
+            arena[row if is_horizontal else min(_ARENA_SIZE - 1, row + i)][
+                min(_ARENA_SIZE - 1, column + i) if is_horizontal else column] = Cell.OBSTACLE.value
+
+    return arena
+
+
+def _drive(planner, start_point, direction):
+    path = []
+    point = start_point
+
+    while True:
+        segment = planner.get_next_segment(point, direction)
+
+        if not segment:
+            return path if segment is not None else None
+
+        path.extend(segment)
+        point, direction = segment[-1].point, segment[-1].direction_facing
+
+
+class HierarchicalPlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.obstacle_map = _get_arena_with_walls(random.Random(0))
+        self.planner = HierarchicalPlanner(self.obstacle_map)
+        self.free_points = [[row, column] for row in range(_ARENA_SIZE) for column in range(_ARENA_SIZE)
+                            if self.planner.virtual_map[row][column] == Cell.FREE_AREA and
+                            0 < row < _ARENA_SIZE - 1 and 0 < column < _ARENA_SIZE - 1]
+
+    def test_virtual_walls_are_set_on_a_large_arena(self):
+        arena = [[Cell.FREE_AREA.value] * _ARENA_SIZE for _ in range(_ARENA_SIZE)]
+        arena[30][30] = Cell.OBSTACLE.value
+        Map.set_virtual_walls_on_map(arena)
+
+        self.assertEqual(Cell.VIRTUAL_WALL, arena[_ARENA_SIZE - 1][_ARENA_SIZE - 1])
+        self.assertEqual(Cell.VIRTUAL_WALL, arena[31][29])
+        self.assertEqual(Cell.FREE_AREA, arena[32][30])
+
+    def test_driven_segments_reach_the_goal_on_free_cells(self):
+        random_generator = random.Random(1)
+
+        for _ in range(10):
+            start_point, goal_point = random_generator.sample(self.free_points, 2)
+
+            flat_path = AStarAlgorithm(self.planner.virtual_map).run_algorithm_for_exploration(
+                start_point, goal_point, Direction.NORTH)
+            has_path = self.planner.plan(start_point, goal_point)
+
+            self.assertEqual(flat_path is not None, has_path)
+
+            if not has_path:
+                continue
+
+            path = _drive(self.planner, start_point, Direction.NORTH)
+
+            self.assertEqual(goal_point, path[-1].point)
+            self.assertLess(len(path), 2 * len(flat_path))
+
+            for node in path:
+                self.assertEqual(Cell.FREE_AREA, self.planner.virtual_map[node.point[0]][node.point[1]])
+
+    def test_only_the_next_segment_is_refined(self):
+        start_point, goal_point = [2, 2], [_ARENA_SIZE - 3, _ARENA_SIZE - 3]
+        planner = HierarchicalPlanner([[Cell.FREE_AREA.value] * _ARENA_SIZE for _ in range(_ARENA_SIZE)])
+
+        planner.plan(start_point, goal_point)
+        abstract_path = list(planner.abstract_path)
+        segment = planner.get_next_segment(start_point, Direction.NORTH)
+
+        # The segment ends on the first point of the abstract path in the next cluster
+        end_point = tuple(segment[-1].point)
+        self.assertIn(end_point, abstract_path)
+        self.assertNotEqual((0, 0), planner._get_cluster(end_point))
+        self.assertEqual(abstract_path[abstract_path.index(end_point) + 1:], planner.abstract_path)
+        self.assertGreater(len(planner.abstract_path), 0)
+
+    def test_only_the_changed_clusters_are_built_again(self):
+        self.obstacle_map[25][25] = Cell.OBSTACLE.value
+
+        changed_clusters = self.planner.update_map()
+
+        # The virtual walls around the obstacle are in the same cluster
+        self.assertEqual({(2, 2)}, changed_clusters)
+        self.assertEqual(set(), self.planner.update_map())
+
+    def test_new_obstacle_on_the_path_is_avoided(self):
+        planner = HierarchicalPlanner([[Cell.FREE_AREA.value] * _ARENA_SIZE for _ in range(_ARENA_SIZE)])
+        planner.plan([2, 2], [2, _ARENA_SIZE - 3])
+        segment = planner.get_next_segment([2, 2], Direction.EAST)
+
+        blocked_point = planner.abstract_path[0]
+        planner.obstacle_map[blocked_point[0]][blocked_point[1]] = Cell.OBSTACLE.value
+        planner.update_map()
+
+        path = _drive(planner, segment[-1].point, segment[-1].direction_facing)
+
+        self.assertEqual([2, _ARENA_SIZE - 3], path[-1].point)
+        self.assertNotIn(list(blocked_point), [node.point for node in path])
+
+    def test_no_path_to_an_enclosed_goal(self):
+        for row, column in [(18, 20), (22, 20), (20, 18), (20, 22)]:
+            self.obstacle_map[row][column] = Cell.OBSTACLE.value
+
+        self.obstacle_map[20][20] = Cell.FREE_AREA.value
+        self.planner.update_map()
+
+        self.assertIsNone(self.planner.find_abstract_path(self.free_points[0], [20, 20]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Contain tests for taking the photos of the obstacle faces during the image recognition exploration
+"""
+import unittest
+
+from algorithms.image_recognition_exploration import ImageRecognitionExploration
+from fake_rpi_server import load_arena
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Direction
+
+
+def _explore_and_photograph(arena_name: str, can_detect_loops: bool):
+    map_object = Map()
+    robot = SimulatorBot(list(ROBOT_START_POINT), load_arena(arena_name), Direction.EAST, lambda m: None,
+                         update_interval=0)
+    exploration = ImageRecognitionExploration(robot, map_object.explored_map, map_object.obstacle_map,
+                                              time_limit=None)
+    photographed_faces = set()
+    request_photo = exploration.request_photo
+
+    def record_and_request_photo(obstacles, face_direction):
+        photographed_faces.update((obstacle, face_direction) for obstacle in obstacles)
+        request_photo(obstacles, face_direction)
+
+    exploration.request_photo = record_and_request_photo
+
+    if not can_detect_loops:
+        exploration.is_stuck_in_a_loop = lambda: False
+
+    exploration.start_exploration()
+
+    return exploration.no_of_steps_taken, photographed_faces
+
+
+class ImageRecognitionExplorationTest(unittest.TestCase):
+    def setUp(self):
+        map_object = Map()
+        self.robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None,
+                                  update_interval=0)
+        self.explored_map = map_object.explored_map
+        self.obstacle_map = map_object.obstacle_map
+
+    def _get_exploration(self, on_take_photo):
+        return ImageRecognitionExploration(self.robot, self.explored_map, self.obstacle_map,
+                                           on_take_photo=on_take_photo, time_limit=None)
+
+    def test_exploration_takes_photos_from_the_pose_of_the_request(self):
+        poses_of_photos = []
+
+        def on_take_photo(robot_point, _, robot_direction):
+            # The robot has not moved on since the photo was requested
+            poses_of_photos.append((robot_point, robot_direction, list(self.robot.point), self.robot.direction))
+
+        self._get_exploration(on_take_photo).start_exploration()
+
+        self.assertGreater(len(poses_of_photos), 0)
+
+        for robot_point, robot_direction, actual_robot_point, actual_robot_direction in poses_of_photos:
+            self.assertEqual((robot_point, robot_direction), (actual_robot_point, actual_robot_direction))
+
+    def test_face_of_failed_photo_is_photographed_again(self):
+        photographed_faces = []
+        exploration = self._get_exploration(lambda rp, o, rd: len(photographed_faces) > 1)  # The first photo fails
+        request_photo = exploration.request_photo
+
+        def record_and_request_photo(obstacles, face_direction):
+            photographed_faces.append((obstacles[0], face_direction))
+            request_photo(obstacles, face_direction)
+
+        exploration.request_photo = record_and_request_photo
+        exploration.start_exploration()
+
+        self.assertIn(photographed_faces[0], photographed_faces[1:])
+
+    def test_turns_to_take_photos_are_not_a_loop(self):
+        for i in range(1, 7):
+            with self.subTest(arena=i):
+                no_of_steps, photographed_faces = _explore_and_photograph(f'sample_arena_{i}', can_detect_loops=True)
+                no_of_steps_without_loop_detection, photographed_faces_without_loop_detection = \
+                    _explore_and_photograph(f'sample_arena_{i}', can_detect_loops=False)
+
+                self.assertLessEqual(no_of_steps, no_of_steps_without_loop_detection)
+                self.assertEqual(photographed_faces_without_loop_detection, photographed_faces)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Contain tests for the region of the photo where the obstacle face is expected to appear
+"""
+import unittest
+
+from utils import constants
+from utils.enums import Direction
+from utils.image_region import FULL_IMAGE_REGION, get_expected_image_region
+
+
+class ImageRegionTest(unittest.TestCase):
+    def test_obstacle_in_front_of_the_camera_is_centered(self):
+        # The camera of a robot facing north faces east
+        x_min, y_min, x_max, y_max = get_expected_image_region([10, 7], Direction.NORTH, [10, 10])
+
+        self.assertAlmostEqual(0.5, (x_min + x_max) / 2)
+        self.assertLess(0, x_min)
+        self.assertLess(x_max, 1)
+        self.assertEqual((0.0, 1.0), (y_min, y_max))
+
+    def test_obstacle_ahead_of_the_robot_is_on_the_left_of_the_image(self):
+        x_min, _, x_max, _ = get_expected_image_region([10, 7], Direction.NORTH, [9, 10])
+
+        self.assertLess((x_min + x_max) / 2, 0.5)
+
+    def test_region_is_clamped_to_the_image(self):
+        x_min, _, x_max, _ = get_expected_image_region([10, 7], Direction.NORTH, [9, 10])
+
+        self.assertEqual(0.0, x_min)
+        self.assertLess(x_max, 1)
+
+        x_min, _, x_max, _ = get_expected_image_region([10, 7], Direction.NORTH, [11, 10])
+
+        self.assertLess(0, x_min)
+        self.assertEqual(1.0, x_max)
+
+    def test_obstacle_out_of_view_gives_the_full_image(self):
+        # Behind the camera
+        self.assertEqual(FULL_IMAGE_REGION, get_expected_image_region([10, 7], Direction.NORTH, [10, 5]))
+        # Beside the camera, so the projected region is out of the image
+        self.assertEqual(FULL_IMAGE_REGION, get_expected_image_region([10, 7], Direction.NORTH, [6, 9]))
+        # Next to the camera, so the obstacle fills the image
+        self.assertEqual(FULL_IMAGE_REGION, get_expected_image_region([10, 7], Direction.NORTH, [10, 9]))
+
+    def test_obstacles_at_the_arena_border(self):
+        # The camera faces the obstacles on the border of the arena, from the front to the back of the robot
+        robot_poses_and_obstacle_points = [([3, 7], Direction.WEST, [[0, 6], [0, 7], [0, 8]]),
+                                           ([7, 11], Direction.NORTH, [[6, 14], [7, 14], [8, 14]]),
+                                           ([16, 7], Direction.EAST, [[19, 8], [19, 7], [19, 6]]),
+                                           ([7, 3], Direction.SOUTH, [[8, 0], [7, 0], [6, 0]])]
+
+        for robot_point, robot_direction, obstacle_points in robot_poses_and_obstacle_points:
+            centers = []
+
+            for obstacle_point in obstacle_points:
+                self.assertTrue(0 <= obstacle_point[0] < constants.ARENA_HEIGHT)
+                self.assertTrue(0 <= obstacle_point[1] < constants.ARENA_WIDTH)
+
+                x_min, y_min, x_max, y_max = get_expected_image_region(robot_point, robot_direction, obstacle_point)
+
+                self.assertTrue(0 <= x_min < x_max <= 1)
+                self.assertEqual((0.0, 1.0), (y_min, y_max))
+                centers.append((x_min + x_max) / 2)
+
+            # The robot's front is on the left of the image
+            self.assertLess(centers[0], centers[1])
+            self.assertAlmostEqual(0.5, centers[1])
+            self.assertLess(centers[1], centers[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Contain tests for the Jump Point Search of the fastest path
+"""
+import random
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.jump_point_search import JumpTable
+from map import Map, SAMPLE_ARENA
+from utils.constants import ROBOT_END_POINT, ROBOT_START_POINT
+from utils.enums import Cell, Direction, Movement, SearchMode
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+def _get_random_arena(size, obstacle_ratio, random_generator):
+    arena = [[Cell.OBSTACLE.value if random_generator.random() < obstacle_ratio else Cell.FREE_AREA.value
+              for _ in range(size)] for _ in range(size)]
+
+    for i in range(size):
+        arena[0][i] = arena[size - 1][i] = arena[i][0] = arena[i][size - 1] = Cell.VIRTUAL_WALL.value
+
+    return arena
+
+
+class JumpTableTest(unittest.TestCase):
+    def test_run_lengths_count_the_free_cells_in_a_straight_line(self):
+        arena = _get_random_arena(7, 0, random.Random(0))
+        arena[3][4] = Cell.OBSTACLE.value
+        table = JumpTable(arena)
+
+        cell = 3 * table.width + 1
+
+        # North, east, south, west
+        self.assertEqual([2, 2, 2, 0], [run_lengths[cell] for run_lengths in table.run_lengths])
+        self.assertEqual(-1, table.run_lengths[0][3 * table.width + 4])
+
+
+class JumpPointSearchTest(unittest.TestCase):
+    def test_path_goes_through_the_way_point_on_free_cells(self):
+        arena = _get_virtual_arena()
+        solver = AStarAlgorithm(arena, search_mode=SearchMode.JUMP_POINT_SEARCH)
+
+        path = solver.run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+        points_of_path = [node.point for node in path]
+
+        self.assertIn([11, 2], points_of_path)
+        self.assertEqual(ROBOT_END_POINT, points_of_path[-1])
+
+        for previous_node, node in zip(path, path[1:]):
+            self.assertEqual(1, abs(previous_node.point[0] - node.point[0]) + abs(previous_node.point[1] -
+                                                                                   node.point[1]))
+            self.assertEqual(Cell.FREE_AREA, arena[node.point[0]][node.point[1]])
+            self.assertIs(previous_node, node.parent_node)
+
+    def test_movements_have_the_cost_of_the_path(self):
+        arena = _get_virtual_arena()
+        solver = AStarAlgorithm(arena, search_mode=SearchMode.JUMP_POINT_SEARCH)
+
+        path = solver.run_algorithm(ROBOT_START_POINT, [11, 2], ROBOT_END_POINT, Direction.NORTH)
+        movements = solver.convert_fastest_path_to_movements(path, Direction.NORTH)
+
+        # A move costs 1 and a turn of 90 degrees costs 2
+        self.assertEqual(path[-1].g, len(movements) + len([movement for movement in movements
+                                                           if movement != Movement.FORWARD]))
+
+    def test_path_is_never_more_costly_than_a_star(self):
+        random_generator = random.Random(0)
+
+        for obstacle_ratio in (0, 0.05, 0.2, 0.35):
+            for _ in range(20):
+                arena = _get_random_arena(random_generator.randint(5, 20), obstacle_ratio, random_generator)
+                free_points = [[row, column] for row in range(len(arena)) for column in range(len(arena))
+                               if arena[row][column] == Cell.FREE_AREA]
+
+                if len(free_points) < 2:
+                    continue
+
+                start_point, goal_point = random_generator.sample(free_points, 2)
+                direction = random_generator.choice([Direction.NORTH, Direction.EAST, Direction.SOUTH,
+                                                     Direction.WEST])
+
+                a_star_path = AStarAlgorithm(arena).run_algorithm_for_exploration(start_point, goal_point,
+                                                                                   direction)
+                jump_point_path = AStarAlgorithm(arena, search_mode=SearchMode.JUMP_POINT_SEARCH) \
+                    .run_algorithm_for_exploration(start_point, goal_point, direction)
+
+                if a_star_path is None:
+                    self.assertIsNone(jump_point_path)
+                    continue
+
+                self.assertLessEqual(jump_point_path[-1].g, a_star_path[-1].g)
+
+    def test_path_on_a_large_open_arena_is_the_shortest(self):
+        size = 100
+        solver = AStarAlgorithm(_get_random_arena(size, 0, random.Random(0)),
+                                search_mode=SearchMode.JUMP_POINT_SEARCH)
+
+        path = solver.run_algorithm_for_exploration([size - 2, 1], [1, size - 2], Direction.NORTH)
+
+        self.assertEqual(2 * (size - 3), len(path))
+        self.assertEqual(1, sum(previous_node.direction_facing != node.direction_facing
+                                for previous_node, node in zip(path, path[1:])))
+
+    def test_jump_table_is_built_again_when_the_arena_changes(self):
+        arena = _get_random_arena(10, 0, random.Random(0))
+        solver = AStarAlgorithm(arena, search_mode=SearchMode.JUMP_POINT_SEARCH)
+        path = solver.run_algorithm_for_exploration([8, 1], [1, 8], Direction.NORTH)
+
+        blocked_point = path[len(path) // 2].point
+        arena[blocked_point[0]][blocked_point[1]] = Cell.OBSTACLE.value
+        new_path = solver.run_algorithm_for_exploration([8, 1], [1, 8], Direction.NORTH)
+
+        self.assertNotIn(blocked_point, [node.point for node in new_path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Contain tests for the payload of the photo requests sent to the RPI and echoed back with the images
+"""
+import unittest
+
+from utils.enums import Direction
+from utils.message_conversion import decode_photo_request, encode_photo_request
+
+
+class PhotoRequestTest(unittest.TestCase):
+    def test_photo_request_round_trip(self):
+        message = encode_photo_request([10, 5], [0.123, 0.0, 0.5, 1.0], Direction.SOUTH, [12, 4], Direction.EAST)
+
+        self.assertEqual('10,5;p=12,4,E;f=S;r=0.12,0.00,0.50,1.00', message)
+        self.assertEqual({'point': ['10', '5'],
+                          'region': [0.12, 0.0, 0.5, 1.0],
+                          'face': Direction.SOUTH,
+                          'robot_pose': [12, 4, Direction.EAST]}, decode_photo_request(message))
+
+    def test_old_format_without_fields(self):
+        self.assertEqual('3,7', encode_photo_request([3, 7]))
+        self.assertEqual({'point': ['3', '7'], 'region': None, 'face': None, 'robot_pose': None},
+                         decode_photo_request('3,7\n'))
+
+    def test_optional_fields(self):
+        # The robot pose is only sent with both the point and the direction of the robot
+        message = encode_photo_request([3, 7], face_direction=Direction.WEST, robot_point=[1, 1])
+
+        self.assertEqual('3,7;f=W', message)
+        self.assertEqual({'point': ['3', '7'], 'region': None, 'face': Direction.WEST, 'robot_pose': None},
+                         decode_photo_request(message))
+
+    def test_unknown_fields_are_ignored(self):
+        self.assertEqual({'point': ['3', '7'], 'region': [0.0, 0.0, 1.0, 1.0], 'face': None, 'robot_pose': None},
+                         decode_photo_request('3,7;x=1;r=0,0,1,1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Contain tests for the queue-fed mosaic of the detected images
+"""
+import os
+import tempfile
+import time
+import unittest
+from threading import Thread
+
+import cv2
+import numpy as np
+
+from image_recognition.mosaic_renderer import MosaicRenderer
+
+_TILE_WIDTH = 4
+_TILE_HEIGHT = 3
+
+
+def _get_image(value: int) -> np.ndarray:
+    return np.full((12, 16, 3), value, dtype=np.uint8)
+
+
+class MosaicRendererTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.directory.name, 'mosaic.png')
+        self.mosaic_renderer = MosaicRenderer(no_of_rows=2, no_of_columns=3, tile_width=_TILE_WIDTH,
+                                              tile_height=_TILE_HEIGHT, headless=True, output_path=self.output_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _get_tile_values(self, canvas: np.ndarray):
+        return [[int(canvas[row * _TILE_HEIGHT:(row + 1) * _TILE_HEIGHT,
+                            column * _TILE_WIDTH:(column + 1) * _TILE_WIDTH].mean()) for column in range(3)]
+                for row in range(2)]
+
+    def test_output_path_is_required_in_headless_mode(self):
+        with self.assertRaises(ValueError):
+            MosaicRenderer(headless=True)
+
+    def test_images_fill_the_tiles_row_by_row(self):
+        for value in (10, 20, 30, 40):
+            self.mosaic_renderer.submit(_get_image(value))
+
+        self.assertTrue(self.mosaic_renderer._draw_queued_images(timeout=0))
+
+        self.assertEqual((2 * _TILE_HEIGHT, 3 * _TILE_WIDTH, 3), self.mosaic_renderer.canvas.shape)
+        self.assertEqual([[10, 20, 30], [40, 0, 0]], self._get_tile_values(self.mosaic_renderer.canvas))
+        self.assertFalse(self.mosaic_renderer._draw_queued_images(timeout=0))
+
+    def test_oldest_tile_is_overwritten_when_the_mosaic_is_full(self):
+        for value in range(10, 90, 10):
+            self.mosaic_renderer.submit(_get_image(value))
+
+        self.mosaic_renderer._draw_queued_images(timeout=0)
+
+        self.assertEqual(8, self.mosaic_renderer.no_of_images_rendered)
+        self.assertEqual([[70, 80, 30], [40, 50, 60]], self._get_tile_values(self.mosaic_renderer.canvas))
+
+    def test_queued_images_are_drawn_when_stopped(self):
+        render_thread = Thread(target=self.mosaic_renderer.run, daemon=True)
+        render_thread.start()
+
+        while not self.mosaic_renderer.is_running:
+            time.sleep(0.01)
+
+        self.mosaic_renderer.submit(_get_image(10))
+        self.mosaic_renderer.submit(_get_image(20))
+        self.mosaic_renderer.stop()
+        render_thread.join(timeout=5)
+
+        self.assertFalse(render_thread.is_alive())
+        self.assertEqual(2, self.mosaic_renderer.no_of_images_rendered)
+        self.assertEqual([[10, 20, 0], [0, 0, 0]], self._get_tile_values(cv2.imread(self.output_path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Contain tests for the exploration of the arena by several robots that share one map
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from algorithms.multi_robot_exploration import MultiRobotExploration, get_footprint, get_start_points
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.enums import Cell, Direction
+
+
+def _get_multi_robot_exploration(no_of_robots, **kwargs):
+    map_object = Map()
+    robots = [SimulatorBot(start_point, SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0)
+              for start_point in get_start_points(SAMPLE_ARENA, no_of_robots)]
+
+    return MultiRobotExploration(robots, map_object.explored_map, map_object.obstacle_map, **kwargs)
+
+
+class MultiRobotExplorationTest(unittest.TestCase):
+    def test_start_points_are_free_and_apart(self):
+        start_points = get_start_points(SAMPLE_ARENA, 4)
+
+        self.assertEqual(4, len(start_points))
+
+        for i, start_point in enumerate(start_points):
+            self.assertTrue(all(SAMPLE_ARENA[row][column] != Cell.OBSTACLE
+                                for row, column in get_footprint(start_point)))
+
+            for other_start_point in start_points[i + 1:]:
+                self.assertTrue(set(get_footprint(start_point)).isdisjoint(get_footprint(other_start_point)))
+
+    def test_overlapping_robots_are_rejected(self):
+        map_object = Map()
+        robots = [SimulatorBot([18, 1], SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0),
+                  SimulatorBot([17, 3], SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0)]
+
+        with self.assertRaises(ValueError):
+            MultiRobotExploration(robots, map_object.explored_map, map_object.obstacle_map)
+
+    def test_robots_never_collide(self):
+        multi_robot_exploration = _get_multi_robot_exploration(4)
+
+        for agent in multi_robot_exploration.agents:
+            agent.exploration.sense_and_repaint_canvas()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            while multi_robot_exploration.no_of_ticks < 500 and multi_robot_exploration.run_tick(executor):
+                footprints = [get_footprint(agent.robot.point) for agent in multi_robot_exploration.agents]
+
+                self.assertEqual(sum(len(footprint) for footprint in footprints),
+                                 len(set(cell for footprint in footprints for cell in footprint)))
+                self.assertEqual({cell: agent_index for agent_index, footprint in enumerate(footprints)
+                                  for cell in footprint}, multi_robot_exploration.reservations)
+
+    def test_targets_are_spread_out(self):
+        multi_robot_exploration = _get_multi_robot_exploration(2)
+        travel_distances = [[abs(row - 10) + abs(column - 7) for column in range(15)] for row in range(20)]
+
+        multi_robot_exploration.allocate_frontier_targets({(10, 8): Direction.NORTH,
+                                                           (10, 9): Direction.NORTH,
+                                                           (3, 3): Direction.NORTH},
+                                                          {0: travel_distances, 1: travel_distances})
+
+        self.assertEqual([(10, 8), (3, 3)], [agent.target for agent in multi_robot_exploration.agents])
+
+    def test_more_robots_explore_in_fewer_ticks(self):
+        no_of_ticks = []
+
+        for no_of_robots in (1, 3):
+            multi_robot_exploration = _get_multi_robot_exploration(no_of_robots)
+            multi_robot_exploration.start_exploration()
+
+            self.assertEqual(1, multi_robot_exploration.coverage)
+            no_of_ticks.append(multi_robot_exploration.no_of_ticks)
+
+        self.assertLess(no_of_ticks[1], no_of_ticks[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Contain tests for the fastest path through several way points
+"""
+import unittest
+from itertools import permutations
+
+from algorithms import multi_waypoint_planner
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.multi_waypoint_planner import MultiWaypointPlanner
+from map import Map, SAMPLE_ARENA
+from utils.constants import MOVE_COST, ROBOT_END_POINT, ROBOT_START_POINT, TURN_COST_PERPENDICULAR
+from utils.enums import Direction, Movement
+
+_WAY_POINTS = [[11, 2], [2, 3], [16, 11], [9, 12], [6, 5]]
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+class MultiWaypointPlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.arena = _get_virtual_arena()
+        self.planner = MultiWaypointPlanner(self.arena)
+        self.costs = self.planner.get_costs_between_points([ROBOT_START_POINT] + _WAY_POINTS,
+                                                                       ROBOT_END_POINT)
+
+    def _get_cost_of_order(self, order):
+        return multi_waypoint_planner._get_states_of_order(order, Direction.NORTH, self.costs)[0]
+
+    def test_path_visits_every_way_point_and_ends_at_the_goal(self):
+        path = self.planner.run_algorithm(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH)
+        points_of_path = [node.point for node in path]
+
+        for way_point in _WAY_POINTS:
+            self.assertIn(way_point, points_of_path)
+
+        self.assertEqual(ROBOT_END_POINT, path[-1].point)
+
+        for node in path:
+            self.assertEqual(0, self.arena[node.point[0]][node.point[1]])
+
+    def test_exact_order_has_the_fewest_moves(self):
+        states = self.planner.find_visiting_order(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH)
+        order = [point_index - 1 for point_index, _ in states[1:]]
+
+        fewest_no_of_moves = min(self._get_cost_of_order(order)
+                                 for order in permutations(range(len(_WAY_POINTS))))
+
+        self.assertEqual(fewest_no_of_moves, self._get_cost_of_order(order))
+
+    def test_path_costs_as_much_as_its_order(self):
+        path = self.planner.run_algorithm(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH)
+        states = self.planner.find_visiting_order(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH)
+        movements = AStarAlgorithm(self.arena).convert_fastest_path_to_movements(path, Direction.NORTH)
+        no_of_forward_movements = movements.count(Movement.FORWARD)
+
+        self.assertEqual(no_of_forward_movements * MOVE_COST +
+                         (len(movements) - no_of_forward_movements) * TURN_COST_PERPENDICULAR,
+                         self._get_cost_of_order([point_index - 1 for point_index, _ in states[1:]]))
+
+    def test_cost_of_a_single_way_point_matches_the_fastest_path_solver(self):
+        for way_point in _WAY_POINTS:
+            path = AStarAlgorithm(self.arena).run_algorithm(ROBOT_START_POINT, way_point, ROBOT_END_POINT,
+                                                            Direction.NORTH)
+            costs = self.planner.get_costs_between_points([ROBOT_START_POINT, way_point], ROBOT_END_POINT)
+
+            self.assertEqual(path[-1].g, multi_waypoint_planner._get_states_of_order([0], Direction.NORTH, costs)[0])
+
+    def test_ordering_constraints_are_respected(self):
+        states = self.planner.find_visiting_order(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH,
+                                                  ordering_constraints=[(2, 1), (1, 0)])
+        order = [point_index - 1 for point_index, _ in states[1:]]
+
+        self.assertLess(order.index(2), order.index(1))
+        self.assertLess(order.index(1), order.index(0))
+
+    def test_cyclic_ordering_constraints_have_no_path(self):
+        self.assertIsNone(self.planner.run_algorithm(ROBOT_START_POINT, _WAY_POINTS, ROBOT_END_POINT, Direction.NORTH,
+                                                     ordering_constraints=[(0, 1), (1, 0)]))
+
+    def test_heuristic_order_is_valid(self):
+        states = multi_waypoint_planner._solve_heuristically(len(_WAY_POINTS), Direction.NORTH, self.costs,
+                                                             [0, 1 << 4, 0, 0, 0])
+        order = [point_index - 1 for point_index, _ in states[1:]]
+
+        self.assertEqual(sorted(order), list(range(len(_WAY_POINTS))))
+        self.assertLess(order.index(4), order.index(1))
+
+    def test_way_point_on_an_obstacle_has_no_path(self):
+        self.assertIsNone(self.planner.run_algorithm(ROBOT_START_POINT, [[0, 0]], ROBOT_END_POINT, Direction.NORTH))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Contain tests for the sensor fusion of the occupancy grid
+"""
+import unittest
+
+from algorithms.exploration import Exploration
+from algorithms.occupancy_grid import OccupancyGrid
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction
+
+
+class OccupancyGridTest(unittest.TestCase):
+    def test_short_range_obstacle_is_marked_at_once(self):
+        occupancy_grid = OccupancyGrid()
+
+        observed_cells, changed_cells = occupancy_grid.update([((10, 5), [0, 1], True, 1)])
+
+        self.assertEqual([(10, 6)], observed_cells)
+        self.assertEqual([(10, 6)], changed_cells)
+        self.assertTrue(occupancy_grid.is_occupied[10][6])
+
+    def test_unreliable_long_range_obstacle_needs_repeated_readings(self):
+        occupancy_grid = OccupancyGrid()
+        reading = ((10, 5), [0, -1], False, 3)
+
+        observed_cells, changed_cells = occupancy_grid.update([reading])
+
+        self.assertEqual([(10, 4), (10, 3), (10, 2)], observed_cells)
+        self.assertEqual([], changed_cells)
+
+        _, changed_cells = occupancy_grid.update([reading])
+
+        self.assertEqual([(10, 2)], changed_cells)
+
+    def test_single_obstacle_reading_flips_only_reliable_distances(self):
+        flipped_distances = {}
+
+        for is_short_range, last_distance in ((True, 1), (False, 6)):
+            flipped_distances[is_short_range] = []
+
+            for distance in range(1, last_distance + 1):
+                occupancy_grid = OccupancyGrid()
+                occupancy_grid.update([((10, 0), [0, 1], is_short_range, distance)])
+
+                if occupancy_grid.is_occupied[10][distance]:
+                    flipped_distances[is_short_range].append(distance)
+
+        self.assertEqual({True: [1], False: [1, 4, 5, 6]}, flipped_distances)
+
+    def test_free_readings_clear_phantom_obstacle(self):
+        occupancy_grid = OccupancyGrid()
+        occupancy_grid.update([((10, 5), [0, 1], True, 1)])
+        probability_after_obstacle_reading = occupancy_grid.get_probability(10, 6)
+
+        _, changed_cells = occupancy_grid.update([((10, 5), [0, 1], False, None)])
+
+        self.assertIn((10, 6), changed_cells)
+        self.assertFalse(occupancy_grid.is_occupied[10][6])
+        self.assertLess(occupancy_grid.get_probability(10, 6), probability_after_obstacle_reading)
+
+    def test_rays_stop_at_the_arena_boundary(self):
+        occupancy_grid = OccupancyGrid()
+
+        observed_cells, _ = occupancy_grid.update([((1, 1), [-1, 0], False, None)])
+
+        self.assertEqual([(0, 1)], observed_cells)
+
+    def test_exploration_with_occupancy_grid(self):
+        map_object = Map()
+        robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None,
+                             update_interval=0)
+        exploration = Exploration(robot,
+                                  map_object.explored_map,
+                                  map_object.obstacle_map,
+                                  time_limit=None,
+                                  use_occupancy_grid=True)
+
+        exploration.start_exploration()
+
+        self.assertEqual(1, exploration.coverage)
+
+        for obstacle_row, arena_row in zip(exploration.obstacle_map, SAMPLE_ARENA):
+            for obstacle_cell, arena_cell in zip(obstacle_row, arena_row):
+                if obstacle_cell == Cell.OBSTACLE:
+                    self.assertEqual(Cell.OBSTACLE, arena_cell)
+
+
+if __name__ == '__main__':
+    unittest.main()
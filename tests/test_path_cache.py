@@ -0,0 +1,87 @@
+"""
+Contain tests for the cache of the fastest paths
+"""
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.path_cache import PathCache
+from map import Map, SAMPLE_ARENA
+from utils.constants import ROBOT_END_POINT, ROBOT_START_POINT
+from utils.enums import Cell, Direction
+
+_WAY_POINT = [11, 2]
+
+
+def _get_virtual_arena():
+    arena = [row[:] for row in SAMPLE_ARENA]
+    Map.set_virtual_walls_on_map(arena)
+
+    return arena
+
+
+class PathCacheTest(unittest.TestCase):
+    def test_least_recently_used_path_is_evicted(self):
+        path_cache = PathCache(max_size=2)
+        path_cache.put('a', [1])
+        path_cache.put('b', [2])
+        path_cache.get('a')
+        path_cache.put('c', [3])
+
+        self.assertEqual([1], path_cache.get('a'))
+        self.assertIsNone(path_cache.get('b'))
+        self.assertEqual([3], path_cache.get('c'))
+        self.assertEqual(2, len(path_cache))
+
+    def test_cached_path_cannot_be_modified(self):
+        path_cache = PathCache()
+        path_cache.put('a', [1, 2])
+
+        path_cache.get('a').append(3)
+
+        self.assertEqual([1, 2], path_cache.get('a'))
+
+    def test_repeated_search_is_a_hit(self):
+        path_cache = PathCache()
+        arena = _get_virtual_arena()
+
+        path = AStarAlgorithm(arena, path_cache).run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT,
+                                                               Direction.NORTH)
+        cached_path = AStarAlgorithm(arena, path_cache).run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT,
+                                                                      Direction.NORTH)
+
+        self.assertEqual(1, path_cache.no_of_hits)
+        self.assertEqual([node.point for node in path], [node.point for node in cached_path])
+
+    def test_map_change_is_a_miss(self):
+        path_cache = PathCache()
+        arena = _get_virtual_arena()
+        solver = AStarAlgorithm(arena, path_cache)
+        path = solver.run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT, Direction.NORTH)
+
+        blocked_point = path[len(path) // 2].point
+        arena[blocked_point[0]][blocked_point[1]] = Cell.OBSTACLE.value
+        new_path = solver.run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT, Direction.NORTH)
+
+        self.assertEqual(0, path_cache.no_of_hits)
+        self.assertNotIn(blocked_point, [node.point for node in new_path])
+
+    def test_replaced_map_is_a_miss(self):
+        path_cache = PathCache()
+        solver = AStarAlgorithm(_get_virtual_arena(), path_cache)
+        path = solver.run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT, Direction.NORTH)
+
+        blocked_point = path[len(path) // 2].point
+        solver.arena = _get_virtual_arena()
+        solver.arena[blocked_point[0]][blocked_point[1]] = Cell.OBSTACLE.value
+        new_path = solver.run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT, Direction.NORTH)
+
+        self.assertEqual(0, path_cache.no_of_hits)
+        self.assertNotIn(blocked_point, [node.point for node in new_path])
+
+        solver.arena = _get_virtual_arena()
+        solver.run_algorithm(ROBOT_START_POINT, _WAY_POINT, ROBOT_END_POINT, Direction.NORTH)
+
+        self.assertEqual(1, path_cache.no_of_hits)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Contain tests for the cache of the recognition results per obstacle face
+"""
+import unittest
+from threading import Thread
+
+import numpy as np
+
+from image_recognition.recognition_cache import RecognitionCache, compute_difference_hash, get_hamming_distance
+from utils.enums import Direction
+
+_FACE_KEY = ((3, 7), Direction.NORTH)
+_OTHER_FACE_KEY = ((3, 7), Direction.EAST)
+
+
+def _get_gradient_image(is_horizontal: bool) -> np.ndarray:
+    gradient = np.tile(np.arange(0, 256, 4, dtype=np.uint8), (64, 1))
+
+    if not is_horizontal:
+        gradient = gradient.T
+
+    return np.dstack([gradient] * 3)
+
+
+class RecognitionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.recognition_cache = RecognitionCache(max_no_of_faces=2, max_hash_distance=10)
+
+    def test_similar_images_have_close_hashes(self):
+        image = _get_gradient_image(is_horizontal=True)
+        noisy_image = np.clip(image.astype(np.int16) + np.random.RandomState(0).randint(-2, 3, image.shape), 0, 255)
+
+        image_hash = compute_difference_hash(image)
+
+        self.assertLessEqual(get_hamming_distance(image_hash, compute_difference_hash(noisy_image.astype(np.uint8))),
+                             10)
+        self.assertGreater(get_hamming_distance(image_hash,
+                                                compute_difference_hash(_get_gradient_image(is_horizontal=False))),
+                           10)
+
+    def test_similar_image_of_the_same_face_is_skipped(self):
+        self.assertFalse(self.recognition_cache.has_similar_image(_FACE_KEY, 0))
+
+        self.recognition_cache.reconcile(_FACE_KEY, 0b1111, '1_up', 0.9)
+
+        self.assertTrue(self.recognition_cache.has_similar_image(_FACE_KEY, 0b1110))
+        self.assertFalse(self.recognition_cache.has_similar_image(_FACE_KEY, (1 << 64) - 1))
+        self.assertFalse(self.recognition_cache.has_similar_image(_OTHER_FACE_KEY, 0b1111))
+
+    def test_most_confident_label_is_kept(self):
+        self.assertEqual((None, '1_up', 0.6), self.recognition_cache.reconcile(_FACE_KEY, 1, '1_up', 0.6))
+        self.assertEqual(('1_up', '1_up', 0.6), self.recognition_cache.reconcile(_FACE_KEY, 2, '2_down', 0.5))
+        self.assertEqual(('1_up', '1_up', 0.6), self.recognition_cache.reconcile(_FACE_KEY, 3, None, 0))
+        self.assertEqual(('1_up', '2_down', 0.8), self.recognition_cache.reconcile(_FACE_KEY, 4, '2_down', 0.8))
+        self.assertEqual(('2_down', 0.8), self.recognition_cache.get_result(_FACE_KEY))
+
+    def test_capture_without_label_is_not_skipped_later(self):
+        self.assertEqual((None, None, 0), self.recognition_cache.reconcile(_FACE_KEY, 0b1111, None, 0))
+        self.assertFalse(self.recognition_cache.has_similar_image(_FACE_KEY, 0b1111))
+        self.assertEqual((None, 0), self.recognition_cache.get_result(_FACE_KEY))
+
+        self.recognition_cache.reconcile(_FACE_KEY, 0b1111, '1_up', 0.6)
+        self.recognition_cache.reconcile(_FACE_KEY, (1 << 64) - 1, None, 0)
+
+        self.assertTrue(self.recognition_cache.has_similar_image(_FACE_KEY, 0b1111))
+        self.assertFalse(self.recognition_cache.has_similar_image(_FACE_KEY, (1 << 64) - 1))
+
+    def test_least_recently_used_face_is_evicted(self):
+        third_face_key = ((5, 5), Direction.SOUTH)
+
+        self.recognition_cache.reconcile(_FACE_KEY, 1, '1_up', 0.6)
+        self.recognition_cache.reconcile(_OTHER_FACE_KEY, 2, '2_down', 0.6)
+        self.recognition_cache.has_similar_image(_FACE_KEY, 1)  # Most recently used
+        self.recognition_cache.reconcile(third_face_key, 3, '3_left', 0.6)
+
+        self.assertEqual(('1_up', 0.6), self.recognition_cache.get_result(_FACE_KEY))
+        self.assertEqual((None, 0), self.recognition_cache.get_result(_OTHER_FACE_KEY))
+        self.assertEqual(('3_left', 0.6), self.recognition_cache.get_result(third_face_key))
+
+    def test_concurrent_captures_replace_labels_in_a_chain(self):
+        results = []
+        labels = [f'{i}_label' for i in range(32)]
+
+        def reconcile(i):
+            results.append((labels[i], self.recognition_cache.reconcile(_FACE_KEY, i, labels[i], i / len(labels))))
+
+        threads = [Thread(target=reconcile, args=(i,)) for i in range(len(labels))]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Every label that is kept replaces the label kept right before it, so no label is replaced twice
+        replaced_labels = [previous_label for label, (previous_label, reconciled_label, _) in results
+                           if reconciled_label == label]
+
+        self.assertEqual(len(replaced_labels), len(set(replaced_labels)))
+        self.assertIn(None, replaced_labels)
+        self.assertEqual(labels[-1], self.recognition_cache.get_result(_FACE_KEY)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
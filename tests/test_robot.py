@@ -0,0 +1,46 @@
+"""
+Contain tests for the sensing of the simulated robot
+"""
+import unittest
+
+from map import SAMPLE_ARENA
+from robot import SimulatorBot
+from utils.enums import Direction
+
+
+class SimulatorBotTest(unittest.TestCase):
+    def setUp(self):
+        self.robot = SimulatorBot([18, 1], SAMPLE_ARENA, Direction.EAST, lambda m: None, update_interval=0)
+
+    def test_sensor_rays_match_sensors(self):
+        for direction, sensor_rays in self.robot.sensor_rays.items():
+            for sensor, sensor_ray in zip(self.robot.sensor_offset_points, sensor_rays):
+                self.assertEqual(sensor.get_current_point([10, 7], direction),
+                                 (10 + sensor_ray.point_offset[0], 7 + sensor_ray.point_offset[1]))
+                self.assertEqual(tuple(Direction.get_direction_offset(sensor.get_current_direction(direction))),
+                                 sensor_ray.direction_offset)
+
+    def test_sense(self):
+        self.robot.point = [1, 13]
+        self.robot.direction = Direction.NORTH
+
+        # Blocked by the wall in front and on the right. The long range sensor sees the obstacle at [0, 7]
+        self.assertEqual([1, 1, 1, 5, 1, 1], self.robot.sense())
+
+    def test_sense_at_poses(self):
+        # Includes the poses on the border of the arena, where sensors are out of the arena
+        poses = [([row, column], direction)
+                 for row in range(0, 20)
+                 for column in range(0, 15)
+                 for direction in (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)]
+
+        sensor_values_at_poses = self.robot.sense_at_poses(poses)
+
+        for (point, direction), sensor_values in zip(poses, sensor_values_at_poses):
+            self.robot.point = point
+            self.robot.direction = direction
+            self.assertEqual(self.robot.sense(), sensor_values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Contain tests for the RPI service against the fake RPI server
+"""
+import unittest
+from threading import Thread
+from time import perf_counter, sleep
+
+from fake_rpi_server import FakeRPIServer
+from map import SAMPLE_ARENA
+from robot import SimulatorBot
+from rpi_service import RPIService
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Direction, Movement
+
+_WAIT_TIMEOUT_IN_SECONDS = 2
+
+
+def _wait_until(condition) -> bool:
+    end_time = perf_counter() + _WAIT_TIMEOUT_IN_SECONDS
+
+    while perf_counter() < end_time:
+        if condition():
+            return True
+
+        sleep(0.01)
+
+    return False
+
+
+class RPIServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.fake_rpi_server = FakeRPIServer(SAMPLE_ARENA, ROBOT_START_POINT, Direction.EAST)
+        host, port = self.fake_rpi_server.start()
+
+        self.rpi_service = RPIService()
+        self.rpi_service.connect_to_rpi(host, port)
+        Thread(target=self.rpi_service.always_listen_for_instructions, daemon=True).start()
+
+    def tearDown(self):
+        self.rpi_service.disconnect_rpi()
+        self.fake_rpi_server.stop()
+
+    def test_sensor_values_after_movement(self):
+        expected_robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, update_interval=0)
+        expected_robot.move(Movement.FORWARD, invoke_callback=False)
+
+        sensor_values = self.rpi_service.send_movement_to_rpi_and_get_sensor_values(Movement.FORWARD)
+
+        self.assertEqual(expected_robot.sense(), sensor_values)
+        self.assertEqual(expected_robot.point, self.fake_rpi_server.robot.point)
+
+    def test_instructions_split_across_messages(self):
+        self.rpi_service.send_message_with_header_type(RPIService.ARDUINO_HEADER, 'W2|D')
+        sleep(0.05)
+        self.rpi_service.send_message_with_header_type(RPIService.ARDUINO_HEADER, '1|W1|')
+
+        self.assertTrue(_wait_until(lambda: self.fake_rpi_server.no_of_instructions['W'] == 2))
+        self.assertEqual([ROBOT_START_POINT[0] + 1, ROBOT_START_POINT[1] + 2], self.fake_rpi_server.robot.point)
+        self.assertEqual(Direction.SOUTH, self.fake_rpi_server.robot.direction)
+
+    def test_message_from_android(self):
+        self.fake_rpi_server.send_message(RPIService.EXPLORATION_HEADER)
+
+        self.assertTrue(_wait_until(lambda: len(self.rpi_service._fifo_queue) > 0))
+        self.assertEqual((RPIService.EXPLORATION_HEADER, ''), self.rpi_service.get_message_from_rpi_queue())
+
+    def test_photo_request_received(self):
+        self.rpi_service.take_photo([5, 5], face_direction=Direction.NORTH)
+
+        self.assertTrue(_wait_until(lambda: len(self.fake_rpi_server.received_messages) > 0))
+        self.assertEqual(RPIService.TAKE_PHOTO_HEADER, self.fake_rpi_server.received_messages[0][0])
+
+    def test_link_latency(self):
+        self.fake_rpi_server.latency = 0.1
+
+        start_time = perf_counter()
+        self.rpi_service.receive_sensor_values()
+
+        # Sensor request to the server and sensor values back
+        self.assertGreaterEqual(perf_counter() - start_time, 2 * self.fake_rpi_server.latency)
+
+    def test_batches_are_streamed_on_acknowledgement(self):
+        self.fake_rpi_server.step_duration = 0.01
+        self.rpi_service.send_message_with_header_type(RPIService.ARDUINO_HEADER,
+                                                       RPIService.ARDUINO_FASTEST_PATH_INDICATOR)
+
+        start_time = perf_counter()
+        self.rpi_service.stream_instruction_batches(['W1|W1|', 'W1|', 'W1|'], no_of_batches_ahead=1,
+                                                    acknowledgement_timeout=_WAIT_TIMEOUT_IN_SECONDS)
+
+        # The last batch is sent once the second batch is acknowledged, well before the time out
+        self.assertLess(perf_counter() - start_time, _WAIT_TIMEOUT_IN_SECONDS)
+        self.assertGreaterEqual(self.fake_rpi_server.no_of_fastest_path_batches, 2)
+        self.assertTrue(_wait_until(lambda: self.fake_rpi_server.no_of_fastest_path_batches == 3))
+        self.assertEqual([ROBOT_START_POINT[0], ROBOT_START_POINT[1] + 4], self.fake_rpi_server.robot.point)
+
+    def test_batches_are_sent_ahead_of_acknowledgements(self):
+        self.fake_rpi_server.step_duration = 0.2
+        self.rpi_service.send_message_with_header_type(RPIService.ARDUINO_HEADER,
+                                                       RPIService.ARDUINO_FASTEST_PATH_INDICATOR)
+
+        start_time = perf_counter()
+        self.rpi_service.stream_instruction_batches(['W1|', 'W1|', 'W1|'], no_of_batches_ahead=3)
+
+        # All the batches are sent before the first one is executed
+        self.assertLess(perf_counter() - start_time, self.fake_rpi_server.step_duration)
+        self.assertTrue(_wait_until(lambda: self.fake_rpi_server.no_of_instructions['W'] == 3))
+        self.assertLess(self.fake_rpi_server.no_of_fastest_path_batches, 3)
+
+    def test_batches_are_sent_after_the_time_out_without_acknowledgements(self):
+        # Not in the fastest path mode, so the batches are not acknowledged
+        start_time = perf_counter()
+        self.rpi_service.stream_instruction_batches(['W1|', 'W1|'], no_of_batches_ahead=1,
+                                                    acknowledgement_timeout=0.2)
+
+        self.assertGreaterEqual(perf_counter() - start_time, 0.2)
+        self.assertTrue(_wait_until(lambda: self.fake_rpi_server.no_of_instructions['W'] == 2))
+        self.assertEqual(0, self.fake_rpi_server.no_of_fastest_path_batches)
+
+
+if __name__ == '__main__':
+    unittest.main()
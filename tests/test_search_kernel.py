@@ -0,0 +1,79 @@
+"""
+Contain tests for the search kernel of the A* search
+"""
+import random
+import unittest
+
+from algorithms.fastest_path_solver import AStarAlgorithm
+from algorithms.search_kernel import get_blocked_cells
+from utils.enums import Cell, Direction
+
+_NO_OF_ARENAS = 2000
+
+
+def _get_random_arena(height, width, obstacle_ratio, random_generator):
+    arena = [[random_generator.choice([Cell.OBSTACLE.value, Cell.VIRTUAL_WALL.value])
+              if random_generator.random() < obstacle_ratio else Cell.FREE_AREA.value
+              for _ in range(width)] for _ in range(height)]
+
+    for column in range(width):
+        arena[0][column] = arena[height - 1][column] = Cell.VIRTUAL_WALL.value
+
+    for row in range(height):
+        arena[row][0] = arena[row][width - 1] = Cell.VIRTUAL_WALL.value
+
+    return arena
+
+
+def _get_path_states(path):
+    return None if path is None else [(node.point, node.direction_facing, node.g) for node in path]
+
+
+class SearchKernelTest(unittest.TestCase):
+    def test_blocked_cells_include_the_border_and_a_row_after_the_arena(self):
+        arena = _get_random_arena(4, 5, 0, random.Random(0))
+        arena[0][2] = Cell.FREE_AREA.value
+
+        blocked_cells = get_blocked_cells(arena)
+
+        self.assertEqual(4 * 5 + 5, len(blocked_cells))
+        self.assertEqual([1, 1, 1, 1, 1], list(blocked_cells[:5]))
+        self.assertEqual([1, 0, 0, 0, 1], [min(value, 1) for value in blocked_cells[5:10]])
+        self.assertEqual([1] * 5, list(blocked_cells[20:]))
+
+    def test_paths_are_the_same_as_the_python_search(self):
+        random_generator = random.Random(0)
+
+        for _ in range(_NO_OF_ARENAS):
+            height, width = random_generator.randint(3, 25), random_generator.randint(3, 25)
+            arena = _get_random_arena(height, width, random_generator.choice([0, 0.1, 0.25, 0.4]), random_generator)
+
+            # Any cell, including blocked cells and the border, to cover the paths that are not found
+            start_point = [random_generator.randrange(height), random_generator.randrange(width)]
+            goal_point = [random_generator.randrange(height), random_generator.randrange(width)]
+            direction = random_generator.choice([Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST])
+
+            kernel_path = AStarAlgorithm(arena).run_algorithm_for_exploration(start_point, goal_point, direction)
+            python_path = AStarAlgorithm(arena, use_search_kernel=False).run_algorithm_for_exploration(
+                start_point, goal_point, direction)
+
+            self.assertEqual(_get_path_states(python_path), _get_path_states(kernel_path))
+
+    def test_paths_through_a_way_point_are_the_same_as_the_python_search(self):
+        random_generator = random.Random(1)
+
+        for _ in range(_NO_OF_ARENAS // 10):
+            arena = _get_random_arena(20, 15, 0.15, random_generator)
+            free_points = [[row, column] for row in range(20) for column in range(15)
+                           if arena[row][column] == Cell.FREE_AREA]
+            start_point, way_point, goal_point = random_generator.sample(free_points, 3)
+
+            kernel_path = AStarAlgorithm(arena).run_algorithm(start_point, way_point, goal_point, Direction.NORTH)
+            python_path = AStarAlgorithm(arena, use_search_kernel=False).run_algorithm(start_point, way_point,
+                                                                                       goal_point, Direction.NORTH)
+
+            self.assertEqual(_get_path_states(python_path), _get_path_states(kernel_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Contain tests for the timing of the stages of every move
+"""
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from utils.timing import SpanRecorder, get_percentile
+
+
+class SpanRecorderTest(unittest.TestCase):
+    def test_disabled_recorder_does_not_record(self):
+        span_recorder = SpanRecorder()
+
+        with span_recorder.span('planning'):
+            pass
+
+        span_recorder.begin_move()
+
+        self.assertEqual([], span_recorder.timeline)
+        self.assertEqual(0, span_recorder.move_index)
+
+    def test_spans_are_attributed_to_moves(self):
+        span_recorder = SpanRecorder()
+        span_recorder.enable()
+
+        with span_recorder.span('planning'):
+            pass
+
+        span_recorder.begin_move()
+
+        with span_recorder.span('move'):
+            with span_recorder.span('rpi_send'):
+                pass
+
+        self.assertEqual([(0, 'planning'), (1, 'rpi_send'), (1, 'move')],
+                         [(move_index, stage) for move_index, stage, _, _, _ in span_recorder.timeline])
+        self.assertEqual(1, span_recorder.get_summary()['move']['count'])
+
+    def test_export(self):
+        span_recorder = SpanRecorder(is_enabled=True)
+        span_recorder.record('map_update', span_recorder.start_time, 0.002)
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'timeline.csv')
+            json_path = os.path.join(directory, 'timeline.json')
+            span_recorder.export(csv_path)
+            span_recorder.export(json_path)
+
+            with open(csv_path) as file_handler:
+                rows = list(csv.DictReader(file_handler))
+
+            with open(json_path) as file_handler:
+                exported = json.load(file_handler)
+
+        self.assertEqual('map_update', rows[0]['stage'])
+        self.assertAlmostEqual(2, float(rows[0]['duration_in_ms']))
+        self.assertEqual(1, exported['summary']['map_update']['histogram']['<=5ms'])
+        self.assertEqual(1, len(exported['timeline']))
+
+    def test_percentile(self):
+        self.assertEqual(3, get_percentile([1, 2, 3, 4, 5], 50))
+        self.assertEqual(5, get_percentile([1, 2, 3, 4, 5], 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Contain tests for the information gain of the view planner
+"""
+import unittest
+
+from algorithms.exploration import Exploration
+from algorithms.view_planner import count_cells_revealed_at_poses, get_travel_distances, \
+    rank_poses_by_information_gain
+from map import Map, SAMPLE_ARENA
+from robot import SimulatorBot
+from utils import constants
+from utils.constants import ROBOT_START_POINT
+from utils.enums import Cell, Direction
+
+
+def _get_empty_maps():
+    explored_map = [[Cell.UNEXPLORED.value] * constants.ARENA_WIDTH for _ in range(constants.ARENA_HEIGHT)]
+    obstacle_map = [[Cell.FREE_AREA.value] * constants.ARENA_WIDTH for _ in range(constants.ARENA_HEIGHT)]
+
+    return explored_map, obstacle_map
+
+
+class ViewPlannerTest(unittest.TestCase):
+    def setUp(self):
+        self.robot = SimulatorBot(list(ROBOT_START_POINT), SAMPLE_ARENA, Direction.EAST, lambda m: None,
+                                  update_interval=0)
+
+    def test_explored_cells_are_not_counted(self):
+        explored_map, obstacle_map = _get_empty_maps()
+        pose = ((10, 7), Direction.NORTH)
+
+        no_of_revealed_cells = count_cells_revealed_at_poses([pose], explored_map, obstacle_map,
+                                                             self.robot.sensor_rays)[0]
+
+        for row in range(constants.ARENA_HEIGHT):
+            explored_map[row] = [Cell.EXPLORED.value] * constants.ARENA_WIDTH
+
+        self.assertGreater(no_of_revealed_cells, 0)
+        self.assertEqual([0], count_cells_revealed_at_poses([pose], explored_map, obstacle_map,
+                                                            self.robot.sensor_rays))
+
+    def test_rays_stop_at_known_obstacles(self):
+        explored_map, obstacle_map = _get_empty_maps()
+        pose = ((10, 7), Direction.NORTH)
+        no_of_revealed_cells = count_cells_revealed_at_poses([pose], explored_map, obstacle_map,
+                                                             self.robot.sensor_rays)[0]
+
+        for column in range(constants.ARENA_WIDTH):
+            obstacle_map[8][column] = Cell.OBSTACLE.value
+
+        self.assertLess(count_cells_revealed_at_poses([pose], explored_map, obstacle_map, self.robot.sensor_rays)[0],
+                        no_of_revealed_cells)
+
+    def test_travel_distances_avoid_obstacles(self):
+        _, obstacle_map = _get_empty_maps()
+
+        for row in range(constants.ARENA_HEIGHT - 1):
+            obstacle_map[row][5] = Cell.OBSTACLE.value
+
+        travel_distances = get_travel_distances([0, 4], obstacle_map)
+
+        self.assertEqual(1, travel_distances[0][3])
+        self.assertEqual(constants.ARENA_HEIGHT - 1 + 2 + constants.ARENA_HEIGHT - 1, travel_distances[0][6])
+        self.assertIsNone(travel_distances[0][5])
+
+    def test_ranking_by_gain_per_move(self):
+        _, obstacle_map = _get_empty_maps()
+        travel_distances = get_travel_distances([10, 7], obstacle_map)
+        near_pose = ((10, 8), Direction.EAST)
+        far_pose = ((10, 12), Direction.EAST)
+        blind_pose = ((10, 6), Direction.WEST)
+
+        ranked_poses = rank_poses_by_information_gain([far_pose, near_pose, blind_pose], [10, 4, 0], travel_distances)
+
+        self.assertEqual([near_pose, far_pose], ranked_poses)
+
+    def test_exploration_with_view_planning_covers_the_arena(self):
+        map_object = Map()
+        exploration = Exploration(self.robot, map_object.explored_map, map_object.obstacle_map, time_limit=None,
+                                  use_view_planning=True)
+
+        exploration.start_exploration()
+
+        self.assertEqual(1, exploration.coverage)
+        self.assertEqual(ROBOT_START_POINT, self.robot.point)
+
+
+if __name__ == '__main__':
+    unittest.main()
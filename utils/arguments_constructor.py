@@ -8,7 +8,50 @@ _parser.add_argument('--task-type',
                      choices=['fp', 'exp'],
                      default='fp',
                      required=True)
+_parser.add_argument('--host',
+                     type=str,
+                     help='Host of the RPI server, e.g. 127.0.0.1 for the fake RPI server',
+                     default=None)
+_parser.add_argument('--port',
+                     type=int,
+                     help='Port of the RPI server',
+                     default=None)
+_parser.add_argument('--profile',
+                     type=str,
+                     help='Export the timings of every exploration move to this file (.json or .csv)',
+                     default=None)
+_parser.add_argument('--occupancy-grid',
+                     action='store_true',
+                     help='Fuse the sensor readings in an occupancy grid to filter out phantom obstacles')
+_parser.add_argument('--view-planning',
+                     action='store_true',
+                     help='Explore the unexplored cells from the pose that reveals the most cells per move')
+_parser.add_argument('--precompute-fastest-paths',
+                     action='store_true',
+                     help='Plan the fastest path through every possible way point when the map is loaded')
+_parser.add_argument('--stream-fastest-path',
+                     type=int,
+                     metavar='BATCHES_AHEAD',
+                     help='Send the batches of the fastest path as soon as the Arduino acknowledges them, with this '
+                          'many batches sent ahead, instead of a fixed delay between the batches',
+                     default=None)
+_parser.add_argument('--decision-budget',
+                     type=float,
+                     metavar='SECONDS',
+                     help='Time that every decision step of the exploration may take to plan, e.g. 0.005. The best '
+                          'unexplored cell found when the time runs out is explored next',
+                     default=None)
+
+_image_recognition_service_parser = ArgumentParser(description='Image recognition service for the image '
+                                                               'recognition exploration')
+_image_recognition_service_parser.add_argument('--headless',
+                                               action='store_true',
+                                               help='Save the detected images to disk instead of displaying them')
 
 
 def get_parser():
     return _parser.parse_args()
+
+
+def get_image_recognition_service_parser():
+    return _image_recognition_service_parser.parse_args()
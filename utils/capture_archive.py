@@ -0,0 +1,181 @@
+"""
+Contain classes for the append-only archive of images received during a run
+"""
+import mmap
+import struct
+from os.path import exists, getsize
+from threading import Lock
+from typing import Iterator, List, Tuple
+
+# Record: timestamp, photo request length, photo request, image length, image (JPEG)
+_RECORD_HEADER_FORMAT = '>dI'
+_IMAGE_LENGTH_FORMAT = '>I'
+# Index entry: record offset, record length, timestamp
+_INDEX_ENTRY_FORMAT = '>QId'
+
+_RECORD_HEADER_SIZE = struct.calcsize(_RECORD_HEADER_FORMAT)
+_IMAGE_LENGTH_SIZE = struct.calcsize(_IMAGE_LENGTH_FORMAT)
+_INDEX_ENTRY_SIZE = struct.calcsize(_INDEX_ENTRY_FORMAT)
+
+_DEFAULT_ENCODING_TYPE = 'utf-8'
+INDEX_FILE_EXTENSION = '.idx'
+
+
+class CaptureRecord:
+    """
+    An image received during the run together with the photo request (robot pose, obstacle, region) it answers
+    """
+
+    def __init__(self, timestamp: float, photo_request: str, image_bytes: memoryview):
+        """
+        :param timestamp: The time the image is received in seconds since the epoch
+        :param photo_request: The photo request payload echoed back by the RPI with the image
+        :param image_bytes: The JPEG encoded image
+        """
+        self.timestamp = timestamp
+        self.photo_request = photo_request
+        self.image_bytes = image_bytes
+
+
+class CaptureArchiveWriter:
+    """
+    Appends the received images to the archive and their offsets to the index file
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        :param archive_path: The path of the archive. The index is stored next to it with the .idx extension
+        """
+        self.archive_path = archive_path
+        self._archive_file = open(archive_path, 'ab')
+        self._index_file = open(archive_path + INDEX_FILE_EXTENSION, 'ab')
+        self._lock = Lock()
+
+    def append(self, timestamp: float, photo_request: str, image_bytes: bytes) -> None:
+        """
+        Appends the image as a length-prefixed record and indexes it
+
+        :param timestamp: The time the image is received in seconds since the epoch
+        :param photo_request: The photo request payload echoed back by the RPI with the image
+        :param image_bytes: The JPEG encoded image
+        """
+        photo_request_bytes = photo_request.encode(_DEFAULT_ENCODING_TYPE)
+        record = b''.join([struct.pack(_RECORD_HEADER_FORMAT, timestamp, len(photo_request_bytes)),
+                           photo_request_bytes,
+                           struct.pack(_IMAGE_LENGTH_FORMAT, len(image_bytes)),
+                           image_bytes])
+
+        with self._lock:
+            offset = self._archive_file.tell()
+            self._archive_file.write(record)
+            self._archive_file.flush()
+
+            self._index_file.write(struct.pack(_INDEX_ENTRY_FORMAT, offset, len(record), timestamp))
+            self._index_file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._archive_file.close()
+            self._index_file.close()
+
+
+class CaptureArchiveReader:
+    """
+    Reads the records of the archive through a memory map, without copying the images
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        :param archive_path: The path of the archive. The index is rebuilt from the archive if it is missing
+        """
+        self.archive_path = archive_path
+        self._archive_file = open(archive_path, 'rb')
+        self._memory_map = mmap.mmap(self._archive_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if getsize(archive_path) > 0 else b''
+        self.index = self._read_index()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator['CaptureRecord']:
+        for i in range(len(self.index)):
+            yield self[i]
+
+    def __getitem__(self, record_index: int) -> 'CaptureRecord':
+        offset, _, _ = self.index[record_index]
+
+        return self._read_record(offset)[0]
+
+    def close(self) -> None:
+        """
+        Closes the memory map. The image bytes of the records read must be released beforehand
+        """
+        if isinstance(self._memory_map, mmap.mmap):
+            self._memory_map.close()
+
+        self._archive_file.close()
+
+    def _read_record(self, offset: int) -> Tuple['CaptureRecord', int]:
+        """
+        Reads the record at the offset of the archive
+
+        :param offset: The offset of the record in the archive
+        :return: The record and its length in bytes
+        """
+        timestamp, photo_request_length = struct.unpack_from(_RECORD_HEADER_FORMAT, self._memory_map, offset)
+        photo_request_offset = offset + _RECORD_HEADER_SIZE
+        image_length_offset = photo_request_offset + photo_request_length
+
+        image_length, = struct.unpack_from(_IMAGE_LENGTH_FORMAT, self._memory_map, image_length_offset)
+        image_offset = image_length_offset + _IMAGE_LENGTH_SIZE
+
+        photo_request = bytes(self._memory_map[photo_request_offset:image_length_offset])
+        image_bytes = memoryview(self._memory_map)[image_offset:image_offset + image_length]
+        record = CaptureRecord(timestamp, photo_request.decode(_DEFAULT_ENCODING_TYPE), image_bytes)
+
+        return record, image_offset + image_length - offset
+
+    def _read_index(self) -> List[Tuple[int, int, float]]:
+        """
+        Reads the index file of the archive. Rebuilds the index by scanning the archive if the index file is missing.
+        Entries of records that are not completely written to the archive are ignored.
+
+        :return: The list of (offset, length, timestamp) of the records
+        """
+        archive_size = len(self._memory_map)
+        index_path = self.archive_path + INDEX_FILE_EXTENSION
+
+        if not exists(index_path):
+            return self._scan_archive()
+
+        with open(index_path, 'rb') as index_file:
+            index_bytes = index_file.read()
+
+        no_of_entries = len(index_bytes) // _INDEX_ENTRY_SIZE
+        index = [struct.unpack_from(_INDEX_ENTRY_FORMAT, index_bytes, i * _INDEX_ENTRY_SIZE)
+                 for i in range(no_of_entries)]
+
+        return [entry for entry in index if entry[0] + entry[1] <= archive_size]
+
+    def _scan_archive(self) -> List[Tuple[int, int, float]]:
+        """
+        Walks through the length prefixes of the archive to find the records
+
+        :return: The list of (offset, length, timestamp) of the records
+        """
+        index = []
+        offset = 0
+
+        while offset + _RECORD_HEADER_SIZE <= len(self._memory_map):
+            try:
+                record, record_length = self._read_record(offset)
+            except struct.error:
+                break
+
+            if offset + record_length > len(self._memory_map):
+                break
+
+            index.append((offset, record_length, record.timestamp))
+            offset += record_length
+
+        return index
@@ -21,3 +21,13 @@ TURN_COST_PERPENDICULAR = 2
 TURN_COST_OPPOSITE_DIRECTION = 4
 
 DEFAULT_SOCKET_BUFFER_SIZE_IN_BYTES = 2048
+
+# Arduino related constants
+
+ARDUINO_MAX_NO_OF_STEPS_PER_COMMAND = 7  # The number of steps is a single digit
+ARDUINO_MAX_MESSAGE_LENGTH = 63
+
+# Camera related constants
+
+CAMERA_HORIZONTAL_FIELD_OF_VIEW_IN_DEGREES = 62.2
+CAMERA_REGION_MARGIN_IN_CELLS = 0.5
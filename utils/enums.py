@@ -176,6 +176,15 @@ class Movement(IntEnum):
         raise ValueError('Invalid movement given!')
 
 
+class SearchMode(IntEnum):
+    """
+    The possible searches of the fastest path
+    """
+    A_STAR = 0
+    JUMP_POINT_SEARCH = 1
+    BIDIRECTIONAL = 2
+
+
 if __name__ == '__main__':
     print(Direction.get_direction_offset(Direction.NORTH))
     print(type(Direction.get_direction_offset(Direction.NORTH)))
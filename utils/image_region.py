@@ -0,0 +1,55 @@
+from math import radians, tan
+from typing import List, Tuple
+
+from utils.constants import CAMERA_HORIZONTAL_FIELD_OF_VIEW_IN_DEGREES, CAMERA_REGION_MARGIN_IN_CELLS
+from utils.enums import Direction
+
+ImageRegion = Tuple[float, float, float, float]  # x_min, y_min, x_max, y_max (normalised)
+
+FULL_IMAGE_REGION: ImageRegion = (0.0, 0.0, 1.0, 1.0)
+
+# Normalised focal length of a pinhole camera: image width / (2 * tan(fov / 2)), with the image width as 1
+_NORMALISED_FOCAL_LENGTH = 1 / (2 * tan(radians(CAMERA_HORIZONTAL_FIELD_OF_VIEW_IN_DEGREES) / 2))
+_OBSTACLE_HALF_WIDTH_IN_CELLS = 0.5
+
+
+def get_expected_image_region(robot_point: List[int],
+                              robot_direction: 'Direction',
+                              obstacle_point: List[int]) -> ImageRegion:
+    """
+    Determines the region of the photo where the obstacle face is expected to appear. \n
+    **ASSUMPTION** Camera faces the right of the robot and is mounted at the center of the robot
+
+    The obstacle is projected onto the image plane with a pinhole camera model. Only the horizontal
+    band is narrowed down as the height of the image on the obstacle face is unknown.
+
+    :param robot_point: The coordinate of the robot when the photo is taken
+    :param robot_direction: The facing direction of the robot when the photo is taken
+    :param obstacle_point: The coordinate of the obstacle to take photo
+    :return: The normalised region of the photo (x_min, y_min, x_max, y_max)
+    """
+    camera_direction = Direction.get_clockwise_direction(robot_direction)
+    camera_offset = Direction.get_direction_offset(camera_direction)
+    robot_offset = Direction.get_direction_offset(robot_direction)
+
+    row_offset = obstacle_point[0] - robot_point[0]
+    column_offset = obstacle_point[1] - robot_point[1]
+
+    # Distance to the obstacle face along the camera axis, and to the obstacle center along the robot's heading
+    depth = row_offset * camera_offset[0] + column_offset * camera_offset[1] - _OBSTACLE_HALF_WIDTH_IN_CELLS
+    lateral_offset = row_offset * robot_offset[0] + column_offset * robot_offset[1]
+
+    if depth <= 0:
+        return FULL_IMAGE_REGION
+
+    # The robot's front is on the left side of the image when the camera faces the right of the robot
+    center = 0.5 - lateral_offset / depth * _NORMALISED_FOCAL_LENGTH
+    half_width = (_OBSTACLE_HALF_WIDTH_IN_CELLS + CAMERA_REGION_MARGIN_IN_CELLS) / depth * _NORMALISED_FOCAL_LENGTH
+
+    x_min = max(0.0, center - half_width)
+    x_max = min(1.0, center + half_width)
+
+    if x_min >= x_max:
+        return FULL_IMAGE_REGION
+
+    return x_min, 0.0, x_max, 1.0
@@ -1,7 +1,14 @@
 from re import match
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
+
+from utils.enums import Direction
 
 _COORDINATE_POINT_REGEX_PATTERN = r'\d+\s\d+'
+_PHOTO_REQUEST_FIELD_SEPARATOR = ';'
+_PHOTO_REQUEST_KEY_SEPARATOR = '='
+_PHOTO_REQUEST_REGION_KEY = 'r'
+_PHOTO_REQUEST_FACE_KEY = 'f'
+_PHOTO_REQUEST_ROBOT_POSE_KEY = 'p'
 
 
 def validate_and_decode_point(message: str) -> Optional[List[str]]:
@@ -50,6 +57,65 @@ def _convert_sensor_value_string_to_integer_list(sensor_values_string: List[str]
     return sensor_values
 
 
+def encode_photo_request(obstacle_point: List[int],
+                         region: List[float] = None,
+                         face_direction: 'Direction' = None,
+                         robot_point: List[int] = None,
+                         robot_direction: 'Direction' = None) -> str:
+    """
+    Converts the photo request to the payload format sent to the RPI \n
+    Format: x,y;r=x_min,y_min,x_max,y_max;f=N;p=x,y,E where the region, face and robot pose fields are optional
+
+    :param obstacle_point: The obstacle coordinate in image recognition server coordinate format
+    :param region: The normalised region of the photo where the obstacle is expected to appear
+    :param face_direction: The face of the obstacle that is photographed
+    :param robot_point: The robot coordinate in image recognition server coordinate format
+    :param robot_direction: The direction of the robot when the photo is taken
+    :return: The payload of the photo request
+    """
+    fields = [f'{obstacle_point[0]},{obstacle_point[1]}']
+
+    if robot_point is not None and robot_direction is not None:
+        robot_pose_string = f'{robot_point[0]},{robot_point[1]},{Direction.to_string(robot_direction)}'
+        fields.append(f'{_PHOTO_REQUEST_ROBOT_POSE_KEY}{_PHOTO_REQUEST_KEY_SEPARATOR}{robot_pose_string}')
+
+    if face_direction is not None:
+        fields.append(f'{_PHOTO_REQUEST_FACE_KEY}{_PHOTO_REQUEST_KEY_SEPARATOR}{Direction.to_string(face_direction)}')
+
+    if region is not None:
+        region_string = ','.join(f'{value:.2f}' for value in region)
+        fields.append(f'{_PHOTO_REQUEST_REGION_KEY}{_PHOTO_REQUEST_KEY_SEPARATOR}{region_string}')
+
+    return _PHOTO_REQUEST_FIELD_SEPARATOR.join(fields)
+
+
+def decode_photo_request(message: str) -> Dict[str, Union[List[str], List[float], 'Direction', None]]:
+    """
+    Decodes the photo request payload echoed back by the RPI together with the image
+
+    :param message: The photo request payload
+    :return: The obstacle point string, the region of the photo, the obstacle face and the robot pose
+             (None if not given)
+    """
+    fields = message.strip().split(_PHOTO_REQUEST_FIELD_SEPARATOR)
+    photo_request = {'point': fields[0].split(','), 'region': None, 'face': None, 'robot_pose': None}
+
+    for field in fields[1:]:
+        key, _, value = field.partition(_PHOTO_REQUEST_KEY_SEPARATOR)
+
+        if key == _PHOTO_REQUEST_REGION_KEY:
+            photo_request['region'] = list(map(float, value.split(',')))
+
+        elif key == _PHOTO_REQUEST_FACE_KEY:
+            photo_request['face'] = Direction.from_string_to_direction(value)
+
+        elif key == _PHOTO_REQUEST_ROBOT_POSE_KEY:
+            x, y, direction = value.split(',')
+            photo_request['robot_pose'] = [int(x), int(y), Direction.from_string_to_direction(direction)]
+
+    return photo_request
+
+
 if __name__ == '__main__':
     print(validate_and_convert_sensor_values_from_arduino('11212 12121 12121 12112 121212 121'))
     print(validate_and_convert_sensor_values_from_arduino('11212 12121 12121 12112 121212 dajdd'))
@@ -0,0 +1,199 @@
+"""
+Utility to time the stages of every move of the robot (planning, RPI messages, map updates, GUI repaint...)
+"""
+import csv
+import json
+from bisect import bisect_left
+from threading import Lock, current_thread
+from time import perf_counter
+from typing import Dict, List, Union
+
+# Upper bounds of the histogram buckets in milliseconds. The last bucket holds the rest
+_HISTOGRAM_BUCKET_UPPER_BOUNDS_IN_MS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000]
+_TIMELINE_FIELDS = ['move', 'stage', 'start_in_seconds', 'duration_in_ms', 'thread']
+
+
+def get_percentile(sorted_values: List[float], percentile: float) -> float:
+    """
+    Gets the percentile with the nearest rank method
+
+    :param sorted_values: The values in ascending order. Must not be empty
+    :param percentile: The percentile between 0 and 100
+    :return: The value at the percentile
+    """
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+
+    return sorted_values[index]
+
+
+class _Span:
+    """
+    Records the duration of a stage when the with block exits
+    """
+    __slots__ = ('_recorder', '_stage', '_start_time')
+
+    def __init__(self, recorder: 'SpanRecorder', stage: str):
+        self._recorder = recorder
+        self._stage = stage
+        self._start_time = 0
+
+    def __enter__(self) -> '_Span':
+        self._start_time = perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._recorder.record(self._stage, self._start_time, perf_counter() - self._start_time)
+
+
+class _NoOpSpan:
+    """
+    Shared span that does nothing, so that timing costs a method call when the recorder is disabled
+    """
+
+    def __enter__(self) -> '_NoOpSpan':
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+class SpanRecorder:
+    """
+    Records the duration of the stages of every move. \n
+    Stages are timed with the with statement, e.g. with span_recorder.span('planning'): ... \n
+    Spans can be nested and recorded from any thread. They are attributed to the current move of the robot.
+    """
+
+    def __init__(self, is_enabled: bool = False):
+        """
+        :param is_enabled: True to record the spans. Else the spans are not timed
+        """
+        self.is_enabled = is_enabled
+        self.move_index = 0
+        self.timeline = []
+        self.start_time = perf_counter()
+        self._lock = Lock()
+
+    def enable(self) -> None:
+        """
+        Clears the recorded spans and starts recording
+        """
+        with self._lock:
+            self.move_index = 0
+            self.timeline = []
+            self.start_time = perf_counter()
+
+        self.is_enabled = True
+
+    def disable(self) -> None:
+        self.is_enabled = False
+
+    def span(self, stage: str) -> Union['_Span', '_NoOpSpan']:
+        """
+        Times the with block as the stage of the current move
+
+        :param stage: The name of the stage
+        :return: The context manager that times the stage
+        """
+        if not self.is_enabled:
+            return _NO_OP_SPAN
+
+        return _Span(self, stage)
+
+    def begin_move(self) -> None:
+        """
+        Attributes the following spans to the next move of the robot
+        """
+        if not self.is_enabled:
+            return
+
+        with self._lock:
+            self.move_index += 1
+
+    def record(self, stage: str, start_time: float, duration: float) -> None:
+        """
+        Records the duration of the stage
+
+        :param stage: The name of the stage
+        :param start_time: The performance counter when the stage started
+        :param duration: The duration of the stage in seconds
+        """
+        with self._lock:
+            self.timeline.append((self.move_index, stage, start_time - self.start_time, duration,
+                                  current_thread().name))
+
+    def get_summary(self) -> Dict[str, Dict[str, Union[int, float, Dict[str, int]]]]:
+        """
+        Summarises the durations of every stage
+
+        :return: The count, total, mean, p50, p95 and max duration (ms) and the histogram of every stage
+        """
+        durations_of_stages: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for _, stage, _, duration, _ in self.timeline:
+                durations_of_stages.setdefault(stage, []).append(duration * 1000)
+
+        summary = {}
+
+        for stage, durations in durations_of_stages.items():
+            durations.sort()
+            summary[stage] = {
+                'count': len(durations),
+                'total_in_ms': sum(durations),
+                'mean_in_ms': sum(durations) / len(durations),
+                'p50_in_ms': get_percentile(durations, 50),
+                'p95_in_ms': get_percentile(durations, 95),
+                'max_in_ms': durations[-1],
+                'histogram': self._get_histogram(durations)
+            }
+
+        return summary
+
+    @staticmethod
+    def _get_histogram(durations: List[float]) -> Dict[str, int]:
+        """
+        Counts the durations in the histogram buckets
+
+        :param durations: The durations in milliseconds
+        :return: The number of durations of every bucket, keyed by the upper bound of the bucket
+        """
+        bucket_counts = [0] * (len(_HISTOGRAM_BUCKET_UPPER_BOUNDS_IN_MS) + 1)
+
+        for duration in durations:
+            bucket_counts[bisect_left(_HISTOGRAM_BUCKET_UPPER_BOUNDS_IN_MS, duration)] += 1
+
+        bucket_names = [f'<={upper_bound}ms' for upper_bound in _HISTOGRAM_BUCKET_UPPER_BOUNDS_IN_MS]
+        bucket_names.append(f'>{_HISTOGRAM_BUCKET_UPPER_BOUNDS_IN_MS[-1]}ms')
+
+        return dict(zip(bucket_names, bucket_counts))
+
+    def export(self, file_path: str) -> None:
+        """
+        Exports the timeline of the spans. Exports the summary together with the timeline if it is a JSON file.
+
+        :param file_path: The path of the file to export to. CSV unless the extension is .json
+        """
+        with self._lock:
+            timeline = [(move_index, stage, start_time, duration * 1000, thread_name)
+                        for move_index, stage, start_time, duration, thread_name in self.timeline]
+
+        if file_path.endswith('.json'):
+            with open(file_path, 'w') as file_handler:
+                json.dump({'summary': self.get_summary(),
+                           'timeline': [dict(zip(_TIMELINE_FIELDS, entry)) for entry in timeline]},
+                          file_handler,
+                          indent=2)
+            return
+
+        with open(file_path, 'w', newline='') as file_handler:
+            writer = csv.writer(file_handler)
+            writer.writerow(_TIMELINE_FIELDS)
+            writer.writerows(timeline)
+
+
+# Shared by all the modules of a run, disabled unless the run is profiled
+span_recorder = SpanRecorder()